@@ -0,0 +1,240 @@
+"""
+article_cache.py
+Persistent SQLite cache for district news lookups.
+
+Entries are keyed by (district, source, query). Article bodies are stored
+once and shared by every query that returned them. A fresh entry is served
+with no network call; a stale entry is topped up by fetching only the
+window after its newest cached ``publishedAt``. Least-recently-used
+entries are evicted once the cache grows past ``max_bytes``.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+import metrics
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "..", "data", "cache", "article_cache.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    article_id   TEXT PRIMARY KEY,
+    published_at TEXT,
+    payload      TEXT NOT NULL,
+    size_bytes   INTEGER NOT NULL,
+    stored_at    REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS queries (
+    district    TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    query       TEXT NOT NULL,
+    from_date   TEXT NOT NULL,
+    fetched_at  REAL NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (district, source, query)
+);
+CREATE TABLE IF NOT EXISTS query_articles (
+    district   TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    query      TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    PRIMARY KEY (district, source, query, article_id)
+);
+CREATE INDEX IF NOT EXISTS idx_query_articles_article ON query_articles(article_id);
+CREATE INDEX IF NOT EXISTS idx_queries_last_access ON queries(last_access);
+"""
+
+
+def article_id(article: dict) -> str:
+    """Stable id: the URL when present, otherwise title + publish time."""
+    key = article.get("url") or f"{article.get('title', '')}|{article.get('publishedAt', '')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def normalize_published(value) -> str:
+    """ISO-8601 UTC string for NewsAPI-style timestamps, or None if unparseable."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class ArticleCache:
+    """
+    SQLite-backed article cache with TTL refresh and LRU size eviction.
+
+    Args:
+        path: SQLite file (":memory:" for tests)
+        ttl_seconds: entries older than this are refreshed incrementally
+        max_bytes: total stored article payload before LRU eviction kicks in
+
+    Usage:
+        cache = ArticleCache()
+        articles = cache.fetch(district, "newsapi", query, from_date,
+                               fetch_fn=lambda since: call_newsapi(query, since))
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = 24 * 3600,
+                 max_bytes: int = 200 * 1024 * 1024):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "partial_hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        # Running payload total, so a store doesn't rescan the table to decide on eviction
+        self._bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM articles").fetchone()[0]
+
+    # ------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------
+    def lookup(self, district: str, source: str, query: str, from_date: str):
+        """
+        Returns (articles, fetch_from).
+
+        ``fetch_from`` is None when the cache fully answers the request
+        (fresh entry covering ``from_date``). Otherwise it is the date the
+        caller should fetch from: ``from_date`` on a miss, or the newest
+        cached publish date on a stale entry. ``articles`` holds whatever
+        is cached for the requested window.
+        """
+        key = (district, source, query)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT from_date, fetched_at FROM queries WHERE district=? AND source=? AND query=?",
+                key).fetchone()
+            if row is None or row[0] > from_date:
+                # Never fetched, or cached window starts after the requested one
+                self.stats["misses"] += 1
+                metrics.cache_lookup("articles", misses=1)
+                return [], from_date
+            self._conn.execute(
+                "UPDATE queries SET last_access=? WHERE district=? AND source=? AND query=?",
+                (now, *key))
+            articles = self._articles_for(key, from_date)
+            if now - row[1] < self.ttl_seconds:
+                self.stats["hits"] += 1
+                metrics.cache_lookup("articles", hits=1)
+                return articles, None
+            self.stats["partial_hits"] += 1
+            metrics.cache_lookup("articles", misses=1)   # stale: still needs a fetch
+            newest = self._conn.execute(
+                "SELECT MAX(a.published_at) FROM articles a JOIN query_articles q USING (article_id) "
+                "WHERE q.district=? AND q.source=? AND q.query=?", key).fetchone()[0]
+            return articles, max(newest[:10], from_date) if newest else from_date
+
+    def store(self, district: str, source: str, query: str, articles: list, from_date: str):
+        """Merge freshly fetched ``articles`` into the entry and mark it fresh."""
+        key = (district, source, query)
+        now = time.time()
+        with self._lock, self._conn:
+            prev = self._conn.execute(
+                "SELECT from_date FROM queries WHERE district=? AND source=? AND query=?",
+                key).fetchone()
+            covered_from = min(prev[0], from_date) if prev else from_date
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, covered_from, now, now))
+            for a in articles:
+                aid = article_id(a)
+                payload = json.dumps(a, sort_keys=True)
+                size = len(payload.encode("utf-8"))
+                added = self._conn.execute(
+                    "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?)",
+                    (aid, normalize_published(a.get("publishedAt")), payload, size, now)).rowcount
+                self._bytes += size * added
+                self._conn.execute("INSERT OR IGNORE INTO query_articles VALUES (?, ?, ?, ?)",
+                                   (*key, aid))
+        self.evict()
+
+    def fetch(self, district: str, source: str, query: str, from_date: str, fetch_fn) -> list:
+        """
+        Serve from cache, calling ``fetch_fn(since_date)`` only for the
+        missing window. Returns the articles for the requested window.
+        """
+        cached, fetch_from = self.lookup(district, source, query, from_date)
+        if fetch_from is None:
+            return cached
+        try:
+            fetched = fetch_fn(fetch_from)
+        except Exception:
+            if not cached:
+                raise
+            return cached  # serve stale rather than nothing
+        self.store(district, source, query, fetched, fetch_from)
+        with self._lock:
+            return self._articles_for((district, source, query), from_date)
+
+    def _articles_for(self, key, from_date: str) -> list:
+        rows = self._conn.execute(
+            "SELECT a.payload FROM articles a JOIN query_articles q USING (article_id) "
+            "WHERE q.district=? AND q.source=? AND q.query=? "
+            "AND (a.published_at IS NULL OR a.published_at >= ?) "
+            "ORDER BY a.published_at DESC", (*key, from_date)).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    # ------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------
+    def size_bytes(self) -> int:
+        """Total stored article payload (kept as a running total)."""
+        return self._bytes
+
+    def evict(self, max_bytes: int = None) -> int:
+        """Drop least-recently-used entries until payload size <= max_bytes."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        evicted = 0
+        while self._bytes > limit:
+            with self._lock, self._conn:
+                n_entries = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+                if n_entries == 0:
+                    break
+                # Evict ~10% of entries per round so large caches shrink in few passes
+                rows = self._conn.execute(
+                    "SELECT district, source, query FROM queries ORDER BY last_access LIMIT ?",
+                    (max(1, n_entries // 10),)).fetchall()
+                for row in rows:
+                    self._conn.execute(
+                        "DELETE FROM queries WHERE district=? AND source=? AND query=?", row)
+                    self._conn.execute(
+                        "DELETE FROM query_articles WHERE district=? AND source=? AND query=?", row)
+                self._drop_orphans()
+            evicted += len(rows)
+        self.stats["evictions"] += evicted
+        return evicted
+
+    def purge_expired(self, max_age_seconds: float) -> int:
+        """Remove entries not refreshed within ``max_age_seconds`` (hard TTL)."""
+        cutoff = time.time() - max_age_seconds
+        with self._lock, self._conn:
+            n = self._conn.execute("DELETE FROM queries WHERE fetched_at < ?", (cutoff,)).rowcount
+            self._conn.execute(
+                "DELETE FROM query_articles WHERE NOT EXISTS (SELECT 1 FROM queries q WHERE "
+                "q.district=query_articles.district AND q.source=query_articles.source "
+                "AND q.query=query_articles.query)")
+            self._drop_orphans()
+        return n
+
+    def _drop_orphans(self):
+        """Delete articles no entry references; caller holds the lock and the transaction."""
+        orphans = "FROM articles WHERE article_id NOT IN (SELECT article_id FROM query_articles)"
+        self._bytes -= self._conn.execute(f"SELECT COALESCE(SUM(size_bytes), 0) {orphans}").fetchone()[0]
+        self._conn.execute(f"DELETE {orphans}")
+
+    def close(self):
+        self._conn.close()
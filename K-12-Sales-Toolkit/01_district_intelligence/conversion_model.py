@@ -0,0 +1,444 @@
+"""
+conversion_model.py
+Persisted district conversion model (random forest) with batch scoring.
+
+The prioritization notebook used to refit a RandomForestClassifier on every
+run and throw away the encoder/scaler state. Here the fitted pipeline —
+SOR stage encoding, StandardScaler and every tree — is exported to one
+artifact file:
+
+    b"LPCM1\\n" | header length (8 bytes) | JSON header | aligned raw arrays
+
+The header holds the manifest (features, encodings, scaler, label and
+training hashes, metrics) and an array table; the arrays (node feature / threshold /
+children / leaf probability for all trees, concatenated) are opened with
+np.memmap, so loading is a header parse and no unpickling. Scoring rebuilds
+sklearn's compiled trees straight from those arrays (a few ms; no pickle,
+no sklearn-version lock-in) and falls back to a pure NumPy tree walk when
+scikit-learn isn't installed — it is only required for training.
+
+Run:
+    python conversion_model.py train                       # demo labels (score > 65), as the notebook
+    python conversion_model.py retrain --labels data/labels/conversions.csv
+    python conversion_model.py score --out data/exports/conversion_scores.csv
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from district_dataset import DEFAULT_DATASET_PATH, read_dataset
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODEL_PATH = os.path.join(_HERE, "..", "data", "models", "conversion_model.lpcm")
+DEFAULT_LABELS_PATH = os.path.join(_HERE, "..", "data", "labels", "conversions.csv")
+
+FORMAT_MAGIC = b"LPCM1\n"
+_ALIGN = 64
+
+# Batches at least this big are scored with sklearn's compiled trees
+COMPILED_MIN_ROWS = 20_000
+
+# Same feature set as the notebook's ML Conversion Predictor
+FEATURES = ["enrollment_k8", "pct_ela_proficient", "pct_title1_students",
+            "pd_budget_per_student_est", "sor_enc", "recent_literacy_initiative",
+            "superintendent_tenure_yrs", "teacher_turnover_rate", "miles_from_la"]
+
+# Encoded feature -> raw column (LabelEncoder-style: index into sorted classes)
+CATEGORICAL = {"sor_enc": "sor_adoption_signal"}
+
+# Raw dataset columns needed to score
+INPUT_COLUMNS = [CATEGORICAL.get(f, f) for f in FEATURES]
+
+
+# ============================================================
+# Features
+# ============================================================
+
+def encode_features(districts: pd.DataFrame, categories: dict) -> np.ndarray:
+    """
+    Raw district columns -> float64 feature matrix (FEATURES order).
+    Categoricals become the index into the classes seen at training time;
+    unseen values map to -1. Missing numerics become 0, as in the notebook.
+    """
+    X = np.empty((len(districts), len(FEATURES)), dtype=np.float64)
+    for j, feature in enumerate(FEATURES):
+        if feature in CATEGORICAL:
+            col = districts[CATEGORICAL[feature]]
+            X[:, j] = pd.Index(categories[feature]).get_indexer(col.astype(object))
+        else:
+            X[:, j] = pd.to_numeric(districts[feature], errors="coerce").astype("float64").fillna(0.0)
+    return X
+
+
+def label_hash(labels: pd.DataFrame) -> str:
+    """Content hash of the (district_name, converted) labels, order-insensitive."""
+    rows = labels[["district_name", "converted"]].astype(str).sort_values(["district_name", "converted"])
+    return hashlib.sha256(rows.to_csv(index=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _categories(districts: pd.DataFrame) -> dict:
+    return {f: sorted(districts[col].dropna().astype(str).unique().tolist())
+            for f, col in CATEGORICAL.items()}
+
+
+def training_hash(districts: pd.DataFrame, y, n_estimators: int = 100, random_state: int = 42) -> str:
+    """
+    Fingerprint of everything a fit depends on: the encoded feature matrix
+    and labels (row-order-insensitive), the SOR encoding and the forest
+    hyperparameters (same defaults as ConversionModel.fit). Changes when a
+    label, a feature value or a parameter does.
+    """
+    categories = _categories(districts)
+    rows = np.column_stack([encode_features(districts, categories), np.asarray(y, dtype=np.float64)])
+    rows = rows[np.lexsort(rows.T[::-1])] if len(rows) else rows
+    h = hashlib.sha256(np.ascontiguousarray(rows).tobytes())
+    h.update(json.dumps({"features": FEATURES, "categories": categories, "n_estimators": n_estimators,
+                         "random_state": random_state}, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+# ============================================================
+# Model
+# ============================================================
+
+class ConversionModel:
+    """
+    Fitted conversion pipeline backed by (memory-mapped) arrays.
+
+    Arrays (all trees concatenated; node ids are global):
+        feature    int32   split feature (0 for leaves)
+        threshold  float64 go left when x <= threshold (+inf for leaves)
+        left/right int32   children (leaves point to themselves)
+        proba      float64 P(converted) at the node (used at leaves)
+        roots      int32   root node of each tree
+        importances float64 feature importances (FEATURES order)
+    """
+
+    def __init__(self, manifest: dict, arrays: dict):
+        self.manifest = manifest
+        self.arrays = arrays
+
+    # ----------------------------------------------------------
+    # Training
+    # ----------------------------------------------------------
+
+    @classmethod
+    def fit(cls, districts: pd.DataFrame, y, n_estimators: int = 100, random_state: int = 42,
+            labels_digest: str = None) -> "ConversionModel":
+        """
+        Fit StandardScaler + RandomForestClassifier (as in the notebook)
+        and export them. Requires scikit-learn.
+
+        Args:
+            districts: rows with INPUT_COLUMNS
+            y: 0/1 conversion labels aligned with ``districts``
+            labels_digest: label_hash of the training labels (informational;
+                           retrain skips when the training_hash is unchanged)
+        """
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+
+        y = np.asarray(y, dtype=np.int64)
+        categories = _categories(districts)
+        X = encode_features(districts, categories)
+        scaler = StandardScaler().fit(X)
+        forest = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state)
+        forest.fit(scaler.transform(X), y)
+
+        arrays = _export_forest(forest)
+        arrays["importances"] = np.asarray(forest.feature_importances_, dtype=np.float64)
+        manifest = {
+            "format": 1,
+            "features": FEATURES,
+            "categories": categories,
+            "scaler_mean": scaler.mean_.tolist(),
+            "scaler_scale": scaler.scale_.tolist(),
+            "n_estimators": n_estimators,
+            "max_depth": int(max(est.tree_.max_depth for est in forest.estimators_)),
+            "n_samples": int(len(y)),
+            "positive_rate": float(y.mean()) if len(y) else 0.0,
+            "labels_digest": labels_digest,
+            "training_digest": training_hash(districts, y, n_estimators, random_state),
+            "trained_at": datetime.now(timezone.utc).isoformat(),
+        }
+        return cls(manifest, arrays)
+
+    # ----------------------------------------------------------
+    # Persistence
+    # ----------------------------------------------------------
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> str:
+        """Write the artifact atomically (tmp file + os.replace)."""
+        table, offset = {}, 0
+        blobs = []
+        for name, arr in self.arrays.items():
+            arr = np.ascontiguousarray(arr)
+            table[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+            blobs.append(arr)
+            offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+        header = json.dumps({"manifest": self.manifest, "arrays": table}).encode("utf-8")
+        start = -(-(len(FORMAT_MAGIC) + 8 + len(header)) // _ALIGN) * _ALIGN
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(FORMAT_MAGIC + len(header).to_bytes(8, "little") + header)
+            for name, arr in zip(table, blobs):
+                f.seek(start + table[name]["offset"])
+                f.write(arr.tobytes())
+            f.truncate(start + offset)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH, mmap: bool = True) -> "ConversionModel":
+        """
+        Open an artifact. With mmap=True the arrays are views into the file
+        (pages are read on first use and shared between processes).
+        """
+        with open(path, "rb") as f:
+            if f.read(len(FORMAT_MAGIC)) != FORMAT_MAGIC:
+                raise ValueError(f"{path} is not a conversion model artifact")
+            size = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(size))
+        start = -(-(len(FORMAT_MAGIC) + 8 + size) // _ALIGN) * _ALIGN
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+            if not mmap or int(np.prod(shape)) == 0:
+                with open(path, "rb") as f:
+                    f.seek(start + spec["offset"])
+                    arrays[name] = np.frombuffer(f.read(dtype.itemsize * int(np.prod(shape))),
+                                                 dtype=dtype).reshape(shape)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=start + spec["offset"],
+                                         shape=shape)
+        return cls(header["manifest"], arrays)
+
+    # ----------------------------------------------------------
+    # Scoring
+    # ----------------------------------------------------------
+
+    def transform(self, districts: pd.DataFrame) -> np.ndarray:
+        """Encoded + scaled features, float32 as sklearn's trees compare them."""
+        m = self.manifest
+        X = encode_features(districts, m["categories"])
+        return ((X - np.asarray(m["scaler_mean"])) / np.asarray(m["scaler_scale"])).astype(np.float32)
+
+    def predict_proba(self, districts: pd.DataFrame, batch_size: int = 50_000) -> np.ndarray:
+        """
+        P(converted) for every row of ``districts`` (needs INPUT_COLUMNS),
+        scored in batches of ``batch_size`` rows.
+        """
+        X = self.transform(districts)
+        # Importing sklearn costs ~1-2s cold; only worth it for big batches
+        # (or when it is loaded already). Both paths give identical results.
+        use_compiled = len(X) >= COMPILED_MIN_ROWS or "sklearn" in sys.modules
+        trees = self._compiled_trees() if use_compiled else None
+        score = self._numpy_proba if trees is None else self._compiled_proba
+        out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), batch_size):
+            out[start:start + batch_size] = score(X[start:start + batch_size])
+        return out
+
+    def _compiled_trees(self):
+        """
+        sklearn Tree objects rebuilt from the node arrays (built once per
+        model); None when scikit-learn is missing or its Tree layout differs.
+        """
+        if not hasattr(self, "_trees"):
+            try:
+                self._trees = _build_sklearn_trees(self.arrays, len(self.manifest["features"]),
+                                                  self.manifest["max_depth"])
+            except (ImportError, KeyError, TypeError, ValueError):
+                self._trees = None
+        return self._trees
+
+    def _compiled_proba(self, X: np.ndarray) -> np.ndarray:
+        proba, roots = np.asarray(self.arrays["proba"]), np.asarray(self.arrays["roots"]).tolist()
+        total = np.zeros(len(X), dtype=np.float64)
+        for root, tree in zip(roots, self._trees):
+            total += proba[root:root + tree.node_count][tree.apply(X)]
+        return total / len(roots)
+
+    def _numpy_proba(self, X: np.ndarray) -> np.ndarray:
+        a = {k: np.asarray(v) for k, v in self.arrays.items()}  # plain views of the memmaps
+        feature, threshold, left, right = a["feature"], a["threshold"], a["left"], a["right"]
+        node = np.broadcast_to(a["roots"], (len(X), len(a["roots"]))).copy()
+        rows = np.arange(len(X))[:, None]
+        # Leaves loop onto themselves, so max_depth steps land every row on its leaf
+        for _ in range(self.manifest["max_depth"]):
+            go_left = X[rows, feature[node]] <= threshold[node]
+            node = np.where(go_left, left[node], right[node])
+        return a["proba"][node].mean(axis=1)
+
+    @property
+    def feature_importances(self) -> pd.Series:
+        return pd.Series(np.asarray(self.arrays["importances"]), index=self.manifest["features"],
+                         name="importance")
+
+
+def _build_sklearn_trees(arrays: dict, n_features: int, max_depth: int) -> list:
+    """Compiled sklearn trees for the concatenated node arrays (leaf ids local)."""
+    from sklearn.tree._tree import NODE_DTYPE, Tree
+
+    left, right = np.asarray(arrays["left"]), np.asarray(arrays["right"])
+    roots = np.asarray(arrays["roots"]).tolist()
+    ends = roots[1:] + [len(left)]
+    leaf = left == np.arange(len(left))
+    nodes = np.zeros(len(left), dtype=NODE_DTYPE)
+    nodes["left_child"] = np.where(leaf, -1, left)
+    nodes["right_child"] = np.where(leaf, -1, right)
+    nodes["feature"] = np.where(leaf, -2, arrays["feature"])
+    nodes["threshold"] = np.where(leaf, -2.0, arrays["threshold"])
+    trees = []
+    for root, end in zip(roots, ends):
+        part = nodes[root:end].copy()
+        inner = part["left_child"] >= 0
+        part["left_child"][inner] -= root
+        part["right_child"][inner] -= root
+        tree = Tree(n_features, np.array([2], dtype=np.intp), 1)
+        tree.__setstate__({"max_depth": max_depth, "node_count": end - root, "nodes": part,
+                           "values": np.zeros((end - root, 1, 2))})
+        trees.append(tree)
+    return trees
+
+
+def _export_forest(forest) -> dict:
+    """sklearn trees -> concatenated node arrays with global node ids."""
+    positive = list(forest.classes_).index(1) if 1 in forest.classes_ else None
+    parts = {k: [] for k in ("feature", "threshold", "left", "right", "proba")}
+    roots, offset = [], 0
+    for est in forest.estimators_:
+        t = est.tree_
+        ids = np.arange(t.node_count)
+        leaf = t.children_left == -1
+        value = t.value[:, 0, :]
+        counts = value.sum(axis=1)
+        parts["feature"].append(np.where(leaf, 0, t.feature))
+        parts["threshold"].append(np.where(leaf, np.inf, t.threshold))
+        parts["left"].append(np.where(leaf, ids, t.children_left) + offset)
+        parts["right"].append(np.where(leaf, ids, t.children_right) + offset)
+        parts["proba"].append(value[:, positive] / np.where(counts > 0, counts, 1)
+                              if positive is not None else np.zeros(t.node_count))
+        roots.append(offset)
+        offset += t.node_count
+    dtypes = {"feature": np.int32, "threshold": np.float64, "left": np.int32,
+              "right": np.int32, "proba": np.float64}
+    arrays = {k: np.concatenate(v).astype(dtypes[k]) for k, v in parts.items()}
+    arrays["roots"] = np.asarray(roots, dtype=np.int32)
+    return arrays
+
+
+# ============================================================
+# Batch scoring + retraining
+# ============================================================
+
+_LOADED = {}
+
+
+def load_model(path: str = DEFAULT_MODEL_PATH) -> ConversionModel:
+    """Process-wide cached load, re-opened when the artifact is replaced."""
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _LOADED.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = _LOADED[key] = (mtime, ConversionModel.load(key))
+    return cached[1]
+
+
+def predict_proba(districts: pd.DataFrame, model_path: str = DEFAULT_MODEL_PATH) -> np.ndarray:
+    """P(converted) per district from the persisted model."""
+    return load_model(model_path).predict_proba(districts)
+
+
+def score_dataset(dataset_path: str = DEFAULT_DATASET_PATH, model_path: str = DEFAULT_MODEL_PATH,
+                  batch_size: int = 50_000) -> pd.DataFrame:
+    """district_name + conversion_probability for the whole district dataset."""
+    districts = read_dataset(dataset_path, ["district_name"] + INPUT_COLUMNS)
+    return pd.DataFrame({
+        "district_name": districts["district_name"],
+        "conversion_probability": load_model(model_path).predict_proba(districts, batch_size),
+    })
+
+
+def retrain(labels_path: str = DEFAULT_LABELS_PATH, districts: pd.DataFrame = None,
+            dataset_path: str = DEFAULT_DATASET_PATH, model_path: str = DEFAULT_MODEL_PATH,
+            force: bool = False, **fit_kwargs) -> dict:
+    """
+    Refit when the training data or parameters changed since the saved model.
+
+    Labels are a CSV of district_name, converted (0/1); each run uses the
+    full label history joined to the district features. When the
+    training_hash of that join (features, labels, hyperparameters) matches
+    the artifact's, nothing is trained.
+
+    Returns:
+        dict: status ("trained" | "unchanged"), labels, matched, digest
+        (training_hash), seconds
+    """
+    start = time.perf_counter()
+    labels = pd.read_csv(labels_path, keep_default_na=False, na_values=[""])
+    labels = labels.drop_duplicates("district_name", keep="last")
+
+    if districts is None:
+        districts = read_dataset(dataset_path, ["district_name"] + INPUT_COLUMNS)
+    train = districts.merge(labels[["district_name", "converted"]], on="district_name", how="inner")
+    if train.empty:
+        raise ValueError(f"No labelled districts in {labels_path} match the district dataset")
+    y = train["converted"].astype(int)
+    digest = training_hash(train, y, **fit_kwargs)
+    if not force and os.path.exists(model_path):
+        if ConversionModel.load(model_path).manifest.get("training_digest") == digest:
+            return {"status": "unchanged", "labels": len(labels), "matched": len(train),
+                    "digest": digest, "seconds": round(time.perf_counter() - start, 3)}
+
+    ConversionModel.fit(train, y, labels_digest=label_hash(labels), **fit_kwargs).save(model_path)
+    return {"status": "trained", "labels": len(labels), "matched": len(train),
+            "digest": digest, "seconds": round(time.perf_counter() - start, 3)}
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(_HERE, "..", "07_streamlit_demo"))
+
+    parser = argparse.ArgumentParser(description="District conversion model")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--dataset", default=DEFAULT_DATASET_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("train", help="Fit on demo labels (readiness score > 65), as the notebook does")
+    rt = sub.add_parser("retrain", help="Refit if the conversion labels or district features changed")
+    rt.add_argument("--labels", default=DEFAULT_LABELS_PATH)
+    rt.add_argument("--force", action="store_true")
+    sc = sub.add_parser("score", help="Score the district dataset")
+    sc.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    from dashboard_data import load_districts
+
+    if args.cmd == "train":
+        districts = load_districts(args.dataset, ["district_name"] + INPUT_COLUMNS)
+        y = (districts["readiness_score"] > 65).astype(int)
+        ConversionModel.fit(districts, y).save(args.model)
+        print(f"Trained on {len(districts):,} districts -> {args.model}")
+    elif args.cmd == "retrain":
+        districts = None if os.path.exists(args.dataset) else load_districts(args.dataset)
+        result = retrain(args.labels, districts, args.dataset, args.model, force=args.force)
+        print(f"{result['status']}: {result['labels']} labels, digest {result['digest']} "
+              f"({result['seconds']}s)")
+    else:
+        if os.path.exists(args.dataset):
+            scores = score_dataset(args.dataset, args.model)
+        else:
+            districts = load_districts(args.dataset)  # sample districts
+            scores = pd.DataFrame({"district_name": districts["district_name"],
+                                   "conversion_probability": predict_proba(districts, args.model)})
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        scores.to_csv(args.out, index=False)
+        print(f"Scored {len(scores):,} districts -> {args.out}")
@@ -0,0 +1,240 @@
+"""
+district_dataset.py
+Columnar storage for the statewide district dataset (Arrow IPC / Parquet).
+
+- Arrow IPC (``.arrow`` / ``.feather``, uncompressed) is the default: the
+  file is memory-mapped and only the requested columns are ever touched,
+  so a cold load is a few page faults instead of a CSV parse.
+- Parquet (``.parquet``) is supported for smaller files on disk / sharing;
+  it is read through a memory map with the same column projection.
+- CSV stays the interchange format (HubSpot, EdData exports) —
+  ``convert_csv`` turns one into the columnar dataset once.
+
+Both writers check the frame against frame_schema.DISTRICT_SCHEMA, so a
+bad export fails at conversion time rather than when the app loads it.
+
+Requires pyarrow (lazy import; only these functions need it).
+
+Run: python district_dataset.py convert ../data/processed/ca_districts.csv
+     python district_dataset.py bench --rows 1000000
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from frame_schema import DISTRICT_SCHEMA, check
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATASET_PATH = os.path.join(_HERE, "..", "data", "processed", "ca_districts.arrow")
+
+# Inputs to district_scoring.score_districts
+SCORING_COLUMNS = ["pct_ela_proficient", "pd_budget_per_student_est", "sor_adoption_signal",
+                   "recent_literacy_initiative", "superintendent_tenure_yrs", "miles_from_la"]
+
+# What the Streamlit app reads (scored on load)
+APP_COLUMNS = ["district_name", "county", "enrollment_k8"] + SCORING_COLUMNS
+
+# What the prioritization notebook reads (scoring + conversion-model features)
+NOTEBOOK_COLUMNS = APP_COLUMNS + ["pct_title1_students", "teacher_turnover_rate", "district_type"]
+
+
+def _format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".arrow", ".feather", ".ipc"):
+        return "arrow"
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    raise ValueError(f"Unsupported dataset format for {path!r} (use .arrow or .parquet)")
+
+
+def _dictionary_encode(table, max_ratio: float = 0.05):
+    """
+    Dictionary-encode low-cardinality string columns (county, SOR stage,
+    tier ...): they load as pandas Categoricals instead of one Python-level
+    string per row.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for i, field in enumerate(table.schema):
+        if not (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+            continue
+        col = table.column(i)
+        if len(col) and pc.count_distinct(col).as_py() <= max(1, max_ratio * len(col)):
+            table = table.set_column(i, field.name, pc.dictionary_encode(col))
+    return table
+
+
+def write_dataset(df: pd.DataFrame, path: str = DEFAULT_DATASET_PATH,
+                  compression: str = None) -> str:
+    """
+    Write ``df`` as Arrow IPC or Parquet (by extension), atomically.
+    Low-cardinality string columns are dictionary-encoded. Raises
+    frame_schema.SchemaError when ``df`` doesn't fit DISTRICT_SCHEMA.
+
+    Args:
+        compression: Parquet codec (default "zstd"); Arrow IPC is left
+                     uncompressed unless given ("lz4"/"zstd") because
+                     compressed IPC can't be memory-mapped zero-copy.
+    """
+    import pyarrow as pa
+
+    return _write_table(pa.Table.from_pandas(check(df, DISTRICT_SCHEMA), preserve_index=False),
+                        path, compression)
+
+
+def _write_table(table, path: str, compression: str = None) -> str:
+    fmt = _format(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # One record batch: each column is contiguous in the file, so reads are
+    # zero-copy views instead of a concatenation of 64k-row chunks
+    table = _dictionary_encode(table.combine_chunks())
+    tmp = path + ".tmp"
+    if fmt == "arrow":
+        import pyarrow.feather as feather
+        feather.write_feather(table, tmp, compression=compression or "uncompressed",
+                              chunksize=max(1, table.num_rows))
+    else:
+        import pyarrow.parquet as pq
+        pq.write_table(table, tmp, compression=compression or "zstd")
+    os.replace(tmp, path)  # readers never see a half-written dataset
+    return path
+
+
+def read_table(path: str = DEFAULT_DATASET_PATH, columns: list = None):
+    """pyarrow.Table with only ``columns`` (all when None), memory-mapped."""
+    import pyarrow as pa
+
+    if _format(path) == "arrow":
+        import pyarrow.ipc as ipc
+        source = pa.memory_map(path, "r")
+        table = ipc.open_file(source).read_all()  # zero-copy views into the map
+        return table.select(columns) if columns else table
+    import pyarrow.parquet as pq
+    return pq.read_table(path, columns=columns, memory_map=True)
+
+
+def read_dataset(path: str = DEFAULT_DATASET_PATH, columns: list = None) -> pd.DataFrame:
+    """
+    Load the district dataset with column projection.
+
+    Args:
+        path: .arrow / .parquet dataset
+        columns: columns to load (all when None); missing ones raise KeyError
+
+    Returns:
+        DataFrame with ``columns`` in the requested order
+    """
+    if columns is not None:
+        missing = sorted(set(columns) - set(dataset_columns(path)))
+        if missing:
+            raise KeyError(f"{path} has no column(s): {', '.join(missing)}")
+    # split_blocks avoids consolidating columns into one copied 2-D block
+    return read_table(path, columns).to_pandas(split_blocks=True)
+
+
+def dataset_columns(path: str = DEFAULT_DATASET_PATH) -> list:
+    """Column names from the file's schema (no data is read)."""
+    import pyarrow as pa
+
+    if _format(path) == "arrow":
+        import pyarrow.ipc as ipc
+        return ipc.open_file(pa.memory_map(path, "r")).schema.names
+    import pyarrow.parquet as pq
+    return pq.read_schema(path).names
+
+
+def convert_csv(csv_path: str, out_path: str = DEFAULT_DATASET_PATH, chunksize: int = 250_000) -> str:
+    """
+    One-off CSV -> columnar conversion. The CSV is parsed in chunks that
+    are converted to Arrow straight away, so the conversion never holds
+    the whole file as Python objects — only as compact Arrow columns.
+    """
+    import pyarrow as pa
+
+    # Only empty fields are missing: "None" is a real SOR adoption stage
+    read = dict(keep_default_na=False, na_values=[""])
+    tables = [pa.Table.from_pandas(check(chunk, DISTRICT_SCHEMA), preserve_index=False)
+              for chunk in pd.read_csv(csv_path, chunksize=chunksize, **read)]
+    if not tables:  # header only
+        return write_dataset(pd.read_csv(csv_path, **read), out_path)
+    return _write_table(pa.concat_tables(tables, promote_options="permissive"), out_path)
+
+
+# ============================================================
+# CSV vs. columnar cold-load comparison
+# ============================================================
+
+def _cold_load(path: str, columns: list) -> dict:
+    """
+    Load in a fresh interpreter (after importing pandas, which both paths
+    pay); report wall time, peak RSS and private RSS (Linux /proc).
+    """
+    import json
+    import subprocess
+    import sys
+
+    code = f"""
+import json, sys, time
+sys.path.insert(0, {_HERE!r})
+import pandas as pd
+start = time.perf_counter()
+from district_dataset import read_dataset
+path, columns = {path!r}, {columns!r}
+df = pd.read_csv(path, usecols=columns) if path.endswith(".csv") else read_dataset(path, columns)
+df["readiness_input_sum"] = df["pct_ela_proficient"] + df["miles_from_la"]  # touch the data
+seconds = time.perf_counter() - start
+# VmHWM, not ru_maxrss: the latter carries over the parent's peak across exec.
+# RssAnon is private memory; mapped file pages are shared and reclaimable.
+status = {{l.split(":")[0]: int(l.split()[1]) / 1024 for l in open("/proc/self/status")
+          if l.startswith(("VmHWM", "RssAnon"))}}
+print(json.dumps({{"seconds": seconds, "rss_mb": status["VmHWM"], "private_mb": status["RssAnon"]}}))
+"""
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def bench(rows: int, workdir: str) -> list:
+    """CSV vs Arrow vs Parquet cold load of APP_COLUMNS for ``rows`` districts."""
+    import sys
+    sys.path.insert(0, os.path.join(_HERE, "..", "07_streamlit_demo"))
+    from dashboard_data import synthetic_districts
+
+    df = synthetic_districts(rows, score=False)
+    df["district_type"] = "Unified"
+    paths = {"csv": os.path.join(workdir, "districts.csv"),
+             "arrow": os.path.join(workdir, "districts.arrow"),
+             "parquet": os.path.join(workdir, "districts.parquet")}
+    df.to_csv(paths["csv"], index=False)
+    write_dataset(df, paths["arrow"])
+    write_dataset(df, paths["parquet"])
+    baseline = _cold_load(paths["csv"], None)  # load_district_data today: whole file
+    results = [{"format": "csv (all columns)", **baseline}]
+    for fmt, path in paths.items():
+        results.append({"format": f"{fmt} (APP_COLUMNS)", **_cold_load(path, APP_COLUMNS)})
+    return results
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="District dataset: CSV -> Arrow/Parquet")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    conv = sub.add_parser("convert", help="Convert a processed CSV to the columnar dataset")
+    conv.add_argument("csv")
+    conv.add_argument("--out", default=DEFAULT_DATASET_PATH)
+    b = sub.add_parser("bench", help="Compare cold-load time and peak RSS")
+    b.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.cmd == "convert":
+        start = time.perf_counter()
+        out = convert_csv(args.csv, args.out)
+        print(f"Wrote {out} ({os.path.getsize(out) / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            for r in bench(args.rows, tmp):
+                print(f"{r['format']:<26} {r['seconds']:7.3f}s   peak RSS {r['rss_mb']:7.1f} MB"
+                      f"   private {r['private_mb']:7.1f} MB")
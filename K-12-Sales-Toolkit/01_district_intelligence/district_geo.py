@@ -0,0 +1,256 @@
+"""
+district_geo.py
+District coordinates, distances and rep territories.
+
+Scoring used to see geography only through the precomputed
+``miles_from_la`` column, i.e. every rep lived in Los Angeles. Here:
+
+- haversine_miles: vectorized great-circle distances (broadcasts, so one
+  call gives n districts x r reps).
+- DistrictSpatialIndex: a KD-tree over the districts' unit-sphere (x, y, z)
+  vectors. Straight-line (chord) distance grows monotonically with
+  great-circle distance, so radius and k-nearest queries in 3-D are exact
+  for miles on the globe. "Everything within 60 miles of this rep" and
+  "nearest 10 Tier 1 districts" are O(log n + hits).
+- score_from_home / assign_territories: re-score the geography component
+  from any rep's home base, or split the state between several reps
+  (each district goes to its nearest rep and is scored from there).
+
+Requires scipy for the tree (lazy import); without it queries fall back to
+a brute-force haversine pass, which is fine for a few thousand districts.
+
+Run: python district_geo.py --districts 100000 --home Fresno
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from district_scoring import SCORE_COLUMNS, TIER_LABELS, assign_tiers, score_arrays
+
+EARTH_RADIUS_MILES = 3958.8
+GEO_COLUMNS = ["latitude", "longitude"]
+
+# Rep home bases the app offers as presets: (latitude, longitude)
+HOME_BASES = {
+    "Los Angeles": (34.0522, -118.2437),
+    "San Diego": (32.7157, -117.1611),
+    "Fresno": (36.7378, -119.7871),
+    "Sacramento": (38.5816, -121.4944),
+    "San Francisco": (37.7749, -122.4194),
+    "Riverside": (33.9806, -117.3755),
+    "Bakersfield": (35.3733, -119.0187),
+}
+LA_HOME = HOME_BASES["Los Angeles"]
+
+
+# ============================================================
+# Distances
+# ============================================================
+
+def haversine_miles(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Great-circle distance in miles between points given in degrees.
+    Inputs broadcast: ``haversine_miles(lat[:, None], lon[:, None], rep_lat, rep_lon)``
+    is the (districts x reps) distance matrix.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def destination_point(lat, lon, bearing_deg, miles):
+    """Point ``miles`` away from (lat, lon) along ``bearing_deg`` (vectorized); returns (lat, lon)."""
+    lat1, lon1, theta = np.radians(lat), np.radians(lon), np.radians(np.asarray(bearing_deg, dtype=np.float64))
+    d = np.asarray(miles, dtype=np.float64) / EARTH_RADIUS_MILES
+    lat2 = np.arcsin(np.sin(lat1) * np.cos(d) + np.cos(lat1) * np.sin(d) * np.cos(theta))
+    lon2 = lon1 + np.arctan2(np.sin(theta) * np.sin(d) * np.cos(lat1), np.cos(d) - np.sin(lat1) * np.sin(lat2))
+    return np.degrees(lat2), np.degrees(lon2)
+
+
+def _unit_vectors(lat, lon) -> np.ndarray:
+    lat, lon = np.radians(np.asarray(lat, dtype=np.float64)), np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _chord(miles) -> float:
+    """Unit-sphere chord length for a great-circle distance."""
+    return 2 * np.sin(min(float(miles) / EARTH_RADIUS_MILES, np.pi) / 2)
+
+
+# ============================================================
+# Spatial index
+# ============================================================
+
+class DistrictSpatialIndex:
+    """
+    Usage:
+        geo = DistrictSpatialIndex(districts)              # needs latitude / longitude
+        geo.within(*HOME_BASES["Fresno"], miles=60)         # DataFrame, nearest first
+        geo.nearest(*HOME_BASES["Fresno"], k=10, tier="Tier 1")
+    """
+
+    def __init__(self, districts: pd.DataFrame, lat_col: str = "latitude", lon_col: str = "longitude"):
+        self.districts = districts
+        self.lat = districts[lat_col].to_numpy(dtype=np.float64)
+        self.lon = districts[lon_col].to_numpy(dtype=np.float64)
+        self._tree = self._build(_unit_vectors(self.lat, self.lon))
+        self._subsets = {}   # tier label -> DistrictSpatialIndex over that tier
+
+    @staticmethod
+    def _build(xyz: np.ndarray):
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            return None
+        return cKDTree(xyz)
+
+    def __len__(self):
+        return len(self.lat)
+
+    def distances_from(self, lat: float, lon: float) -> np.ndarray:
+        """Miles from (lat, lon) to every district (vectorized haversine)."""
+        return haversine_miles(self.lat, self.lon, lat, lon)
+
+    def _result(self, positions: np.ndarray, lat: float, lon: float) -> pd.DataFrame:
+        miles = haversine_miles(self.lat[positions], self.lon[positions], lat, lon)
+        order = np.argsort(miles, kind="stable")
+        out = self.districts.iloc[positions[order]].copy()
+        out["miles_from_home"] = miles[order].round(1)
+        return out
+
+    def within(self, lat: float, lon: float, miles: float) -> pd.DataFrame:
+        """Districts within ``miles`` of (lat, lon), nearest first, with miles_from_home."""
+        if self._tree is None:
+            positions = np.flatnonzero(self.distances_from(lat, lon) <= miles)
+        else:
+            # Tiny slack on the chord so float error never drops a boundary district
+            hits = self._tree.query_ball_point(_unit_vectors(lat, lon)[0], _chord(miles) + 1e-12)
+            positions = np.asarray(hits, dtype=np.int64)
+            positions = positions[haversine_miles(self.lat[positions], self.lon[positions], lat, lon) <= miles]
+        return self._result(positions, lat, lon)
+
+    def nearest(self, lat: float, lon: float, k: int = 10, tier: str = None,
+                tier_col: str = "tier") -> pd.DataFrame:
+        """
+        ``k`` districts closest to (lat, lon), nearest first; ``tier`` limits
+        the search to one tier (its sub-index is built on first use).
+        """
+        if tier is not None:
+            if tier not in self._subsets:
+                mask = (self.districts[tier_col] == tier).to_numpy()
+                self._subsets[tier] = DistrictSpatialIndex(self.districts[mask])
+            return self._subsets[tier].nearest(lat, lon, k)
+        k = min(int(k), len(self))
+        if k <= 0:
+            return self._result(np.empty(0, dtype=np.int64), lat, lon)
+        if self._tree is None:
+            miles = self.distances_from(lat, lon)
+            positions = np.argpartition(miles, k - 1)[:k] if k < len(self) else np.arange(len(self))
+        else:
+            _, positions = self._tree.query(_unit_vectors(lat, lon)[0], k=k)
+            positions = np.atleast_1d(positions).astype(np.int64)
+        return self._result(positions, lat, lon)
+
+
+# ============================================================
+# Scoring from a rep's home base
+# ============================================================
+
+def _score_with_miles(districts: pd.DataFrame, miles: np.ndarray, decimals: int = 2) -> np.ndarray:
+    inputs = {arg: districts[col] for arg, col in SCORE_COLUMNS.items() if arg != "miles"}
+    return score_arrays(miles=miles, decimals=decimals, **inputs)
+
+
+def score_from_home(districts: pd.DataFrame, lat: float, lon: float,
+                    lat_col: str = "latitude", lon_col: str = "longitude") -> pd.DataFrame:
+    """
+    Re-score every district with the geography component measured from
+    (lat, lon) instead of Los Angeles.
+
+    Returns:
+        copy of ``districts`` with miles_from_home, readiness_score and tier replaced
+    """
+    miles = haversine_miles(districts[lat_col].to_numpy(dtype=np.float64),
+                            districts[lon_col].to_numpy(dtype=np.float64), lat, lon)
+    out = districts.copy()
+    out["miles_from_home"] = miles.round(1)
+    out["readiness_score"] = _score_with_miles(districts, miles)
+    out["tier"] = assign_tiers(out["readiness_score"].to_numpy())
+    return out
+
+
+def assign_territories(districts: pd.DataFrame, reps: dict,
+                       lat_col: str = "latitude", lon_col: str = "longitude") -> pd.DataFrame:
+    """
+    Split districts between reps: each district goes to its nearest rep's
+    home base and is scored from there.
+
+    Args:
+        reps: rep name -> (latitude, longitude)
+
+    Returns:
+        copy of ``districts`` with rep, miles_from_home, readiness_score and tier
+    """
+    if not reps:
+        raise ValueError("Need at least one rep home base")
+    names = list(reps)
+    homes = np.asarray([reps[r] for r in names], dtype=np.float64)
+    dist = haversine_miles(districts[lat_col].to_numpy(dtype=np.float64)[:, None],
+                           districts[lon_col].to_numpy(dtype=np.float64)[:, None],
+                           homes[None, :, 0], homes[None, :, 1])                 # (n x reps)
+    nearest = dist.argmin(axis=1)
+    miles = dist[np.arange(len(districts)), nearest]
+    out = districts.copy()
+    out["rep"] = pd.Categorical.from_codes(nearest, names)
+    out["miles_from_home"] = miles.round(1)
+    out["readiness_score"] = _score_with_miles(districts, miles)
+    out["tier"] = assign_tiers(out["readiness_score"].to_numpy())
+    return out
+
+
+def territory_summary(territories: pd.DataFrame) -> pd.DataFrame:
+    """Per rep: districts, tier counts, mean score and mean drive distance."""
+    counts = pd.crosstab(territories["rep"], territories["tier"]).reindex(columns=list(TIER_LABELS),
+                                                                         fill_value=0)
+    grouped = territories.groupby("rep", observed=False)
+    summary = pd.DataFrame({"districts": grouped.size(),
+                            "avg_score": grouped["readiness_score"].mean().round(1),
+                            "avg_miles": grouped["miles_from_home"].mean().round(1)})
+    return summary.join(counts).reset_index()
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "07_streamlit_demo"))
+    from dashboard_data import synthetic_districts
+
+    parser = argparse.ArgumentParser(description="District spatial queries and rep territories")
+    parser.add_argument("--districts", type=int, default=100_000)
+    parser.add_argument("--home", default="Fresno", choices=sorted(HOME_BASES))
+    parser.add_argument("--miles", type=float, default=60)
+    args = parser.parse_args()
+
+    districts = synthetic_districts(args.districts)
+    home = HOME_BASES[args.home]
+    start = time.perf_counter()
+    geo = DistrictSpatialIndex(districts)
+    print(f"Indexed {len(geo):,} districts in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    near = geo.within(*home, miles=args.miles)
+    print(f"{len(near):,} districts within {args.miles:g} miles of {args.home} "
+          f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+    rescored = score_from_home(districts, *home)
+    geo = DistrictSpatialIndex(rescored)
+    start = time.perf_counter()
+    top = geo.nearest(*home, k=10, tier="Tier 1")
+    print(f"Nearest Tier 1 districts to {args.home} ({(time.perf_counter() - start) * 1000:.1f} ms):")
+    print(top[["district_name", "county", "readiness_score", "miles_from_home"]].to_string(index=False))
+
+    reps = {name: HOME_BASES[name] for name in ("Los Angeles", "Fresno", "Sacramento", "San Diego")}
+    print("\nFour-rep territory split:")
+    print(territory_summary(assign_territories(districts, reps)).to_string(index=False))
@@ -0,0 +1,140 @@
+"""
+district_scoring.py
+Vectorized Partnership Readiness scoring shared by the Streamlit app,
+the prioritization notebook and the test suite.
+
+Scores a whole DataFrame (or plain NumPy arrays) in one pass and assigns
+tiers in the same pass, so statewide runs never fall back to a row-wise
+``DataFrame.apply`` loop.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# 5-dimension model — see california_district_prioritization_model.ipynb
+NEED_WEIGHT = 30
+BUDGET_WEIGHT = 25
+INITIATIVE_POINTS = 8
+NEW_SUPERINTENDENT_POINTS = 7
+LEADERSHIP_CAP = 15
+GEOGRAPHY_WEIGHT = 10
+
+ELA_NEED_CEILING = 60        # ELA % at or above this earns no need points
+BUDGET_CEILING = 500         # $/student at or above this earns full budget points
+NEW_SUPERINTENDENT_YRS = 3   # tenure below this counts as "new leadership"
+MAX_MILES = 400              # districts beyond this earn no geography points
+
+SOR_POINTS = {"None": 0, "Exploring": 10, "Committed": 16, "Implementing": 20}
+SOR_STAGES = list(SOR_POINTS)
+
+TIER_THRESHOLDS = (70, 50)
+TIER_LABELS = ("Tier 1", "Tier 2", "Tier 3")
+
+# Column names used by load_district_data and the notebooks
+SCORE_COLUMNS = {
+    "ela_pct": "pct_ela_proficient",
+    "budget": "pd_budget_per_student_est",
+    "sor_signal": "sor_adoption_signal",
+    "recent_init": "recent_literacy_initiative",
+    "supt_tenure": "superintendent_tenure_yrs",
+    "miles": "miles_from_la",
+}
+
+_SOR_INDEX = pd.Index(SOR_STAGES)
+_SOR_LOOKUP = np.array([SOR_POINTS[s] for s in SOR_STAGES] + [0], dtype=np.float64)
+
+
+def sor_codes(sor_signal) -> np.ndarray:
+    """
+    Map SOR adoption stages to integer codes (index into SOR_STAGES).
+    Unknown stages (e.g. "Resistant" from the tracker) map to -1.
+    """
+    if isinstance(sor_signal, pd.Series):
+        sor_signal = sor_signal.array
+    if isinstance(sor_signal, pd.Categorical):
+        # Translate category codes, not values — O(categories) + one take
+        remap = np.append(_SOR_INDEX.get_indexer(sor_signal.categories), -1)
+        return remap[sor_signal.codes]
+    return _SOR_INDEX.get_indexer(np.asarray(sor_signal, dtype=object))
+
+
+def score_arrays(ela_pct, budget, sor_signal, recent_init, supt_tenure, miles,
+                 decimals: int = 2) -> np.ndarray:
+    """
+    Score districts from column arrays.
+
+    Args:
+        ela_pct: % of students meeting the ELA standard
+        budget: estimated PD budget per student ($)
+        sor_signal: SOR adoption stage labels (or a Categorical of them)
+        recent_init: whether the district announced a recent literacy initiative
+        supt_tenure: superintendent tenure in years
+        miles: distance from the rep's home base in miles
+
+    Returns:
+        float64 array of Partnership Readiness Scores (0-100)
+    """
+    ela = np.asarray(ela_pct, dtype=np.float64)
+    budget = np.asarray(budget, dtype=np.float64)
+    tenure = np.asarray(supt_tenure, dtype=np.float64)
+    miles = np.asarray(miles, dtype=np.float64)
+
+    s = np.maximum(0.0, (ELA_NEED_CEILING - ela) / ELA_NEED_CEILING) * NEED_WEIGHT
+    s += np.minimum(budget / BUDGET_CEILING, 1.0) * BUDGET_WEIGHT
+    s += _SOR_LOOKUP[sor_codes(sor_signal)]
+    leadership = np.where(np.asarray(recent_init, dtype=bool), INITIATIVE_POINTS, 0)
+    leadership = leadership + np.where(tenure < NEW_SUPERINTENDENT_YRS, NEW_SUPERINTENDENT_POINTS, 0)
+    s += np.minimum(leadership, LEADERSHIP_CAP)
+    s += np.maximum(0.0, (MAX_MILES - miles) / MAX_MILES) * GEOGRAPHY_WEIGHT
+    return np.round(s, decimals)
+
+
+def score_one(ela_pct, budget, sor_signal, recent_init, supt_tenure, miles,
+              decimals: int = 2) -> float:
+    """
+    score_arrays for a single district, in plain Python floats — for
+    one-row updates (ranking_index.py), where NumPy's per-call overhead is
+    ~50x the arithmetic. Same operations in the same order, so the result
+    is bit-identical; NaN numeric inputs go through score_arrays.
+    """
+    ela, budget, tenure, miles = float(ela_pct), float(budget), float(supt_tenure), float(miles)
+    if math.isnan(ela) or math.isnan(budget) or math.isnan(miles):
+        return float(score_arrays([ela], [budget], [sor_signal], [recent_init], [tenure], [miles],
+                                  decimals)[0])
+    s = max(0.0, (ELA_NEED_CEILING - ela) / ELA_NEED_CEILING) * NEED_WEIGHT
+    s += min(budget / BUDGET_CEILING, 1.0) * BUDGET_WEIGHT
+    s += float(SOR_POINTS.get(sor_signal, 0)) if isinstance(sor_signal, str) else 0.0
+    leadership = (INITIATIVE_POINTS if bool(recent_init) else 0) + \
+        (NEW_SUPERINTENDENT_POINTS if tenure < NEW_SUPERINTENDENT_YRS else 0)
+    s += min(leadership, LEADERSHIP_CAP)
+    s += max(0.0, (MAX_MILES - miles) / MAX_MILES) * GEOGRAPHY_WEIGHT
+    scale = 10.0 ** decimals
+    return round(s * scale) / scale
+
+
+def tier_codes(scores) -> np.ndarray:
+    """Tier index per score: 0 = Tier 1, 1 = Tier 2, 2 = Tier 3."""
+    scores = np.asarray(scores, dtype=np.float64)
+    return (scores < TIER_THRESHOLDS[0]).astype(np.int8) + (scores < TIER_THRESHOLDS[1])
+
+
+def assign_tiers(scores, labels=TIER_LABELS) -> pd.Categorical:
+    """Tier labels for an array of scores, as an ordered Categorical."""
+    return pd.Categorical.from_codes(tier_codes(scores), categories=list(labels), ordered=True)
+
+
+def score_districts(districts: pd.DataFrame, score_col: str = "readiness_score",
+                    tier_col: str = "tier", labels=TIER_LABELS,
+                    decimals: int = 2) -> pd.DataFrame:
+    """
+    Score and tier a district DataFrame in one vectorized pass.
+
+    Returns a copy of ``districts`` with ``score_col`` and ``tier_col`` added.
+    """
+    scores = score_arrays(**{arg: districts[col] for arg, col in SCORE_COLUMNS.items()},
+                          decimals=decimals)
+    out = districts.copy()
+    out[score_col] = scores
+    out[tier_col] = assign_tiers(scores, labels)
+    return out
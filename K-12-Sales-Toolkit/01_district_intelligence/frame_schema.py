@@ -0,0 +1,245 @@
+"""
+frame_schema.py
+Declared storage dtypes for the district and deal frames, with vectorized
+validation.
+
+Low-cardinality strings (county, SOR stage, tier, deal stage) are stored
+as Categoricals: one small integer code per row instead of a string, and
+filters such as ``isin`` test the few categories once and then take over
+the codes. Measurements are float32, counts small ints, flags bool.
+Money and the readiness score stay float64 (see the schemas).
+
+apply_schema validates before it casts — every rule is one mask over the
+whole column — and raises SchemaError listing every problem at once, so a
+bad CSV export fails on load with a readable message instead of
+surfacing later as a silently-NaN category or a wrapped integer.
+
+    DISTRICT_SCHEMA  load_districts (dashboard), the notebooks; the
+                     dataset writers (district_dataset.py) only check(),
+                     so the file keeps the source precision
+    DEAL_SCHEMA      pipeline_frame (hubspot_sync.py), synthetic_deals
+
+Run: python frame_schema.py --rows 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from district_scoring import SOR_STAGES
+
+
+class SchemaError(ValueError):
+    """One or more columns do not fit the declared schema."""
+
+
+class Column:
+    """
+    One declared column.
+
+    Args:
+        dtype: storage dtype ("category", "bool", "float32", "int16", ...)
+        categories: allowed values of a category column, in order; None
+                    keeps whatever values the data has (tiers, counties)
+        min_value / max_value: inclusive bounds of a numeric column
+        nullable: allow missing values; default True for float and
+                  category columns, False for ints and bools (which
+                  cannot store them)
+    """
+
+    def __init__(self, dtype: str, categories=None, min_value=None, max_value=None,
+                 nullable: bool = None):
+        self.dtype = dtype
+        self.categories = list(categories) if categories is not None else None
+        self.min_value = min_value
+        self.max_value = max_value
+        if nullable is None:
+            nullable = dtype == "category" or dtype.startswith("float")
+        self.nullable = nullable
+
+    def __repr__(self):
+        return f"Column({self.dtype!r})"
+
+
+# ============================================================
+# Schemas
+# ============================================================
+
+DISTRICT_SCHEMA = {
+    "county": Column("category"),
+    "enrollment_k8": Column("int32", min_value=0),
+    "pct_ela_proficient": Column("float32", min_value=0, max_value=100),
+    "pct_title1_students": Column("float32", min_value=0, max_value=100),
+    "pd_budget_per_student_est": Column("float32", min_value=0),
+    # "Resistant" comes from the SOR tracker; scoring treats it like an unknown stage
+    "sor_adoption_signal": Column("category", categories=SOR_STAGES + ["Resistant"]),
+    "recent_literacy_initiative": Column("bool"),
+    "superintendent_tenure_yrs": Column("float32", min_value=0),
+    "teacher_turnover_rate": Column("float32", min_value=0, max_value=100),
+    "miles_from_la": Column("float32", min_value=0),
+    # Coordinates stay float64: miles_from_la and the spatial index are derived from them
+    "latitude": Column("float64", min_value=-90, max_value=90),
+    "longitude": Column("float64", min_value=-180, max_value=180),
+    "district_type": Column("category"),
+    # float64: compared for equality with ranking_index / What-If re-scores of the same row
+    "readiness_score": Column("float64", min_value=0, max_value=100),
+    "tier": Column("category"),   # labels vary (app vs notebook), so not fixed here
+    "conversion_probability": Column("float32", min_value=0, max_value=1),
+}
+
+DEAL_SCHEMA = {
+    # Money stays float64: float32 rounds a $20M pipeline total to the dollar
+    "amount": Column("float64", min_value=0),
+    "stage": Column("category"),  # analysis stages; unmapped custom HubSpot ids pass through
+    # float: NaN = no activity timestamp (flagged by pipeline_health, never read as 0 days)
+    "days_since_last_activity": Column("float32"),
+    "contact_count": Column("int16", min_value=0),
+    "stage_probability": Column("float32", min_value=0, max_value=1),
+    "weighted_value": Column("float64", min_value=0),
+}
+
+_BOOL_VALUES = {True: True, False: False, 1: True, 0: False,
+                "true": True, "false": False, "1": True, "0": False}
+
+
+# ============================================================
+# Validation + casting
+# ============================================================
+
+def _examples(values: pd.Series, mask: np.ndarray, k: int = 3) -> str:
+    return ", ".join(repr(v) for v in pd.unique(values[mask])[:k])
+
+
+def _check(name: str, values: pd.Series, column: Column, problems: list):
+    """Validate one column and return it in its storage dtype (None if it can't be cast)."""
+    missing = values.isna().to_numpy()
+
+    if column.dtype == "category":
+        if column.categories is None:
+            return values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+        # On a Categorical, isin checks the categories once and takes over the codes
+        unknown = ~values.isin(column.categories).to_numpy() & ~missing
+        if unknown.any():
+            problems.append(f"{name}: {int(unknown.sum())} value(s) outside "
+                            f"{column.categories} (e.g. {_examples(values, unknown)})")
+            return None
+        cast = pd.Categorical(values, categories=column.categories)
+    elif column.dtype == "bool":
+        if pd.api.types.is_bool_dtype(values.dtype):
+            cast = values
+        else:
+            keys = values if pd.api.types.is_numeric_dtype(values.dtype) else \
+                values.astype(str).str.strip().str.lower()
+            cast = keys.map(_BOOL_VALUES)
+            bad = cast.isna().to_numpy() & ~missing
+            if bad.any():
+                problems.append(f"{name}: {int(bad.sum())} value(s) not true/false "
+                                f"(e.g. {_examples(values, bad)})")
+                return None
+    else:
+        cast = pd.to_numeric(values, errors="coerce")
+        numbers = cast.to_numpy(dtype="float64", na_value=np.nan)
+        bad = np.isnan(numbers) & ~missing
+        if bad.any():
+            problems.append(f"{name}: {int(bad.sum())} non-numeric value(s) "
+                            f"(e.g. {_examples(values, bad)})")
+            return None
+        low, high = column.min_value, column.max_value
+        if np.dtype(column.dtype).kind in "iu":
+            info = np.iinfo(column.dtype)
+            low = info.min if low is None else max(low, info.min)
+            high = info.max if high is None else min(high, info.max)
+            fractional = (numbers != np.floor(numbers)) & ~np.isnan(numbers)
+            if fractional.any():
+                problems.append(f"{name}: {int(fractional.sum())} non-integer value(s) "
+                                f"(e.g. {_examples(values, fractional)})")
+                return None
+        with np.errstate(invalid="ignore"):
+            out_of_range = np.zeros(len(numbers), dtype=bool)
+            if low is not None:
+                out_of_range |= numbers < low
+            if high is not None:
+                out_of_range |= numbers > high
+        if out_of_range.any():
+            problems.append(f"{name}: {int(out_of_range.sum())} value(s) outside "
+                            f"[{low}, {high}] (e.g. {_examples(values, out_of_range)})")
+            return None
+
+    if missing.any() and not column.nullable:
+        problems.append(f"{name}: {int(missing.sum())} missing value(s)")
+        return None
+    return cast if column.dtype == "category" else pd.Series(cast, index=values.index).astype(column.dtype)
+
+
+def validate(df: pd.DataFrame, schema: dict = DISTRICT_SCHEMA) -> list:
+    """Problems with the schema's columns present in ``df`` (empty list = valid)."""
+    problems = []
+    for name, column in schema.items():
+        if name in df.columns:
+            _check(name, df[name], column, problems)
+    return problems
+
+
+def check(df: pd.DataFrame, schema: dict = DISTRICT_SCHEMA) -> pd.DataFrame:
+    """Raise SchemaError if ``df`` doesn't fit ``schema``; ``df`` is returned unchanged."""
+    problems = validate(df, schema)
+    if problems:
+        raise SchemaError("; ".join(problems))
+    return df
+
+
+def apply_schema(df: pd.DataFrame, schema: dict = DISTRICT_SCHEMA) -> pd.DataFrame:
+    """
+    Validate ``df`` and return it with the schema's columns in their
+    storage dtypes. Columns the schema doesn't declare (district_name,
+    cds_code, dates ...) and declared columns ``df`` lacks are left alone.
+
+    Raises:
+        SchemaError: listing every column that failed, with counts and
+        example values
+    """
+    problems, cast = [], {}
+    for name, column in schema.items():
+        if name in df.columns:
+            values = _check(name, df[name], column, problems)
+            if values is not None and values.dtype != df[name].dtype:
+                cast[name] = values
+    if problems:
+        raise SchemaError("; ".join(problems))
+    if not cast:
+        return df
+    out = df.copy(deep=False)
+    for name, values in cast.items():
+        out[name] = values
+    return out
+
+
+def bytes_per_row(df: pd.DataFrame) -> float:
+    """In-memory size per row, strings included (memory_usage(deep=True))."""
+    return float(df.memory_usage(deep=True, index=False).sum()) / max(len(df), 1)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "07_streamlit_demo"))
+    from dashboard_data import synthetic_districts
+
+    parser = argparse.ArgumentParser(description="Memory and isin speed: loose vs declared dtypes")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    loose = synthetic_districts(args.rows)
+    loose["county"] = loose["county"].astype(object)
+    loose["sor_adoption_signal"] = loose["sor_adoption_signal"].astype(object)
+    start = time.perf_counter()
+    compact = apply_schema(loose)
+    print(f"apply_schema: {args.rows:,} rows in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for label, frame in (("loose", loose), ("compact", compact)):
+        start = time.perf_counter()
+        for _ in range(20):
+            frame["county"].isin(["Los Angeles", "Orange"]) & frame["sor_adoption_signal"].isin(["Committed"])
+        print(f"{label:>8}: {bytes_per_row(frame):6.1f} bytes/row, "
+              f"isin filter {(time.perf_counter() - start) / 20 * 1000:.2f} ms")
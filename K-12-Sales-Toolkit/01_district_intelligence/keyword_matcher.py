@@ -0,0 +1,165 @@
+"""
+keyword_matcher.py
+Single-pass, word-boundary keyword matching for SOR adoption signals.
+
+All keyword sets are compiled into ONE regex whose alternation is factored
+as a character trie ("phon(?:emic awareness|ics instruction)"), so the
+engine tests one branch per leading character instead of every keyword at
+every position. Matching respects word boundaries ("SOR" no longer matches
+inside "professor") and any run of whitespace inside a multi-word keyword.
+
+For a small keyword set (the tracker's 13) even that pattern costs more
+than a substring test per keyword: Python's regex engine steps through
+every character. distinct_counts therefore probes each keyword on its own:
+a C-speed str.find for its first word and, only where that occurs, a
+search from there with a pattern that starts with the literal word (which
+the engine skips to directly) to check the rest and the word boundaries.
+The answers are identical as long as no two keywords can match
+overlapping text (checked when the matcher is built); otherwise, and for
+large sets, it uses the single-pass scan.
+"""
+import re
+
+# Above this many keywords the single-pass trie scan beats one probe per keyword
+PROBE_MAX_KEYWORDS = 40
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _trie_pattern(keywords) -> str:
+    """Build a prefix-factored alternation for lowercase ``keywords``."""
+    trie = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        alts = []
+        optional = False
+        for ch, child in sorted(node.items()):
+            if ch == "":
+                optional = True
+                continue
+            alts.append((r"\s+" if ch == " " else re.escape(ch)) + build(child))
+        if not alts:
+            return ""
+        if len(alts) == 1 and not optional:
+            return alts[0]
+        # Greedy "?" tries the longer keyword first ("sort" before "sor")
+        body = "(?:" + "|".join(alts) + ")"
+        return body + "?" if optional else body
+
+    return build(trie)
+
+
+def _word_starts(key: str) -> list:
+    return [i for i in range(len(key)) if _WORD_CHAR.match(key, i) and (i == 0 or not _WORD_CHAR.match(key, i - 1))]
+
+
+def _can_overlap(keys) -> bool:
+    """
+    Whether matches of two different (normalized) keywords can share text:
+    one starts at a word start inside the other, or the keywords don't
+    start with a word character. Conservative — it ignores the trailing
+    boundary.
+    """
+    keys = list(keys)
+    if any(not _WORD_CHAR.match(k) for k in keys):
+        return True
+    for a in keys:
+        for i in _word_starts(a):
+            tail = a[i:]
+            if any(b != a and (b.startswith(tail) or tail.startswith(b)) for b in keys):
+                return True
+    return False
+
+
+def _probe_pattern(key: str):
+    """
+    One keyword's pattern with its literal first word up front, so the
+    engine jumps between occurrences of that word; the leading word
+    boundary becomes a fixed-width lookbehind after it.
+    """
+    body, first = _trie_pattern([key]), _trie_pattern([key.split(" ")[0]])
+    return re.compile(rf"{first}(?<!\w{first}){body[len(first):]}(?!\w)")
+
+
+class KeywordMatcher:
+    """
+    Precompiled matcher over several named keyword sets.
+
+    Usage:
+        matcher = KeywordMatcher({"sor": SOR_KEYWORDS, "resistance": RESISTANCE_KEYWORDS})
+        matcher.match("LAUSD adopts the Science of Reading")
+        # {"sor": {"count": 1, "distinct": 1, "keywords": {...}, "spans": [...]},
+        #  "resistance": {"count": 0, ...}}
+
+    Matching is case-insensitive. Where keywords overlap, the longest match
+    at each position wins and each character is counted at most once.
+    """
+
+    def __init__(self, keyword_sets: dict):
+        self.keyword_sets = {name: list(kws) for name, kws in keyword_sets.items()}
+        self._lookup = {}
+        for name, kws in self.keyword_sets.items():
+            for kw in kws:
+                key = self._normalize(kw)
+                if key in self._lookup and self._lookup[key][0] != name:
+                    raise ValueError(f"Keyword {kw!r} is in both {self._lookup[key][0]!r} and {name!r}")
+                self._lookup[key] = (name, kw)
+
+        # Lookarounds instead of \b so keywords like "AB 2222" or
+        # "three-cueing" still need a non-word character on each side.
+        body = _trie_pattern(self._lookup) or "(?!)"  # no keywords: never match
+        self._pattern = re.compile(rf"(?<!\w){body}(?!\w)")
+        self._pattern_ci = re.compile(self._pattern.pattern, re.IGNORECASE)
+        # Per-keyword probes: (set name, first word, keyword pattern)
+        self._probes = None
+        if len(self._lookup) <= PROBE_MAX_KEYWORDS and not _can_overlap(self._lookup):
+            self._probes = [(name, key.split(" ")[0], _probe_pattern(key))
+                            for key, (name, _) in self._lookup.items()]
+        self._zeros = dict.fromkeys(self.keyword_sets, 0)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def _finditer(self, text: str):
+        lowered = text.lower()
+        # str.lower() can change length for a few non-ASCII characters;
+        # spans must index the original text, so fall back to re.IGNORECASE.
+        if len(lowered) != len(text):
+            return self._pattern_ci.finditer(text)
+        return self._pattern.finditer(lowered)
+
+    def match(self, text: str) -> dict:
+        """Counts, per-keyword hits and (start, end, keyword) spans for every set."""
+        out = {name: {"count": 0, "distinct": 0, "keywords": {}, "spans": []}
+               for name in self.keyword_sets}
+        for m in self._finditer(text):
+            name, kw = self._lookup[self._normalize(m.group())]
+            res = out[name]
+            res["count"] += 1
+            res["keywords"][kw] = res["keywords"].get(kw, 0) + 1
+            res["spans"].append((m.start(), m.end(), kw))
+        for res in out.values():
+            res["distinct"] = len(res["keywords"])
+        return out
+
+    def distinct_counts(self, text: str) -> dict:
+        """Number of distinct keywords found per set (the classifier's signal)."""
+        counts = self._zeros.copy()
+        lowered = text.lower()
+        # Same condition as _finditer: the probes run on the lowered text
+        if self._probes is not None and len(lowered) == len(text):
+            for name, first_word, pattern in self._probes:
+                i = lowered.find(first_word)
+                if i != -1 and pattern.search(lowered, i):
+                    counts[name] += 1
+            return counts
+        lookup = self._lookup
+        for hit in {self._normalize(m.group()) for m in self._finditer(text)}:
+            counts[lookup[hit][0]] += 1
+        return counts
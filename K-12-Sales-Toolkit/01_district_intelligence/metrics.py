@@ -0,0 +1,359 @@
+"""
+metrics.py
+Process-wide timing and counter instrumentation for the toolkit.
+
+Records four kinds of measurements, all keyed by a few string labels:
+
+    stage(name)                  latency histogram of a pipeline stage
+    external_call(service)       latency histogram + call count by outcome
+                                 (ok / error) for network calls
+    cache_lookup(cache, hits, misses)   cache hit rate
+    rows(stage, n)               rows / articles / prospects processed
+
+Off by default. While disabled every helper returns after one attribute
+check — stage() hands back a shared no-op context manager — so the calls
+can stay in hot paths. Enable with K12_METRICS=1 or metrics.enable().
+
+Export: to_prometheus() (text exposition format, for node_exporter's
+textfile collector or a pushgateway) or to_json(); write(path) picks the
+format from the extension (.prom / .json). summary_frame() is the table
+behind the dashboard's sidebar timing panel.
+
+Run: python metrics.py --out metrics.prom
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+BUCKETS = (0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PREFIX = "k12"
+
+_HELP = {
+    "stage_seconds": ("histogram", "Latency of a pipeline stage or dashboard page"),
+    "external_call_seconds": ("histogram", "Latency of calls to external services"),
+    "external_calls_total": ("counter", "Calls to external services by outcome"),
+    "cache_requests_total": ("counter", "Cache lookups by result"),
+    "rows_processed_total": ("counter", "Rows, articles or prospects processed by a stage"),
+}
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus semantics: cumulative on export)."""
+
+    __slots__ = ("counts", "sum", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def copy(self) -> "Histogram":
+        out = Histogram()
+        out.counts, out.sum, out.count, out.max = list(self.counts), self.sum, self.count, self.max
+        return out
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile: linear interpolation inside the bucket that holds it (capped at max)."""
+        if not self.count:
+            return float("nan")
+        target, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= target:
+                lo = BUCKETS[i - 1] if i else 0.0
+                hi = min(BUCKETS[i] if i < len(BUCKETS) else self.max, self.max)
+                return lo + (hi - lo) * (target - seen) / n
+            seen += n
+        return self.max
+
+
+class _NoOp:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def fail(self):
+        pass
+
+
+_NOOP = _NoOp()
+
+
+class _Timer:
+    __slots__ = ("_registry", "_name", "_labels", "_outcome_counter", "_start", "_failed")
+
+    def __init__(self, registry, name, labels, outcome_counter=None):
+        self._registry = registry
+        self._name = name
+        self._labels = labels
+        self._outcome_counter = outcome_counter
+        self._failed = False
+
+    def fail(self):
+        """Count this call as outcome=error without raising (e.g. an HTTP 5xx response)."""
+        self._failed = True
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        self._registry._observe(self._name, self._labels, elapsed)
+        if self._outcome_counter:
+            outcome = "error" if exc_type is not None or self._failed else "ok"
+            self._registry._inc(self._outcome_counter, self._labels + (("outcome", outcome),), 1)
+        return False
+
+
+# ============================================================
+# Registry
+# ============================================================
+
+class Registry:
+    """
+    Usage:
+        registry = Registry(enabled=True)      # or the module-level helpers
+        with registry.stage("tracker.classify"):
+            ...
+        registry.rows("tracker.classify", 120)
+        print(registry.to_prometheus())
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms = {}   # (name, labels) -> Histogram
+        self._counters = {}     # (name, labels) -> float
+
+    # ------------------------------------------------------------
+    # Recording (each returns at once while disabled)
+    # ------------------------------------------------------------
+    def stage(self, name: str):
+        """Context manager timing one run of a stage."""
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self, "stage_seconds", (("stage", name),))
+
+    def external_call(self, service: str):
+        """
+        Context manager timing one external call. An exception, or .fail()
+        on the object it yields, counts the call as outcome=error.
+        """
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self, "external_call_seconds", (("service", service),), "external_calls_total")
+
+    def cache_lookup(self, cache: str, hits: int = 0, misses: int = 0):
+        if not self.enabled:
+            return
+        if hits:
+            self._inc("cache_requests_total", (("cache", cache), ("result", "hit")), hits)
+        if misses:
+            self._inc("cache_requests_total", (("cache", cache), ("result", "miss")), misses)
+
+    def rows(self, stage: str, n: int):
+        if self.enabled and n:
+            self._inc("rows_processed_total", (("stage", stage),), n)
+
+    # Label tuples are stored sorted by label name, so lookups can rebuild them
+    def _observe(self, name: str, labels: tuple, value: float):
+        labels = tuple(sorted(labels))
+        with self._lock:
+            hist = self._histograms.get((name, labels))
+            if hist is None:
+                hist = self._histograms[(name, labels)] = Histogram()
+            hist.observe(value)
+
+    def _inc(self, name: str, labels: tuple, value: float):
+        labels = tuple(sorted(labels))
+        with self._lock:
+            self._counters[(name, labels)] = self._counters.get((name, labels), 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    # ------------------------------------------------------------
+    # Reading / export (each reads a snapshot taken under the lock:
+    # recording threads may add series mid-read)
+    # ------------------------------------------------------------
+    def counter(self, name: str, **labels) -> float:
+        """Current value of one counter series (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def histogram(self, name: str, **labels):
+        """A copy of one histogram series, or None."""
+        with self._lock:
+            hist = self._histograms.get((name, tuple(sorted(labels.items()))))
+            return hist.copy() if hist is not None else None
+
+    def cache_hit_rates(self) -> dict:
+        """{cache: hit rate} over every cache with at least one lookup."""
+        with self._lock:
+            counters = list(self._counters.items())
+        totals = {}
+        for (name, labels), value in counters:
+            if name == "cache_requests_total":
+                d = dict(labels)
+                hits, total = totals.get(d["cache"], (0, 0))
+                totals[d["cache"]] = (hits + (value if d["result"] == "hit" else 0), total + value)
+        return {cache: hits / total for cache, (hits, total) in sorted(totals.items())}
+
+    def to_json(self) -> dict:
+        with self._lock:
+            histograms = [{"name": f"{PREFIX}_{name}", "labels": dict(labels), "count": h.count,
+                           "sum": h.sum, "p50": h.quantile(0.5), "p95": h.quantile(0.95),
+                           "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], h.counts))}
+                          for (name, labels), h in sorted(self._histograms.items())]
+            counters = [{"name": f"{PREFIX}_{name}", "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self._counters.items())]
+        return {"generated_at": time.time(), "histograms": histograms, "counters": counters,
+                "cache_hit_rates": self.cache_hit_rates()}
+
+    def to_prometheus(self) -> str:
+        def fmt(labels):
+            if not labels:
+                return ""
+            return "{" + ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in labels) + "}"
+
+        lines = []
+        with self._lock:
+            series = {}
+            for (name, labels), h in self._histograms.items():
+                series.setdefault(name, []).append((labels, h))
+            for (name, labels), value in self._counters.items():
+                series.setdefault(name, []).append((labels, value))
+            for name in sorted(series):
+                kind, help_text = _HELP.get(name, ("untyped", name))
+                lines += [f"# HELP {PREFIX}_{name} {help_text}", f"# TYPE {PREFIX}_{name} {kind}"]
+                for labels, value in sorted(series[name], key=lambda s: s[0]):
+                    if isinstance(value, Histogram):
+                        cumulative = 0
+                        for bound, n in zip([*BUCKETS, "+Inf"], value.counts):
+                            cumulative += n
+                            le = bound if bound == "+Inf" else repr(float(bound))
+                            lines.append(f"{PREFIX}_{name}_bucket{fmt(labels + (('le', le),))} {cumulative}")
+                        lines.append(f"{PREFIX}_{name}_sum{fmt(labels)} {value.sum!r}")
+                        lines.append(f"{PREFIX}_{name}_count{fmt(labels)} {value.count}")
+                    else:
+                        lines.append(f"{PREFIX}_{name}{fmt(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> str:
+        """Atomically write Prometheus text (.prom / .txt) or JSON (.json) to ``path``."""
+        if path.endswith(".json"):
+            body = json.dumps(self.to_json(), indent=2)
+        else:
+            body = self.to_prometheus()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(body)
+        os.replace(tmp, path)
+        return path
+
+    def summary_frame(self):
+        """
+        One row per timed stage / external service: calls, errors, total
+        and mean seconds, p50 / p95 ms, rows processed. Slowest total first.
+        """
+        import pandas as pd
+
+        rows = []
+        with self._lock:
+            for (name, labels), h in self._histograms.items():
+                kind, label = labels[0]
+                rows.append({
+                    "name": label if kind == "stage" else f"{label} (external)",
+                    "calls": h.count,
+                    "errors": int(self._counters.get(
+                        ("external_calls_total", tuple(sorted(labels + (("outcome", "error"),)))), 0)),
+                    "total_s": round(h.sum, 4),
+                    "mean_ms": round(1000 * h.sum / h.count, 2),
+                    "p50_ms": round(1000 * h.quantile(0.5), 2),
+                    "p95_ms": round(1000 * h.quantile(0.95), 2),
+                    "rows": int(self._counters.get(("rows_processed_total", labels), 0)) if kind == "stage" else 0,
+                })
+        columns = ["name", "calls", "errors", "total_s", "mean_ms", "p50_ms", "p95_ms", "rows"]
+        return pd.DataFrame(rows, columns=columns).sort_values("total_s", ascending=False,
+                                                                ignore_index=True)
+
+
+# ============================================================
+# Process-wide registry + helpers
+# ============================================================
+
+REGISTRY = Registry(enabled=os.getenv("K12_METRICS", "").lower() in ("1", "true", "yes"))
+
+
+def enable():
+    REGISTRY.enabled = True
+
+
+def disable():
+    REGISTRY.enabled = False
+
+
+def enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def stage(name: str):
+    if not REGISTRY.enabled:
+        return _NOOP
+    return REGISTRY.stage(name)
+
+
+def external_call(service: str):
+    if not REGISTRY.enabled:
+        return _NOOP
+    return REGISTRY.external_call(service)
+
+
+def cache_lookup(cache: str, hits: int = 0, misses: int = 0):
+    if REGISTRY.enabled:
+        REGISTRY.cache_lookup(cache, hits, misses)
+
+
+def rows(stage_name: str, n: int):
+    if REGISTRY.enabled:
+        REGISTRY.rows(stage_name, n)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Instrumentation overhead demo + export")
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--out", help="Write the demo registry (.prom or .json)")
+    args = parser.parse_args()
+
+    for state in ("disabled", "enabled"):
+        REGISTRY.enabled = state == "enabled"
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            with stage("demo.loop"):
+                pass
+            rows("demo.loop", 1)
+        elapsed = time.perf_counter() - start
+        print(f"{state:>8}: {elapsed / args.calls * 1e9:,.0f} ns per timed stage + row count")
+    cache_lookup("demo_cache", hits=3, misses=1)
+    print(REGISTRY.summary_frame().to_string(index=False))
+    if args.out:
+        print(f"Wrote {REGISTRY.write(args.out)}")
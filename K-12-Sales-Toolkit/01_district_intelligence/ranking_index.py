@@ -0,0 +1,440 @@
+"""
+ranking_index.py
+Incrementally maintained ranking of districts by Partnership Readiness.
+
+Re-scoring and re-sorting every district because one of them changed SOR
+stage is O(n log n) per change. This index keeps scores as integer units
+(hundredths of a point, like score_districts' rounding) in a Fenwick tree
+of counts per score bucket, so for one changed district:
+
+    update / insert / remove    O(log B)        (B = 10,001 score buckets)
+    rank_of                     O(log B)
+    top_k(k)                    O(k log B)
+
+Every update that moves a district across a tier threshold returns a
+TierChange event ("Fresno Unified moved into Tier 1"). The weekly SOR
+tracking output feeds straight in via apply_tracker_results().
+
+Districts are keyed by cds_code when the frame has one (names repeat
+across counties: "Jefferson Elementary"), else by district_name; events
+and top_k always show the name.
+
+Run: python ranking_index.py --districts 100000 --updates 10000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from district_scoring import (SCORE_COLUMNS, TIER_LABELS, TIER_THRESHOLDS, score_arrays,
+                              score_one)
+
+MAX_SCORE = 100
+
+
+# ============================================================
+# Events
+# ============================================================
+
+class TierChange:
+    """A district crossing a tier threshold (old_tier None = newly added, new_tier None = removed)."""
+
+    def __init__(self, district: str, old_tier, new_tier, old_score, new_score, key=None):
+        self.district = district
+        self.key = district if key is None else key   # index key (cds_code when keyed by code)
+        self.old_tier = old_tier
+        self.new_tier = new_tier
+        self.old_score = old_score
+        self.new_score = new_score
+
+    @property
+    def direction(self) -> str:
+        if self.old_tier is None:
+            return "added"
+        if self.new_tier is None:
+            return "removed"
+        return "up" if TIER_LABELS.index(self.new_tier) < TIER_LABELS.index(self.old_tier) else "down"
+
+    def as_dict(self) -> dict:
+        return {"district": self.district, "old_tier": self.old_tier, "new_tier": self.new_tier,
+                "old_score": self.old_score, "new_score": self.new_score, "direction": self.direction}
+
+    def __str__(self):
+        if self.old_tier is None:
+            return f"{self.district} entered the ranking in {self.new_tier} ({self.new_score:.2f})"
+        if self.new_tier is None:
+            return f"{self.district} left the ranking (was {self.old_tier})"
+        verb = "moved into" if self.direction == "up" else "dropped to"
+        return f"{self.district} {verb} {self.new_tier} ({self.old_score:.2f} -> {self.new_score:.2f})"
+
+    def __repr__(self):
+        return f"TierChange({self.as_dict()!r})"
+
+
+def events_frame(events: list) -> pd.DataFrame:
+    """TierChange events as a DataFrame (one row each, in order)."""
+    return pd.DataFrame([e.as_dict() for e in events],
+                        columns=["district", "old_tier", "new_tier", "old_score", "new_score", "direction"])
+
+
+# ============================================================
+# Index
+# ============================================================
+
+class RankingIndex:
+    """
+    Usage:
+        index = RankingIndex.from_districts(load_district_data())   # keyed by cds_code
+        index.top_k(25)                                   # DataFrame, best first
+        index.rank_of("1964881")                          # 1 = highest score
+        for event in index.update("1964881", sor_adoption_signal="Implementing"):
+            print(event)                                  # Pasadena Unified moved into Tier 1 ...
+
+    Every method takes the index key (``key_col``). Ranks are competition
+    ranks: districts with equal scores share a rank and top_k lists them
+    alphabetically.
+    """
+
+    def __init__(self, decimals: int = 2):
+        self.decimals = decimals
+        self._scale = 10 ** decimals
+        self._n_buckets = MAX_SCORE * self._scale + 1
+        self._tier_units = [int(t * self._scale) for t in TIER_THRESHOLDS]
+        self.key_col = "district_name"
+        self._names = {}                           # key -> district name (keyed by code only)
+        self._key_by_name = {}                     # unambiguous district name -> key
+        self._tree = [0] * (self._n_buckets + 1)   # Fenwick tree, 1-based; bucket 0 = score 100
+        self._buckets = {}                         # bucket -> set of district keys
+        self._units = {}                           # key -> score in units
+        self._pos = {}                             # key -> row in self._inputs
+        self._inputs = {col: [] for col in SCORE_COLUMNS.values()}   # score inputs, column-wise
+        self._changed = set()                      # keys updated / removed since built
+
+    # ------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------
+    @classmethod
+    def from_districts(cls, districts: pd.DataFrame, name_col: str = "district_name",
+                       decimals: int = 2, key_col: str = None) -> "RankingIndex":
+        """
+        Build from a district frame with the SCORE_COLUMNS inputs, scoring
+        every row in one vectorized pass and the tree in O(n + B).
+
+        Args:
+            key_col: unique district key; default cds_code when the frame
+                     has it, else ``name_col``
+
+        Raises:
+            ValueError: duplicate keys
+        """
+        index = cls(decimals)
+        if key_col is None:
+            key_col = "cds_code" if "cds_code" in districts.columns else name_col
+        if districts[key_col].duplicated().any():
+            raise ValueError(f"Duplicate district keys in {key_col!r}")
+        index.key_col = key_col
+        inputs = districts[list(SCORE_COLUMNS.values())]
+        scores = score_arrays(**{arg: inputs[col] for arg, col in SCORE_COLUMNS.items()},
+                              decimals=decimals)
+        buckets = index._bucket_array(scores)
+
+        keys = districts[key_col].astype(str).tolist() if key_col != name_col \
+            else districts[name_col].tolist()
+        if key_col != name_col:
+            names = districts[name_col]
+            index._names = dict(zip(keys, names.tolist()))
+            unique = ~names.duplicated(keep=False).to_numpy()
+            index._key_by_name = dict(zip(names[unique].tolist(), np.asarray(keys, dtype=object)[unique]))
+        index._units = dict(zip(keys, (index._n_buckets - 1 - buckets).tolist()))
+        index._pos = dict(zip(keys, range(len(keys))))
+        index._inputs = {col: inputs[col].tolist() for col in inputs.columns}
+        for key, b in zip(keys, buckets.tolist()):
+            index._buckets.setdefault(b, set()).add(key)
+
+        # Fenwick node i covers buckets (i - lowbit(i), i]: a difference of prefix sums
+        prefix = np.concatenate(([0], np.cumsum(np.bincount(buckets, minlength=index._n_buckets))))
+        i = np.arange(1, index._n_buckets + 1)
+        index._tree = [0] + (prefix[i] - prefix[i - (i & -i)]).tolist()
+        return index
+
+    def copy(self) -> "RankingIndex":
+        """An independent copy: updates to either leave the other unchanged."""
+        out = self.__class__.__new__(self.__class__)
+        out.__dict__.update(self.__dict__)   # the name maps are never mutated: shared
+        out._tree = list(self._tree)
+        out._buckets = {b: set(members) for b, members in self._buckets.items()}
+        out._units = dict(self._units)
+        out._pos = dict(self._pos)
+        out._inputs = {col: list(values) for col, values in self._inputs.items()}
+        out._changed = set(self._changed)
+        return out
+
+    def _bucket_array(self, scores) -> np.ndarray:
+        units = np.rint(np.clip(np.asarray(scores, dtype=np.float64), 0, MAX_SCORE) * self._scale)
+        return (self._n_buckets - 1 - units).astype(np.int64)
+
+    # ------------------------------------------------------------
+    # Fenwick tree
+    # ------------------------------------------------------------
+    def _add(self, bucket: int, delta: int):
+        i, tree, n = bucket + 1, self._tree, self._n_buckets
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def _count_before(self, bucket: int) -> int:
+        """Districts in buckets < ``bucket`` (i.e. with a strictly higher score)."""
+        total, i, tree = 0, bucket, self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _bucket_of_nth(self, n: int) -> int:
+        """Bucket holding the n-th district (1-based) in score order."""
+        pos, tree, step = 0, self._tree, 1 << self._n_buckets.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self._n_buckets and tree[nxt] < n:
+                pos = nxt
+                n -= tree[nxt]
+            step >>= 1
+        return pos
+
+    # ------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------
+    def set_score(self, district: str, score: float):
+        """
+        Place ``district`` at ``score`` directly (insert if new).
+
+        Returns:
+            TierChange when the district changed tier (or was added), else None
+        """
+        new_units = round(min(max(float(score), 0.0), MAX_SCORE) * self._scale)
+        old_units = self._units.get(district)
+        if old_units == new_units:
+            return None
+        self._changed.add(district)
+        if old_units is not None:
+            self._move_out(district, old_units)
+        bucket = self._n_buckets - 1 - new_units
+        self._buckets.setdefault(bucket, set()).add(district)
+        self._add(bucket, 1)
+        self._units[district] = new_units
+        return self._event(district, old_units, new_units)
+
+    def update(self, district: str, **fields) -> list:
+        """
+        Change score inputs (SCORE_COLUMNS column names, e.g.
+        ``sor_adoption_signal="Committed"``) and re-score that one district.
+        A new district needs every input.
+
+        Returns:
+            list of TierChange events (empty when the tier held)
+        """
+        unknown = set(fields) - set(SCORE_COLUMNS.values())
+        if unknown:
+            raise ValueError(f"Not a score input: {', '.join(sorted(unknown))}")
+        pos = self._pos.get(district)
+        if pos is None:
+            missing = set(SCORE_COLUMNS.values()) - set(fields)
+            if missing:
+                raise KeyError(f"{district!r} is not indexed; missing {', '.join(sorted(missing))}")
+            pos = self._pos[district] = len(self._inputs[SCORE_COLUMNS["ela_pct"]])
+            for col, values in self._inputs.items():
+                values.append(fields[col])
+        else:
+            for col, value in fields.items():
+                self._inputs[col][pos] = value
+        self._changed.add(district)
+        row = {col: values[pos] for col, values in self._inputs.items()}
+        score = score_one(**{arg: row[col] for arg, col in SCORE_COLUMNS.items()},
+                          decimals=self.decimals)
+        event = self.set_score(district, score)
+        return [event] if event is not None else []
+
+    def update_many(self, changes: pd.DataFrame, key_col: str = None) -> list:
+        """
+        Apply one ``update`` per row of ``changes`` (keyed by ``key_col``,
+        default the index's key column; score-input columns only); all events.
+        """
+        fields = [c for c in changes.columns if c in SCORE_COLUMNS.values()]
+        events = []
+        for key, row in zip(changes[key_col or self.key_col], changes[fields].to_dict("records")):
+            events.extend(self.update(key, **row))
+        return events
+
+    def apply_tracker_results(self, results: pd.DataFrame, resolver=None) -> list:
+        """
+        Feed SOR tracker output (WeeklyTrackingJob.current_state(),
+        load_partitions() or track_district_list(): ``district``, ``stage``)
+        into the index. Districts not in the index are skipped — without
+        their other inputs they cannot be scored.
+
+        Args:
+            resolver: district_resolver.DistrictResolver mapping the
+                      tracker's free-text names ("LAUSD") to index keys;
+                      without one, only exact (unambiguous) names match
+
+        Returns:
+            list of TierChange events
+        """
+        names = results["district"].reset_index(drop=True)
+        keys = names.map(self._key_by_name) if self._names else names
+        if resolver is not None:
+            resolved = resolver.resolve_batch(names)["cds_code" if self._names else "district_name"]
+            keys = resolved.where(resolved.notna(), keys)
+        known = keys.isin(self._pos.keys()).to_numpy()
+        changes = pd.DataFrame({self.key_col: keys[known].to_numpy(),
+                                SCORE_COLUMNS["sor_signal"]: results["stage"].to_numpy()[known]})
+        return self.update_many(changes)
+
+    def remove(self, district: str):
+        """Drop ``district``; returns its TierChange (new_tier None). KeyError when unknown."""
+        units = self._units.pop(district)
+        self._changed.add(district)
+        self._move_out(district, units)
+        self._pos.pop(district, None)  # its input slot is left unused
+        return TierChange(self.name_of(district), self._tier(units), None, units / self._scale, None,
+                          key=district)
+
+    def _move_out(self, district: str, units: int):
+        bucket = self._n_buckets - 1 - units
+        members = self._buckets[bucket]
+        members.discard(district)
+        if not members:
+            del self._buckets[bucket]
+        self._add(bucket, -1)
+
+    def _tier(self, units: int) -> str:
+        # Same cut-offs as district_scoring.tier_codes, on integer units
+        return TIER_LABELS[sum(units < t for t in self._tier_units)]
+
+    def _event(self, district: str, old_units, new_units):
+        new_tier = self._tier(new_units)
+        name = self.name_of(district)
+        if old_units is None:
+            return TierChange(name, None, new_tier, None, new_units / self._scale, key=district)
+        old_tier = self._tier(old_units)
+        if old_tier == new_tier:
+            return None
+        return TierChange(name, old_tier, new_tier, old_units / self._scale, new_units / self._scale,
+                          key=district)
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def __len__(self):
+        return len(self._units)
+
+    def __contains__(self, district):
+        return district in self._units
+
+    def name_of(self, district: str) -> str:
+        """District name for an index key (the key itself when there is no name)."""
+        return self._names.get(district, district)
+
+    def score_of(self, district: str) -> float:
+        return self._units[district] / self._scale
+
+    def tier_of(self, district: str) -> str:
+        return self._tier(self._units[district])
+
+    def rank_of(self, district: str) -> int:
+        """1-based competition rank (1 + districts with a strictly higher score)."""
+        return self._count_before(self._n_buckets - 1 - self._units[district]) + 1
+
+    def ranks(self, districts) -> np.ndarray:
+        """rank_of for many districts (one Fenwick query per distinct score)."""
+        cache = {}
+        out = np.empty(len(districts), dtype=np.int64)
+        for i, d in enumerate(districts):
+            units = self._units[d]
+            if units not in cache:
+                cache[units] = self._count_before(self._n_buckets - 1 - units) + 1
+            out[i] = cache[units]
+        return out
+
+    def top_k(self, k: int = 25) -> pd.DataFrame:
+        """
+        Highest-scoring ``k`` districts, best first.
+
+        Returns:
+            DataFrame with columns: district_name, rank, readiness_score,
+            tier (+ the key column, e.g. cds_code, when keyed by code)
+        """
+        k = max(0, min(int(k), len(self)))
+        rows, taken = [], 0
+        while taken < k:
+            bucket = self._bucket_of_nth(taken + 1)
+            rank, units = taken + 1, self._n_buckets - 1 - bucket
+            tied = sorted(self._buckets[bucket], key=lambda key: (self.name_of(key), key))
+            for key in tied[:k - taken]:
+                rows.append((self.name_of(key), key, rank, units / self._scale, self._tier(units)))
+            taken = len(rows)
+        top = pd.DataFrame(rows, columns=["district_name", "key", "rank", "readiness_score", "tier"])
+        if not self._names:
+            return top.drop(columns="key")
+        return top.rename(columns={"key": self.key_col})
+
+    def changed_rows(self) -> pd.DataFrame:
+        """
+        Every district updated or removed since the index was built, as
+        frame rows: the key column, readiness_score, tier and the score
+        inputs (removed districts have a NaN score and no tier). Feed to
+        dashboard_data.with_ranking_updates to bring a district frame in line.
+        """
+        keys = sorted(self._changed)
+        rows = []
+        for key in keys:
+            units, pos = self._units.get(key), self._pos.get(key)
+            inputs = {col: values[pos] if pos is not None else None for col, values in self._inputs.items()}
+            rows.append({self.key_col: key,
+                         "readiness_score": units / self._scale if units is not None else np.nan,
+                         "tier": self._tier(units) if units is not None else None, **inputs})
+        return pd.DataFrame(rows, columns=[self.key_col, "readiness_score", "tier",
+                                           *SCORE_COLUMNS.values()])
+
+    def tier_counts(self) -> dict:
+        """Districts per tier, from three prefix-count queries."""
+        counts, below = {}, 0
+        for threshold, label in zip(self._tier_units, TIER_LABELS):
+            at_or_above = self._count_before(self._n_buckets - threshold)
+            counts[label] = at_or_above - below
+            below = at_or_above
+        counts[TIER_LABELS[-1]] = len(self) - below
+        return counts
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "07_streamlit_demo"))
+    from dashboard_data import synthetic_districts
+
+    parser = argparse.ArgumentParser(description="Incremental readiness ranking index")
+    parser.add_argument("--districts", type=int, default=100_000)
+    parser.add_argument("--updates", type=int, default=10_000)
+    args = parser.parse_args()
+
+    districts = synthetic_districts(args.districts, score=False)
+    start = time.perf_counter()
+    index = RankingIndex.from_districts(districts)
+    print(f"Built index over {len(index):,} districts in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = np.random.default_rng(0)
+    names = districts[index.key_col].to_numpy()[rng.integers(0, len(districts), args.updates)]
+    stages = rng.choice(["None", "Exploring", "Committed", "Implementing"], args.updates)
+    start = time.perf_counter()
+    events = []
+    for name, stage in zip(names, stages):
+        events.extend(index.update(name, sor_adoption_signal=stage))
+    elapsed = time.perf_counter() - start
+    print(f"{args.updates:,} SOR-stage updates in {elapsed * 1000:.0f} ms "
+          f"({elapsed / args.updates * 1e6:.1f} us each), {len(events):,} tier changes, e.g.:")
+    for event in events[:5]:
+        print(f"  {event}")
+    print(index.top_k(10).to_string(index=False))
+    print(index.tier_counts())
@@ -8,6 +8,13 @@ import pandas as pd
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+import metrics
+from article_cache import ArticleCache
+from article_dedup import SignatureIndex, article_text
+from district_resolver import resolve_column
+from keyword_matcher import KeywordMatcher
+from sor_source_fetcher import MultiSourceFetcher, default_sources
+
 load_dotenv()
 
 class SORAdoptionTracker:
@@ -23,8 +30,9 @@ class SORAdoptionTracker:
 
     TODO (Jules):
         - Implement live Google News scraper
-        - Add CDE policy document parser
-        - Schedule to run weekly (cron job or GitHub Action)
+        - Download board minutes / CDE documents into data/raw/documents
+          (parsed and classified by document_ingest.py)
+        - Schedule weekly_tracking_job.py to run weekly (cron job or GitHub Action)
     """
 
     SOR_KEYWORDS = [
@@ -39,20 +47,46 @@ class SORAdoptionTracker:
         "MSV", "leveled readers only",
     ]
 
-    def __init__(self):
+    # Signal counts needed per stage, for the keyword rules (distinct phrases
+    # per story). A classifier backend with its own scale sets stage_thresholds.
+    STAGE_THRESHOLDS = {"implementing": 3, "committed": 1, "resistant": 2}
+
+    def __init__(self, sor_keywords: list = None, resistance_keywords: list = None,
+                 cache: ArticleCache = None, dedup: SignatureIndex = None, classifier=None):
         self.api_key = os.getenv("NEWSAPI_KEY")
         self.results = []
+        self.cache = cache
+        self.dedup = dedup  # near-duplicate index: each story counts (and is matched) once
+        # None = keyword rules; or a backend with .name and .signal_counts(texts),
+        # e.g. sor_embedding_classifier.EmbeddingClassifier
+        self.classifier = classifier
+        self.sor_keywords = list(sor_keywords or self.SOR_KEYWORDS)
+        self.resistance_keywords = list(resistance_keywords or self.RESISTANCE_KEYWORDS)
+        self.matcher = KeywordMatcher({"sor": self.sor_keywords,
+                                       "resistance": self.resistance_keywords})
 
     def search_district_news(self, district_name: str, days_back: int = 90) -> list:
         """
         Search NewsAPI for recent SOR mentions for a district.
-        
-        TODO (Jules): Uncomment API call when NEWSAPI_KEY is available.
-        API Docs: https://newsapi.org/docs/endpoints/everything
+
+        With a cache, fresh entries are served without a network call and
+        stale ones only fetch articles published after the newest cached one.
         """
         from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
-        query = f'"{district_name}" AND ("{" OR ".join(self.SOR_KEYWORDS)}")'
+        query = f'"{district_name}" AND ("{" OR ".join(self.sor_keywords)}")'
+
+        if self.cache is not None:
+            return self.cache.fetch(district_name, "newsapi", query, from_date,
+                                    lambda since: self._fetch_newsapi(district_name, query, since))
+        return self._fetch_newsapi(district_name, query, from_date)
+
+    def _fetch_newsapi(self, district_name: str, query: str, from_date: str) -> list:
+        """
+        One NewsAPI request for ``query`` from ``from_date`` onward.
 
+        TODO (Jules): Uncomment API call when NEWSAPI_KEY is available.
+        API Docs: https://newsapi.org/docs/endpoints/everything
+        """
         # TODO: Uncomment for live data
         # url = "https://newsapi.org/v2/everything"
         # params = {
@@ -70,33 +104,60 @@ class SORAdoptionTracker:
         return [{"title": f"SOR news for {district_name}", "publishedAt": from_date,
                  "description": "Sample article — replace with real NewsAPI call"}]
 
-    def classify_adoption_stage(self, district_name: str) -> dict:
+    def classify_adoption_stage(self, district_name: str, articles: list = None) -> dict:
         """
         Classify a district's SOR adoption stage based on news signals.
+
+        Args:
+            district_name: district to classify
+            articles: pre-fetched articles (e.g. from MultiSourceFetcher);
+                      if None, calls search_district_news
         
         Returns:
             dict with keys: stage, confidence, evidence, last_updated
+            (+ unique_articles: distinct stories after near-duplicate collapse)
+        """
+        if articles is None:
+            articles = self.search_district_news(district_name)
+        return self.classify_batch([(district_name, articles)])[0]
+
+    def classify_batch(self, district_articles: list) -> list:
+        """
+        classify_adoption_stage for many districts with one signal pass:
+        the articles of every district go to the backend together (one
+        embedding batch, one dedup transaction).
+
+        Args:
+            district_articles: (district_name, articles) pairs
+
+        Returns:
+            list of classify_adoption_stage result dicts, in input order
         """
-        articles = self.search_district_news(district_name)
+        with metrics.stage("tracker.classify"):
+            story_counts = self._story_counts([articles for _, articles in district_articles])
+        metrics.rows("tracker.classify", sum(len(articles) for _, articles in district_articles))
+        return [self._stage_result(district, articles, counts)
+                for (district, articles), counts in zip(district_articles, story_counts)]
 
-        # Simple keyword scoring (replace with NLP model — see TODO)
+    def _stage_result(self, district_name: str, articles: list, story_counts: list) -> dict:
+        # Keyword rules: distinct keywords per story (one word-boundary regex
+        # pass covers both sets). Embedding backend: at most 1 per story.
         sor_score = 0
         resistance_score = 0
-
-        for article in articles:
-            text = f"{article.get('title','')} {article.get('description','')}".lower()
-            sor_score += sum(kw.lower() in text for kw in self.SOR_KEYWORDS)
-            resistance_score += sum(kw.lower() in text for kw in self.RESISTANCE_KEYWORDS)
+        for counts in story_counts:
+            sor_score += counts["sor"]
+            resistance_score += counts["resistance"]
 
         # TODO (Jules/Gemini): Replace rule-based classifier with
         # fine-tuned BERT model trained on district SOR adoption signals
-        if sor_score >= 3:
+        t = getattr(self.classifier, "stage_thresholds", None) or self.STAGE_THRESHOLDS
+        if sor_score >= t["implementing"]:
             stage = "Implementing"
-            confidence = min(0.9, sor_score * 0.15)
-        elif sor_score >= 1:
+            confidence = min(0.9, 0.45 * sor_score / t["implementing"])
+        elif sor_score >= t["committed"]:
             stage = "Committed"
             confidence = 0.6
-        elif resistance_score >= 2:
+        elif resistance_score >= t["resistant"]:
             stage = "Resistant"
             confidence = 0.7
         else:
@@ -110,19 +171,89 @@ class SORAdoptionTracker:
             "sor_signal_count": sor_score,
             "resistance_signal_count": resistance_score,
             "articles_analyzed": len(articles),
+            "unique_articles": len(story_counts),
             "last_updated": datetime.now().isoformat(),
         }
 
-    def track_district_list(self, districts: list) -> pd.DataFrame:
-        """Run adoption tracking for a list of districts."""
-        results = []
-        for d in districts:
-            print(f"  Tracking: {d}...")
-            result = self.classify_adoption_stage(d)
-            results.append(result)
-            time.sleep(0.2)  # Rate limiting
+    def _signal_counts(self, texts: list) -> list:
+        """{"sor": n, "resistance": n} per text from the selected backend."""
+        if self.classifier is None:
+            return [self.matcher.distinct_counts(t) for t in texts]
+        return self.classifier.signal_counts(texts)
+
+    def _story_counts(self, article_lists: list) -> list:
+        """
+        Signal counts per story, for each district's article list. With a
+        dedup index, near-duplicate copies collapse into one story and a
+        story already classified (for any district, in any run) is served
+        from the index; the rest go to the backend in one call.
+        """
+        if self.dedup is None:
+            flat = self._signal_counts([article_text(a) for articles in article_lists for a in articles])
+            out, lo = [], 0
+            for articles in article_lists:
+                out.append(flat[lo:lo + len(articles)])
+                lo += len(articles)
+            return out
+
+        feature = "keyword_counts" if self.classifier is None else self.classifier.name
+        flat = [a for articles in article_lists for a in articles]
+        clusters = self.dedup.assign(flat)
+        todo = {}   # unclassified cluster -> its first copy
+        for cluster, article in zip(clusters, flat):
+            if cluster not in todo and self.dedup.features(cluster, feature) is None:
+                todo[cluster] = article
+        metrics.cache_lookup("story_results", hits=len(set(clusters)) - len(todo), misses=len(todo))
+        new = dict(zip(todo, self._signal_counts([article_text(a) for a in todo.values()])))
+        self.dedup.remember(new, feature)
+
+        out, lo = [], 0
+        for articles in article_lists:
+            stories = dict.fromkeys(clusters[lo:lo + len(articles)])
+            out.append([self.dedup.features(c, feature) for c in stories])
+            lo += len(articles)
+        return out
+
+    def track_district_list(self, districts: list, fetcher: MultiSourceFetcher = None,
+                            resolver=None) -> pd.DataFrame:
+        """
+        Run adoption tracking for a list of districts.
+
+        With a fetcher (built automatically when NEWSAPI_KEY is set), all
+        districts are fetched concurrently from every source, each behind its
+        own token-bucket rate limit. Districts where a source failed or timed
+        out are still classified from the sources that answered.
+
+        With a resolver (district_resolver.DistrictResolver), each row also
+        gets the canonical district_name and cds_code, so results join to
+        the district table even when the list used shorthand ("LAUSD").
+        """
+        if fetcher is None and self.api_key:
+            fetcher = MultiSourceFetcher(default_sources(self.sor_keywords, newsapi_key=self.api_key),
+                                         cache=self.cache)
+
+        if fetcher is not None:
+            print(f"  Fetching {len(districts)} districts from {len(fetcher.sources)} sources...")
+            with metrics.stage("tracker.fetch"):
+                fetched_all = fetcher.run(districts)
+            # One classifier pass over every district (one embedding batch)
+            results = self.classify_batch([(f["district"], f["articles"]) for f in fetched_all])
+            for result, fetched in zip(results, fetched_all):
+                result["partial"] = fetched["partial"]
+                result["failed_sources"] = ",".join(
+                    name for name, status in fetched["source_status"].items() if status != "ok")
+        else:
+            # Placeholder data — no network calls, so no rate limiting needed
+            district_articles = []
+            for d in districts:
+                print(f"  Tracking: {d}...")
+                district_articles.append((d, self.search_district_news(d)))
+            results = self.classify_batch(district_articles)
 
+        metrics.rows("tracker.track_district_list", len(results))
         df = pd.DataFrame(results)
+        if resolver is not None:
+            df = resolve_column(df, "district", resolver)
         df.to_csv("sor_adoption_tracker_output.csv", index=False)
         print(f"\nTracking complete: {len(df)} districts")
         print(f"Saved to sor_adoption_tracker_output.csv")
@@ -0,0 +1,236 @@
+"""
+sor_embedding_classifier.py
+CPU sentence-embedding backend for SOR adoption signals.
+
+The keyword rules only see the eight SOR / five resistance phrases; an
+article about "explicit, systematic decoding lessons" scores zero. This
+backend embeds each article (title + description) with a small
+sentence-transformers model and labels it by cosine similarity to the
+centroid of a few prototype sentences per class (sor / resistance /
+other). Each article then contributes at most one SOR or one resistance
+signal, so the tracker uses this backend's stage_thresholds instead of
+the keyword ones (which count each distinct phrase in a story).
+
+Throughput on a single CPU box:
+    - Articles from all districts in a batch are embedded in ONE encode()
+      call (length-sorted mini-batches of BATCH_SIZE), not per district.
+    - Embeddings are cached in SQLite by a hash of the model + article
+      text, so a weekly run only embeds articles it has never seen;
+      with article_dedup in front, syndicated copies never get here.
+    - quantize=True applies PyTorch dynamic int8 quantization to the
+      model's Linear layers (CPU only, no re-training). Its embeddings
+      differ slightly, so it has its own cache key.
+    - Inputs are capped at MAX_SEQ_LENGTH tokens — headline + description
+      fit, and attention cost grows with the square of the length.
+
+Requires sentence-transformers (and torch) from requirements.txt; they are
+imported only when the model is first loaded.
+
+Run: python sor_embedding_classifier.py --articles 2000 --int8
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+import metrics
+
+DEFAULT_EMBEDDING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      "..", "data", "cache", "article_embeddings.sqlite")
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+MAX_SEQ_LENGTH = 128
+BATCH_SIZE = 64
+_CACHE_CHUNK = 500  # hashes per SQLite IN (...) lookup
+
+SIGNAL_CLASSES = ["sor", "resistance", "other"]
+
+SIGNAL_PROTOTYPES = {
+    "sor": [
+        "The district adopted a Science of Reading curriculum with systematic phonics.",
+        "Teachers are trained in structured literacy and explicit phonemic awareness instruction.",
+        "Schools are moving to decodable readers and evidence-based early reading instruction.",
+        "The board approved a literacy plan aligned with California's new reading screening law.",
+    ],
+    "resistance": [
+        "The district will keep its balanced literacy and whole language approach.",
+        "Teachers continue to use three-cueing strategies and leveled readers.",
+        "Parents and staff oppose replacing the current reading workshop curriculum.",
+    ],
+    "other": [
+        "The school board discussed the transportation budget and bus routes.",
+        "The district announced new football stadium renovations.",
+        "Teachers union negotiations over salaries continue this month.",
+        "The superintendent presented enrollment projections and facility plans.",
+    ],
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    text_hash TEXT PRIMARY KEY,
+    vector    BLOB NOT NULL
+);
+"""
+
+
+def load_encoder(model_name: str = DEFAULT_MODEL, quantize: bool = False):
+    """SentenceTransformer on CPU, optionally with int8 dynamic quantization."""
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+    model.max_seq_length = min(model.max_seq_length or MAX_SEQ_LENGTH, MAX_SEQ_LENGTH)
+    if quantize:
+        import torch
+
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+class EmbeddingClassifier:
+    """
+    Usage:
+        classifier = EmbeddingClassifier(quantize=True)
+        tracker = SORAdoptionTracker(classifier=classifier)
+        classifier.signal_counts(["LAUSD trains teachers in structured literacy"])
+        # [{"sor": 1, "resistance": 0}]
+
+    ``encoder`` may be any already-loaded object with SentenceTransformer's
+    ``encode()`` (e.g. one model shared by several classifiers); otherwise
+    ``model_name`` is loaded on first use.
+    """
+
+    # Stories, not phrases: an adoption story matches 2-3 SOR keywords but
+    # is one signal here. Implementing = two SOR stories (keywords: 3
+    # phrases), Resistant = one resistance story (keywords: 2 phrases).
+    stage_thresholds = {"implementing": 2, "committed": 1, "resistant": 1}
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, quantize: bool = False,
+                 cache_path: str = DEFAULT_EMBEDDING_PATH, batch_size: int = BATCH_SIZE,
+                 prototypes: dict = None, encoder=None):
+        self.model_name = model_name
+        self.quantize = quantize
+        self.batch_size = batch_size
+        self.prototypes = prototypes or SIGNAL_PROTOTYPES
+        self.stats = {"embedded": 0, "cache_hits": 0}
+        self._encoder = encoder
+        self._centroids = None
+        if cache_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        self._conn = sqlite3.connect(cache_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def name(self) -> str:
+        """Backend id; also keys this backend's per-story results in article_dedup."""
+        return f"embedding:{self.model_name}{':int8' if self.quantize else ''}"
+
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            self._encoder = load_encoder(self.model_name, self.quantize)
+        return self._encoder
+
+    def _text_hash(self, text: str) -> str:
+        return hashlib.sha1(f"{self.name}\n{text}".encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------
+    # Embedding (cached)
+    # ------------------------------------------------------------
+    def _encode(self, texts: list) -> np.ndarray:
+        encoder = self.encoder   # first use loads the model: not part of the encode timing
+        with metrics.stage("embedding.encode"):
+            vectors = encoder.encode(texts, batch_size=self.batch_size, convert_to_numpy=True,
+                                     normalize_embeddings=True, show_progress_bar=False)
+        metrics.rows("embedding.encode", len(texts))
+        return np.asarray(vectors, dtype=np.float32)
+
+    def embed(self, texts: list) -> np.ndarray:
+        """
+        Unit-length embeddings, one row per text. Only texts missing from
+        the cache are encoded — all of them in a single batched call.
+        """
+        hashes = [self._text_hash(t) for t in texts]
+        cached = {}
+        unique = list(dict.fromkeys(hashes))
+        for lo in range(0, len(unique), _CACHE_CHUNK):
+            chunk = unique[lo:lo + _CACHE_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE text_hash IN ({','.join('?' * len(chunk))})",
+                chunk)
+            cached.update((h, np.frombuffer(v, dtype=np.float16)) for h, v in rows)
+
+        first = {}   # uncached hash -> first text with it
+        for h, text in zip(hashes, texts):
+            if h not in cached:
+                first.setdefault(h, text)
+        if first:
+            # float16 on disk: half the size, far below cosine-margin precision
+            vectors = self._encode(list(first.values())).astype(np.float16)
+            new = dict(zip(first, vectors))
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                                       [(h, v.tobytes()) for h, v in new.items()])
+            cached.update(new)
+        self.stats["embedded"] += len(first)
+        self.stats["cache_hits"] += len(texts) - len(first)
+        metrics.cache_lookup("embeddings", hits=len(texts) - len(first), misses=len(first))
+
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([cached[h] for h in hashes]).astype(np.float32)
+
+    # ------------------------------------------------------------
+    # Classification
+    # ------------------------------------------------------------
+    def centroids(self) -> np.ndarray:
+        """(len(SIGNAL_CLASSES) x dim) unit centroids of the prototype sentences."""
+        if self._centroids is None:
+            rows = []
+            for cls in SIGNAL_CLASSES:
+                mean = self._encode(self.prototypes[cls]).mean(axis=0)
+                rows.append(mean / np.linalg.norm(mean))
+            self._centroids = np.vstack(rows)
+        return self._centroids
+
+    def predict(self, texts: list) -> np.ndarray:
+        """Most similar class (index into SIGNAL_CLASSES) per text; blank texts are "other"."""
+        labels = np.full(len(texts), SIGNAL_CLASSES.index("other"), dtype=np.int64)
+        keep = [i for i, text in enumerate(texts) if text.strip()]
+        if keep:
+            vectors = self.embed([texts[i] for i in keep])
+            labels[keep] = np.argmax(vectors @ self.centroids().T, axis=1)
+        return labels
+
+    def signal_counts(self, texts: list) -> list:
+        """Per text {"sor": 0/1, "resistance": 0/1} — the same shape as KeywordMatcher.distinct_counts."""
+        labels = self.predict(texts)
+        return [{"sor": int(label == 0), "resistance": int(label == 1)} for label in labels]
+
+    def close(self):
+        self._conn.close()
+
+
+if __name__ == "__main__":
+    import random
+
+    parser = argparse.ArgumentParser(description="Embedding classifier throughput on synthetic articles")
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--int8", action="store_true", help="Dynamic int8 quantization")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    sentences = [s for group in SIGNAL_PROTOTYPES.values() for s in group]
+    texts = [f"District {i}: {rng.choice(sentences)} {rng.choice(sentences)}" for i in range(args.articles)]
+
+    classifier = EmbeddingClassifier(args.model, quantize=args.int8, cache_path=":memory:")
+    classifier.centroids()  # model load + prototypes, outside the timing
+    for label in ("cold", "cached"):
+        start = time.perf_counter()
+        classifier.signal_counts(texts)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>6}: {len(texts):,} articles in {elapsed:.2f}s ({len(texts) / elapsed:,.0f}/s)")
@@ -0,0 +1,279 @@
+"""
+sor_source_fetcher.py
+Concurrent, rate-limited fetch layer for the SOR Adoption Tracker.
+
+Queries every configured source (NewsAPI, CDE, EdWeek, board minutes) for
+many districts at once with asyncio + httpx. Each source has its own
+token-bucket rate limit, per-request timeout, retry/backoff policy and
+overall deadline, so one slow source degrades a district's result to
+"partial" instead of stalling the whole run.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+import metrics
+from article_cache import ArticleCache, article_id
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 30.0   # seconds; a longer Retry-After is capped, not obeyed
+_VOLATILE_PARAMS = {"from", "apiKey", "api_key"}
+
+
+class TokenBucket:
+    """
+    Async token bucket: ``rate`` requests per second, bursts of up to ``capacity``.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = None
+        self._lock_loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # One lock per event loop, so a bucket survives repeated asyncio.run() calls
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def acquire(self):
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Source:
+    """
+    One upstream article source.
+
+    Args:
+        name: short source id, reported in per-district status
+        url: endpoint URL (override in tests to point at a stub server)
+        build_params: fn(district_name, from_date) -> query params dict
+        parse: fn(json_payload) -> list of normalized article dicts
+        rate: sustained requests/sec allowed against this source
+        burst: token-bucket capacity
+        timeout: per-attempt timeout in seconds
+        retries: extra attempts on timeouts, transport errors, 429 and 5xx
+        backoff: base delay (seconds) for exponential backoff with jitter
+        deadline: total time budget per district, across all attempts
+        bucket: an existing TokenBucket to share (sources on one API key
+            share its quota); ``rate`` and ``burst`` are then ignored
+    """
+
+    def __init__(self, name: str, url: str, build_params, parse, rate: float = 1.0,
+                 burst: float = None, timeout: float = 10.0, retries: int = 2,
+                 backoff: float = 0.5, deadline: float = 30.0, bucket: TokenBucket = None):
+        self.name = name
+        self.url = url
+        self.build_params = build_params
+        self.parse = parse
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.deadline = deadline
+        self.bucket = bucket if bucket is not None else TokenBucket(rate, burst)
+
+    def query_key(self, district_name: str) -> str:
+        """Cache key for this source's query: params minus date and credentials."""
+        params = self.build_params(district_name, "")
+        return json.dumps({k: v for k, v in params.items() if k not in _VOLATILE_PARAMS},
+                          sort_keys=True)
+
+    async def fetch(self, client: httpx.AsyncClient, district_name: str, from_date: str) -> list:
+        params = self.build_params(district_name, from_date)
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            try:
+                with metrics.external_call(self.name) as call:
+                    resp = await client.get(self.url, params=params, timeout=self.timeout)
+                    if resp.status_code >= 400:
+                        call.fail()
+            except (httpx.TimeoutException, httpx.TransportError):
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self._delay(attempt))
+                continue
+            if resp.status_code in RETRYABLE_STATUS and attempt < self.retries:
+                await asyncio.sleep(self._delay(attempt, resp.headers.get("Retry-After")))
+                continue
+            resp.raise_for_status()
+            articles = self.parse(resp.json())
+            for a in articles:
+                a.setdefault("source", self.name)
+            return articles
+        return []
+
+    def _delay(self, attempt: int, retry_after: str = None) -> float:
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), MAX_RETRY_AFTER)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+
+# ============================================================
+# DEFAULT SOURCES
+# NewsAPI: https://newsapi.org/docs/endpoints/everything
+# SerpAPI (Google Search): https://serpapi.com/search-api
+# ============================================================
+
+def _newsapi_articles(payload: dict) -> list:
+    return [{"title": a.get("title") or "", "description": a.get("description") or "",
+             "publishedAt": a.get("publishedAt"), "url": a.get("url")}
+            for a in payload.get("articles", [])]
+
+
+def _serpapi_articles(payload: dict) -> list:
+    return [{"title": r.get("title") or "", "description": r.get("snippet") or "",
+             "publishedAt": r.get("date"), "url": r.get("link")}
+            for r in payload.get("organic_results", [])]
+
+
+def default_sources(sor_keywords: list, newsapi_key: str = None, serpapi_key: str = None,
+                    newsapi_url: str = "https://newsapi.org/v2/everything",
+                    serpapi_url: str = "https://serpapi.com/search.json") -> list:
+    """
+    The four sources named in SORAdoptionTracker's docstring.
+    EdWeek is NewsAPI restricted to edweek.org; CDE and board minutes go
+    through Google Search (SerpAPI). Sources without a key are skipped.
+    """
+    newsapi_key = newsapi_key or os.getenv("NEWSAPI_KEY")
+    serpapi_key = serpapi_key or os.getenv("SERPAPI_KEY")
+    keyword_clause = " OR ".join(f'"{kw}"' for kw in sor_keywords)
+
+    def newsapi_params(domains=None):
+        def build(district_name, from_date):
+            params = {"q": f'"{district_name}" AND ({keyword_clause})', "from": from_date,
+                      "sortBy": "relevancy", "language": "en", "pageSize": 10,
+                      "apiKey": newsapi_key}
+            if domains:
+                params["domains"] = domains
+            return params
+        return build
+
+    def serpapi_params(template):
+        def build(district_name, from_date):
+            return {"engine": "google", "q": template.format(district=district_name),
+                    "num": 10, "api_key": serpapi_key}
+        return build
+
+    # Rate limits are per API key, so sources on the same key share one bucket
+    sources = []
+    if newsapi_key:
+        # NewsAPI free tier: 100 req/day, ~1 req/s is safe; EdWeek shares the key
+        newsapi_bucket = TokenBucket(rate=1.0, capacity=2)
+        sources.append(Source("newsapi", newsapi_url, newsapi_params(), _newsapi_articles,
+                              bucket=newsapi_bucket))
+        sources.append(Source("edweek", newsapi_url, newsapi_params("edweek.org"),
+                              _newsapi_articles, bucket=newsapi_bucket))
+    if serpapi_key:
+        serpapi_bucket = TokenBucket(rate=2.0, capacity=4)
+        sources.append(Source("cde", serpapi_url,
+                              serpapi_params('site:cde.ca.gov "{district}" "science of reading"'),
+                              _serpapi_articles, bucket=serpapi_bucket))
+        sources.append(Source("board_minutes", serpapi_url,
+                              serpapi_params('"{district}" board meeting minutes "science of reading"'),
+                              _serpapi_articles, bucket=serpapi_bucket))
+    return sources
+
+
+# ============================================================
+# FETCHER
+# ============================================================
+
+class MultiSourceFetcher:
+    """
+    Fetch articles for many districts from many sources concurrently.
+
+    Usage:
+        fetcher = MultiSourceFetcher(default_sources(SORAdoptionTracker.SOR_KEYWORDS))
+        results = fetcher.run(["Los Angeles Unified School District", ...])
+    """
+
+    def __init__(self, sources: list, max_concurrency: int = 20, cache: ArticleCache = None):
+        self.sources = sources
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+
+    async def fetch_district(self, client: httpx.AsyncClient, district_name: str,
+                             days_back: int = 90) -> dict:
+        """
+        Query every source for one district.
+
+        Returns:
+            dict with keys: district, articles, source_status ({source: "ok" |
+            "stale" | "timeout" | "error: ..."}), partial (True if any source
+            failed). "stale" means the fetch failed and the source's cached
+            articles were served instead.
+        """
+        from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+
+        async def one(source):
+            """(articles, status) for one source; fetch errors propagate."""
+            if self.cache is None:
+                return await asyncio.wait_for(source.fetch(client, district_name, from_date),
+                                              source.deadline), "ok"
+            # The cache is SQLite (blocking I/O): keep it off the event loop
+            query = source.query_key(district_name)
+            cached, fetch_from = await asyncio.to_thread(
+                self.cache.lookup, district_name, source.name, query, from_date)
+            if fetch_from is None:
+                return cached, "ok"
+            try:
+                fetched = await asyncio.wait_for(source.fetch(client, district_name, fetch_from),
+                                                 source.deadline)
+            except Exception:
+                if not cached:
+                    raise
+                return cached, "stale"  # stale beats empty, but the source still failed
+            await asyncio.to_thread(self.cache.store, district_name, source.name, query, fetched, fetch_from)
+            seen = {article_id(a) for a in cached}
+            return cached + [a for a in fetched if article_id(a) not in seen], "ok"
+
+        outcomes = await asyncio.gather(*(one(s) for s in self.sources), return_exceptions=True)
+        articles, status = [], {}
+        for source, outcome in zip(self.sources, outcomes):
+            if isinstance(outcome, (asyncio.TimeoutError, httpx.TimeoutException)):
+                status[source.name] = "timeout"
+            elif isinstance(outcome, Exception):
+                status[source.name] = f"error: {outcome.__class__.__name__}"
+            else:
+                found, status[source.name] = outcome
+                articles.extend(found)
+        return {
+            "district": district_name,
+            "articles": articles,
+            "source_status": status,
+            "partial": any(v != "ok" for v in status.values()),
+        }
+
+    async def fetch_all(self, districts: list, days_back: int = 90) -> list:
+        """Fetch every district, at most ``max_concurrency`` in flight. Order is preserved."""
+        sem = asyncio.Semaphore(self.max_concurrency)
+        limits = httpx.Limits(max_connections=self.max_concurrency * max(1, len(self.sources)))
+        async with httpx.AsyncClient(limits=limits) as client:
+            async def bounded(d):
+                async with sem:
+                    return await self.fetch_district(client, d, days_back)
+            return await asyncio.gather(*(bounded(d) for d in districts))
+
+    def run(self, districts: list, days_back: int = 90) -> list:
+        """Synchronous entry point for scripts and notebooks."""
+        return asyncio.run(self.fetch_all(districts, days_back))
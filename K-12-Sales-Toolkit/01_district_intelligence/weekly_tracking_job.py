@@ -0,0 +1,271 @@
+"""
+weekly_tracking_job.py
+Resumable, incremental weekly run of the SOR Adoption Tracker.
+
+- Progress is checkpointed per district in SQLite, so a crash at district
+  900 resumes at district 900 (same run id = same ISO week by default).
+- A district is re-classified only when its evidence changed: an article
+  newer than what its last classification saw, or fewer articles than it
+  counted (older ones aged out of the search window, so the stage can
+  decay). Everything else is a cheap cache lookup.
+- Changed rows are written as small CSV partitions
+  (``run=<run_id>/part-<chunk hash>.csv``) via write-to-temp + os.replace,
+  never as a rewrite of one big output file. A chunk re-run after a crash
+  overwrites its own partition, so no district is written twice.
+- The article cache is refreshed once per run: WEEKLY_CACHE_TTL is just
+  under the weekly schedule, so a resumed or repeated run in the same week
+  is served from the cache, and the next week's run always fetches.
+
+Run: python weekly_tracking_job.py --districts districts.txt
+Cron (Mondays 6am): 0 6 * * 1 cd /path/to/01_district_intelligence && python weekly_tracking_job.py
+"""
+import argparse
+import glob
+import hashlib
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import metrics
+from article_cache import ArticleCache, normalize_published
+from article_dedup import SignatureIndex
+from science_of_reading_adoption_tracker import SORAdoptionTracker
+from sor_source_fetcher import MultiSourceFetcher, default_sources
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STATE_PATH = os.path.join(_HERE, "..", "data", "cache", "sor_tracker_state.sqlite")
+DEFAULT_OUTPUT_DIR = os.path.join(_HERE, "..", "data", "processed", "sor_adoption")
+
+# Shorter than the 7-day schedule (cron drift must not make last week's entries fresh)
+WEEKLY_CACHE_TTL = 6 * 24 * 3600
+
+RESULT_COLUMNS = ["district", "stage", "confidence", "sor_signal_count",
+                  "resistance_signal_count", "articles_analyzed", "last_updated"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS district_state (
+    district        TEXT PRIMARY KEY,
+    stage           TEXT,
+    confidence      REAL,
+    sor_signal_count        INTEGER,
+    resistance_signal_count INTEGER,
+    articles_analyzed       INTEGER,
+    last_updated    TEXT,
+    newest_evidence TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    started_at  REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS run_progress (
+    run_id   TEXT NOT NULL,
+    district TEXT NOT NULL,
+    changed  INTEGER NOT NULL,
+    PRIMARY KEY (run_id, district)
+);
+"""
+
+
+def current_run_id() -> str:
+    """ISO week, e.g. '2026-W42' — one run per week."""
+    year, week, _ = datetime.now().isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def newest_published(articles: list) -> str:
+    stamps = [p for p in (normalize_published(a.get("publishedAt")) for a in articles) if p]
+    return max(stamps) if stamps else None
+
+
+class WeeklyTrackingJob:
+    """
+    Usage:
+        job = WeeklyTrackingJob(SORAdoptionTracker(cache=ArticleCache(ttl_seconds=WEEKLY_CACHE_TTL)))
+        summary = job.run(district_names)
+        current = job.current_state()   # one row per district
+    """
+
+    def __init__(self, tracker: SORAdoptionTracker, state_path: str = DEFAULT_STATE_PATH,
+                 output_dir: str = DEFAULT_OUTPUT_DIR, batch_size: int = 50, fetcher=None,
+                 ranking_index=None, resolver=None):
+        os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+        self.tracker = tracker
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+        if fetcher is None and tracker.api_key:
+            fetcher = MultiSourceFetcher(default_sources(tracker.sor_keywords, newsapi_key=tracker.api_key),
+                                         cache=tracker.cache)
+        self.fetcher = fetcher
+        self.ranking_index = ranking_index  # optional ranking_index.RankingIndex to keep current
+        self.resolver = resolver            # district_resolver.DistrictResolver: tracker names -> index keys
+        self._conn = sqlite3.connect(state_path)
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------
+    def run(self, districts: list, run_id: str = None) -> dict:
+        """
+        Process every district not yet checkpointed in ``run_id``.
+
+        Returns:
+            dict with keys: run_id, skipped_done (already checkpointed),
+            checked, reclassified, partitions, tier_changes (TierChange
+            events, when a ranking_index is attached), seconds
+        """
+        run_id = run_id or current_run_id()
+        start = time.perf_counter()
+        with self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO runs (run_id, started_at) VALUES (?, ?)",
+                               (run_id, time.time()))
+        done = {r[0] for r in self._conn.execute(
+            "SELECT district FROM run_progress WHERE run_id=?", (run_id,))}
+        todo = [d for d in dict.fromkeys(districts) if d not in done]
+        print(f"Run {run_id}: {len(done)} districts already checkpointed, {len(todo)} to check")
+
+        summary = {"run_id": run_id, "skipped_done": len(done), "checked": 0,
+                   "reclassified": 0, "partitions": [], "tier_changes": []}
+        for i in range(0, len(todo), self.batch_size):
+            chunk = todo[i:i + self.batch_size]
+            with metrics.stage("weekly_job.fetch"):
+                fetched = self._fetch(chunk)
+            pending = [(district, articles) for district, (articles, partial) in fetched.items()
+                       if self._has_new_evidence(district, articles, partial)]
+            # One classifier pass for the whole chunk (one embedding batch)
+            changed = self.tracker.classify_batch(pending) if pending else []
+            for result, (_, articles) in zip(changed, pending):
+                result["newest_evidence"] = newest_published(articles)
+            summary["checked"] += len(chunk)
+            summary["reclassified"] += len(changed)
+            if changed:
+                summary["partitions"].append(self._write_partition(run_id, chunk, changed))
+            self._checkpoint(run_id, chunk, changed)
+            if changed and self.ranking_index is not None:
+                summary["tier_changes"].extend(
+                    self.ranking_index.apply_tracker_results(pd.DataFrame(changed), resolver=self.resolver))
+
+        with self._conn:
+            self._conn.execute("UPDATE runs SET finished_at=? WHERE run_id=?", (time.time(), run_id))
+        summary["seconds"] = round(time.perf_counter() - start, 2)
+        print(f"Run {run_id} complete: {summary['reclassified']} of {summary['checked']} "
+              f"districts had new evidence ({summary['seconds']}s)")
+        for event in summary["tier_changes"]:
+            print(f"  {event}")
+        return summary
+
+    def _fetch(self, districts: list) -> dict:
+        """
+        (articles, partial) per district — concurrently via the fetcher when
+        one is set. ``partial`` is True when a source failed.
+        """
+        if self.fetcher is not None:
+            return {r["district"]: (r["articles"], r["partial"]) for r in self.fetcher.run(districts)}
+        return {d: (self.tracker.search_district_news(d), False) for d in districts}
+
+    def _has_new_evidence(self, district: str, articles: list, partial: bool = False) -> bool:
+        """
+        Whether ``articles`` differ from what the stored classification saw:
+        a newer article, or fewer articles (the rest aged out of the search
+        window). A partial fetch is missing articles for another reason, so
+        only a newer article counts then.
+        """
+        row = self._conn.execute(
+            "SELECT newest_evidence, articles_analyzed FROM district_state WHERE district=?",
+            (district,)).fetchone()
+        if row is None:
+            return True
+        stored_newest, stored_count = row
+        if not partial and len(articles) < (stored_count or 0):
+            return True
+        newest = newest_published(articles)
+        return newest is not None and (stored_newest is None or newest > stored_newest)
+
+    def _write_partition(self, run_id: str, chunk: list, results: list) -> str:
+        part_dir = os.path.join(self.output_dir, f"run={run_id}")
+        os.makedirs(part_dir, exist_ok=True)
+        # Named after the chunk, not a running count: a resumed run re-processes the
+        # same chunk, so a crash before _checkpoint leaves no second copy behind
+        digest = hashlib.sha1("\n".join(chunk).encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(part_dir, f"part-{digest}.csv")
+        tmp = path + ".tmp"
+        pd.DataFrame(results)[RESULT_COLUMNS].to_csv(tmp, index=False)
+        os.replace(tmp, path)  # atomic: readers never see a half-written partition
+        return path
+
+    def _checkpoint(self, run_id: str, chunk: list, changed: list):
+        """Commit state + progress for a chunk in one transaction (after its partition exists)."""
+        changed_names = {r["district"] for r in changed}
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO district_state VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [tuple(r[c] for c in RESULT_COLUMNS) + (r["newest_evidence"],) for r in changed])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO run_progress VALUES (?, ?, ?)",
+                [(run_id, d, int(d in changed_names)) for d in chunk])
+
+    # ------------------------------------------------------------
+    # Read side
+    # ------------------------------------------------------------
+    def current_state(self) -> pd.DataFrame:
+        """Latest classification for every district ever tracked."""
+        return pd.read_sql_query(
+            f"SELECT {', '.join(RESULT_COLUMNS)} FROM district_state ORDER BY district", self._conn)
+
+    def close(self):
+        self._conn.close()
+
+
+def load_partitions(output_dir: str = DEFAULT_OUTPUT_DIR) -> pd.DataFrame:
+    """
+    Concatenate all partitions, keeping the most recent classification
+    (by last_updated, not by path: run ids like "backfill" don't sort by
+    date) per district.
+    """
+    paths = glob.glob(os.path.join(output_dir, "run=*", "part-*.csv"))
+    if not paths:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    df = pd.concat((pd.read_csv(p) for p in paths), ignore_index=True)
+    df = df.sort_values("last_updated", kind="stable")
+    return df.drop_duplicates("district", keep="last").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Weekly incremental SOR adoption tracking run")
+    parser.add_argument("--districts", help="Text file with one district name per line")
+    parser.add_argument("--run-id", help="Override the run id (default: current ISO week)")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--classifier", choices=["keywords", "embedding", "embedding-int8"],
+                        default="keywords", help="SOR signal backend (embedding needs sentence-transformers)")
+    parser.add_argument("--metrics-out", help="Record timings and write them here (.prom or .json)")
+    args = parser.parse_args()
+    if args.metrics_out:
+        metrics.enable()
+
+    if args.districts:
+        with open(args.districts) as f:
+            district_names = [line.strip() for line in f if line.strip()]
+    else:
+        district_names = [
+            "Los Angeles Unified School District",
+            "Long Beach Unified School District",
+            "Pasadena Unified School District",
+            "Compton Unified School District",
+            "Inglewood Unified School District",
+        ]
+
+    classifier = None
+    if args.classifier != "keywords":
+        from sor_embedding_classifier import EmbeddingClassifier
+
+        classifier = EmbeddingClassifier(quantize=args.classifier == "embedding-int8")
+    tracker = SORAdoptionTracker(cache=ArticleCache(ttl_seconds=WEEKLY_CACHE_TTL), dedup=SignatureIndex(),
+                                 classifier=classifier)
+    job = WeeklyTrackingJob(tracker, batch_size=args.batch_size)
+    job.run(district_names, run_id=args.run_id)
+    print(job.current_state()[["district", "stage", "confidence"]].to_string(index=False))
+    if args.metrics_out:
+        print(f"Metrics written to {metrics.REGISTRY.write(args.metrics_out)}")
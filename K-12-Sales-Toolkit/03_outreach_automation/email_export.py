@@ -0,0 +1,93 @@
+"""
+email_export.py
+Streaming CSV / JSONL writer for generated emails (HubSpot import format).
+
+Rows are written one variant at a time as results arrive, so memory stays
+flat whether the export holds 50 prospects or 50,000. The format follows
+the file name: ``.csv`` or ``.jsonl``, plus ``.gz`` for gzip.
+"""
+import csv
+import gzip
+import json
+import os
+
+EXPORT_COLUMNS = ["prospect_name", "district", "variant", "email_content",
+                  "variant_source", "generated_at", "ready_to_send"]
+
+
+def export_rows(results):
+    """One HubSpot import row per (prospect, variant), lazily."""
+    for email in results:
+        sources = email.get("variant_sources", {})
+        for variant, content in email["variants"].items():
+            yield {
+                "prospect_name": email["prospect_name"],
+                "district": email["district"],
+                "variant": variant,
+                "email_content": content,
+                "variant_source": sources.get(variant, ""),
+                "generated_at": email["generated_at"],
+                "ready_to_send": email["ready_to_send"],
+            }
+
+
+def export_format(path: str) -> tuple:
+    """('csv' | 'jsonl', gzipped) from the file name."""
+    name = path.lower()
+    gzipped = name.endswith(".gz")
+    if gzipped:
+        name = name[:-3]
+    if name.endswith(".jsonl") or name.endswith(".ndjson"):
+        return "jsonl", gzipped
+    if name.endswith(".csv"):
+        return "csv", gzipped
+    raise ValueError(f"Unsupported export format for {path!r} (use .csv, .jsonl, optionally .gz)")
+
+
+def write_export(results, output_path: str, flush_every: int = 1000, fmt: str = None) -> int:
+    """
+    Stream results (any iterable, e.g. K8EmailGenerator.iter_batch_generate)
+    into ``output_path``.
+
+    Writes to ``<path>.tmp`` and renames on success, so HubSpot never picks
+    up a half-written file; a failed export leaves no output behind.
+
+    Args:
+        results: iterable of generator results
+        output_path: .csv / .jsonl, optionally with .gz
+        flush_every: flush the file every N rows (progress is visible on disk)
+        fmt: "csv" | "jsonl" to write regardless of the file name (no gzip);
+             by default the name decides and anything else is a ValueError
+
+    Returns:
+        Number of rows (variants) written
+    """
+    if fmt is None:
+        fmt, gzipped = export_format(output_path)
+    elif fmt in ("csv", "jsonl"):
+        gzipped = False
+    else:
+        raise ValueError(f"Unsupported export format {fmt!r} (use 'csv' or 'jsonl')")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp = output_path + ".tmp"
+    opener = gzip.open if gzipped else open
+    n = 0
+    try:
+        with opener(tmp, "wt", newline="", encoding="utf-8") as f:
+            if fmt == "csv":
+                writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+                writer.writeheader()
+                write = writer.writerow
+            else:
+                write = lambda row: f.write(json.dumps(row) + "\n")
+            for row in export_rows(results):
+                write(row)
+                n += 1
+                if n % flush_every == 0:
+                    f.flush()
+        os.replace(tmp, output_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return n
@@ -0,0 +1,191 @@
+"""
+email_templates.py
+Single registry of the template email variants, shared by
+K8EmailGenerator (fallback / dry-run output) and the Streamlit email page.
+
+Each template is parsed once at import into a format string plus the
+prospect fields it needs, so rendering a variant is one formatting call
+and only the requested variant is ever built. ``render_frame`` renders a
+whole DataFrame column-wise for dry-run campaign previews.
+"""
+import re
+from string import Formatter
+
+import pandas as pd
+
+# Used when a prospect field is missing, None, NaN or blank
+FIELD_DEFAULTS = {
+    "name": "[Name]",
+    "district": "[District]",
+    "ela_proficiency_pct": "TBD",
+    "pain_point": "teacher retention",
+    "sor_stage": "Exploring",
+}
+
+TEMPLATE_SOURCES = {
+    "subject_first": """Subject: SOR Implementation Support for {district}
+
+Hi {name},
+
+I saw {district} recently committed to Science of Reading —
+congratulations on that shift. I work with Literacy Partners, and we specialize in
+exactly the coaching infrastructure that makes SOR stick for teachers long-term.
+
+Worth 15 minutes to explore?
+
+[Your Name]
+P.S. — I'm a former K-8 teacher. I promise not to waste your time.""",
+
+    "problem_focused": """Subject: The gap between SOR adoption and teacher confidence
+
+Hi {name},
+
+With {ela_proficiency_pct}% ELA proficiency and SOR adoption underway, {district} is at exactly the
+point where implementation quality determines everything — and that's usually a coaching gap.
+
+That's Literacy Partners' specialty: ongoing, tailored coaching (not workshops) that
+turns SOR commitment into measurable teacher practice change.
+
+Can I show you a 1-pager from a similar district? 15 minutes?
+
+[Your Name]""",
+
+    "peer_story": """Subject: How [Similar District] solved {pain_point}
+
+Hi {name},
+
+A year ago, a district a lot like {district} was dealing with {pain_point}.
+They tried workshops. They didn't move the needle.
+
+Then they piloted Literacy Partners' ongoing coaching model.
+Year 1: Teacher confidence scores up 40%. Year 2: They expanded district-wide.
+
+Would you like to hear how they did it?
+
+[Your Name]""",
+}
+
+
+def _to_markdown(source: str) -> str:
+    """Bold the subject label and italicize the P.S. for st.markdown display."""
+    source = re.sub(r"^Subject:", "**Subject:**", source)
+    return re.sub(r"^(P\.S\. .*)$", r"*\1*", source, flags=re.MULTILINE)
+
+
+def _field_value(field: str, value):
+    """Default blanks (None / NaN / whitespace); render 38.0 as 38."""
+    if isinstance(value, float):
+        if value != value:  # NaN
+            value = None
+        elif value.is_integer():
+            return int(value)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return FIELD_DEFAULTS.get(field, "")
+    return value
+
+
+class CompiledTemplate:
+    """
+    A template parsed once into a printf-style format string plus the
+    prospect field for each slot (``%`` formatting is ~2x faster than
+    ``str.format`` here, and templates use no format specs).
+    """
+
+    def __init__(self, source: str):
+        parts, slots = [], []
+        for text, field, spec, conv in Formatter().parse(source):
+            parts.append(text.replace("%", "%%"))
+            if field is None:
+                continue
+            if spec or conv:
+                raise ValueError(f"Format specs are not supported in templates: {{{field}}}")
+            parts.append("%s")
+            slots.append(field)
+        self.source = source
+        self.slots = tuple(slots)
+        self.fields = tuple(dict.fromkeys(slots))
+        self._format = "".join(parts)
+
+    def render(self, prospect: dict) -> str:
+        values = {f: _field_value(f, prospect.get(f)) for f in self.fields}
+        return self._format % tuple(values[f] for f in self.slots)
+
+    def render_columns(self, columns: dict, n: int) -> list:
+        """Render n emails from per-field value lists (already defaulted)."""
+        fmt = self._format
+        if not self.slots:
+            return [fmt % ()] * n
+        return [fmt % row for row in zip(*(columns[f] for f in self.slots))]
+
+
+class TemplateRegistry:
+    """
+    Usage:
+        TEMPLATES.render("peer_story", prospect)               # one variant
+        TEMPLATES.render("peer_story", prospect, markdown=True) # Streamlit
+        TEMPLATES.render_frame(prospects_df, "subject_first")   # bulk, column-wise
+    """
+
+    def __init__(self, sources: dict, default_variant: str = "subject_first"):
+        self.variants = list(sources)
+        self.default_variant = default_variant
+        self._plain = {v: CompiledTemplate(s) for v, s in sources.items()}
+        self._markdown = {v: CompiledTemplate(_to_markdown(s)) for v, s in sources.items()}
+
+    def get(self, variant: str, markdown: bool = False) -> CompiledTemplate:
+        """Compiled template; unknown variants fall back to the default one."""
+        table = self._markdown if markdown else self._plain
+        return table.get(variant) or table[self.default_variant]
+
+    def render(self, variant: str, prospect: dict, markdown: bool = False) -> str:
+        return self.get(variant, markdown).render(prospect)
+
+    def render_all(self, prospect: dict, markdown: bool = False) -> dict:
+        return {v: self.render(v, prospect, markdown) for v in self.variants}
+
+    def render_batch(self, prospects: list, variant: str, markdown: bool = False) -> list:
+        """Render one variant for a list of prospect dicts."""
+        render = self.get(variant, markdown).render
+        return [render(p) for p in prospects]
+
+    def render_frame(self, df: pd.DataFrame, variant: str, markdown: bool = False) -> pd.Series:
+        """
+        Render one variant for every row of ``df``, column-wise: each field
+        column is defaulted and converted to str once, then the rows are
+        formatted in a single pass. Missing columns use FIELD_DEFAULTS.
+
+        Returns:
+            Series of emails aligned to df.index
+        """
+        template = self.get(variant, markdown)
+        n = len(df)
+        columns = {}
+        for field in template.fields:
+            default = str(FIELD_DEFAULTS.get(field, ""))
+            if field not in df.columns:
+                columns[field] = [default] * n
+                continue
+            col = df[field]
+            if pd.api.types.is_float_dtype(col) and (col.dropna() % 1 == 0).all():
+                col = col.astype("Int64")  # 38.0 -> "38", like the dict path
+            text = col.astype("string")
+            blank = text.isna() | (text.str.strip() == "")
+            columns[field] = text.mask(blank, default).tolist()
+        return pd.Series(template.render_columns(columns, n), index=df.index, name=variant)
+
+
+TEMPLATES = TemplateRegistry(TEMPLATE_SOURCES)
+
+
+if __name__ == "__main__":
+    import time
+
+    n = 200_000
+    frame = pd.DataFrame({"name": [f"Dr. {i}" for i in range(n)],
+                          "district": [f"District {i}" for i in range(n)],
+                          "ela_proficiency_pct": [30 + i % 40 for i in range(n)]})
+    for variant in TEMPLATES.variants:
+        start = time.perf_counter()
+        TEMPLATES.render_frame(frame, variant)
+        elapsed = time.perf_counter() - start
+        print(f"{variant:16s} {n / elapsed:>12,.0f} emails/sec")
@@ -0,0 +1,151 @@
+"""
+generation_cache.py
+Content-addressed, persistent cache for generated email variants.
+
+The key is a SHA-256 over everything that determines the LLM output:
+the normalized prospect fields the prompt actually uses, the variant,
+the prompt fingerprint (LP_CONTEXT + the source of ``_build_prompt`` +
+PROMPT_VERSION) and the model settings. Changing any of these misses the
+cache; re-running an unchanged campaign is all hits.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "..", "data", "cache", "email_generation_cache.sqlite")
+
+# Fields read by K8EmailGenerator._build_prompt; anything else (CRM ids,
+# owner, timestamps) must not bust the cache.
+PROMPT_FIELDS = ["name", "title", "district", "ela_proficiency_pct", "recent_initiative",
+                 "sor_stage", "pain_point", "funding_note"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    cache_key   TEXT PRIMARY KEY,
+    variant     TEXT NOT NULL,
+    content     TEXT NOT NULL,
+    size_bytes  INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_generations_last_access ON generations(last_access);
+"""
+
+
+def normalize_prospect(prospect: dict) -> dict:
+    """Prompt fields only, as whitespace-collapsed strings; empty values dropped."""
+    out = {}
+    for field in PROMPT_FIELDS:
+        value = prospect.get(field)
+        if value is None:
+            continue
+        value = " ".join(str(value).split())
+        if value:
+            out[field] = value
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def _function_source(func) -> str:
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return repr((func.__code__.co_code, func.__code__.co_consts))
+
+
+def prompt_fingerprint(generator) -> str:
+    """
+    Hash of the generator's LP_CONTEXT, PROMPT_VERSION and the source of its
+    class's _build_prompt. Read at call time, so editing LP_CONTEXT on an
+    instance or subclass invalidates its cached generations too.
+    """
+    build = type(generator)._build_prompt
+    parts = [generator.LP_CONTEXT, str(getattr(generator, "PROMPT_VERSION", "")),
+             _function_source(build)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def cache_key(prospect: dict, variant: str, fingerprint: str, model_settings: dict) -> str:
+    payload = json.dumps({"prospect": normalize_prospect(prospect), "variant": variant,
+                          "prompt": fingerprint, "model": model_settings}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """
+    SQLite LRU cache of generated variants.
+
+    Args:
+        path: SQLite file (":memory:" for tests)
+        max_entries: LRU-evict beyond this many cached variants
+        max_bytes: LRU-evict beyond this much cached content
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 200_000,
+                 max_bytes: int = 500 * 1024 * 1024):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        # Running totals, so puts don't rescan the table to decide on eviction
+        self._count, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM generations").fetchone()
+
+    def get(self, key: str):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT content FROM generations WHERE cache_key=?",
+                                     (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE generations SET last_access=? WHERE cache_key=?",
+                               (time.time(), key))
+            self.stats["hits"] += 1
+            return row[0]
+
+    def put(self, key: str, variant: str, content: str):
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock, self._conn:
+            prev = self._conn.execute("SELECT size_bytes FROM generations WHERE cache_key=?",
+                                      (key,)).fetchone()
+            self._conn.execute("INSERT OR REPLACE INTO generations VALUES (?, ?, ?, ?, ?, ?)",
+                               (key, variant, content, size, now, now))
+            self._count += 0 if prev else 1
+            self._bytes += size - (prev[0] if prev else 0)
+            while self._count > self.max_entries or self._bytes > self.max_bytes:
+                # Drop the least-recently-used ~10% (at least the overflow) per round
+                drop = max(self._count - self.max_entries, self._count // 10, 1)
+                rows = self._conn.execute(
+                    "SELECT cache_key, size_bytes FROM generations ORDER BY last_access, rowid LIMIT ?",
+                    (drop,)).fetchall()
+                self._conn.executemany("DELETE FROM generations WHERE cache_key=?",
+                                       [(r[0],) for r in rows])
+                self._count -= len(rows)
+                self._bytes -= sum(r[1] for r in rows)
+                self.stats["evictions"] += len(rows)
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM generations")
+            self._count, self._bytes = 0, 0
+
+    def close(self):
+        self._conn.close()
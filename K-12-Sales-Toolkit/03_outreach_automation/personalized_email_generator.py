@@ -3,12 +3,24 @@ personalized_email_generator.py
 AI-powered email personalization engine for K-8 education outreach.
 Generates highly personalized emails using prospect research data.
 """
-import os, json
+import os, sys, json, random, time, warnings
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from dotenv import load_dotenv
 
+from email_export import EXPORT_COLUMNS, export_format, export_rows, write_export
+from email_templates import TEMPLATES
+from generation_cache import GenerationCache, cache_key, prompt_fingerprint
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "01_district_intelligence"))
+import metrics
+
 load_dotenv()
 
+VARIANTS = ["subject_first", "problem_focused", "peer_story"]
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
 class K8EmailGenerator:
     """
     GPT-powered email generator for K-8 education sales outreach.
@@ -36,9 +48,26 @@ class K8EmailGenerator:
     and differentiated by school readiness level.
     """
 
-    def __init__(self):
+    # Bump when prompt wording changes outside _build_prompt/LP_CONTEXT
+    # (both of those are fingerprinted automatically for the cache).
+    PROMPT_VERSION = "1"
+
+    def __init__(self, model: str = "gpt-4-turbo-preview", max_tokens: int = 300,
+                 temperature: float = 0.7, timeout: float = 30.0, max_retries: int = 3,
+                 base_url: str = None, cache: GenerationCache = None, history_size: int = None):
         self.openai_key = os.getenv("OPENAI_API_KEY")
-        self.generated_emails = []
+        # Any OpenAI-compatible endpoint (e.g. a local mock server in tests)
+        self.base_url = (base_url or os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1").rstrip("/")
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.cache = cache
+        # Every result by default (for export_to_csv); history_size=N keeps
+        # the most recent N, 0 none. Bulk runs should use export_stream.
+        self.generated_emails = deque(maxlen=history_size)
+        self.evicted = 0   # results dropped from a bounded history
 
     def _build_prompt(self, prospect: dict, variant: str) -> str:
         """Build GPT prompt for a specific email variant."""
@@ -79,126 +108,225 @@ class K8EmailGenerator:
 
         return base_context + "\n\nEmail Style: " + variants.get(variant, variants["subject_first"])
 
-    def generate(self, prospect: dict) -> dict:
+    def generate(self, prospect: dict, client=None) -> dict:
         """
         Generate 3 personalized email variants for a prospect.
         
         Args:
             prospect: dict with keys: name, title, district, ela_proficiency_pct,
                       recent_initiative, sor_stage, pain_point, funding_note
+            client: optional shared httpx.Client (batch mode reuses one)
         
         Returns:
             dict with keys: prospect_name, district, variants (list of 3 emails),
+                            variant_sources ("llm", "cache" or "template" per variant),
                             generated_at, ready_to_send
         """
-        variants = {}
-
-        for v in ["subject_first", "problem_focused", "peer_story"]:
-            # TODO (Jules): Uncomment when OPENAI_API_KEY is available
-            # from openai import OpenAI
-            # client = OpenAI(api_key=self.openai_key)
-            # prompt = self._build_prompt(prospect, v)
-            # response = client.chat.completions.create(
-            #     model="gpt-4-turbo-preview",
-            #     messages=[{"role": "user", "content": prompt}],
-            #     max_tokens=300,
-            #     temperature=0.7,
-            # )
-            # variants[v] = response.choices[0].message.content
-
-            # Placeholder templates — replace with GPT call above
-            variants[v] = self._get_template(prospect, v)
+        variants, sources = {}, {}
+        with metrics.stage("email.generate"):
+            for v in VARIANTS:
+                variants[v], sources[v] = self._generate_variant(prospect, v, client)
+        return self._finish(prospect, variants, sources)
 
+    def _finish(self, prospect: dict, variants: dict, sources: dict) -> dict:
         result = {
             "prospect_name": prospect.get("name"),
             "district": prospect.get("district"),
             "generated_at": datetime.now().isoformat(),
             "variants": variants,
+            "variant_sources": sources,
             "ready_to_send": False,  # Set to True after human review
             "notes": "Review and personalize before sending. Add 1 specific detail.",
         }
 
+        if len(self.generated_emails) == self.generated_emails.maxlen:
+            self.evicted += 1
         self.generated_emails.append(result)
+        metrics.rows("email.generate", 1)
         return result
 
-    def _get_template(self, prospect: dict, variant: str) -> str:
-        """Placeholder templates — replace with GPT output."""
-        name = prospect.get("name", "[Name]")
-        district = prospect.get("district", "[District]")
-        ela = prospect.get("ela_proficiency_pct", "TBD")
-        pain = prospect.get("pain_point", "teacher retention")
-
-        templates = {
-            "subject_first": f"""Subject: SOR Implementation Support for {district}
-
-Hi {name},
-
-I saw {district} recently committed to Science of Reading — 
-congratulations on that shift. I work with Literacy Partners, and we specialize in 
-exactly the coaching infrastructure that makes SOR stick for teachers long-term.
-
-Worth 15 minutes to explore? 
-
-[Your Name]
-P.S. — I'm a former K-8 teacher. I promise not to waste your time.""",
-
-            "problem_focused": f"""Subject: The gap between SOR adoption and teacher confidence
-
-Hi {name},
-
-With {ela}% ELA proficiency and SOR adoption underway, {district} is at exactly the
-point where implementation quality determines everything — and that's usually a coaching gap.
-
-That's Literacy Partners' specialty: ongoing, tailored coaching (not workshops) that
-turns SOR commitment into measurable teacher practice change.
-
-Can I show you a 1-pager from a similar district? 15 minutes?
-
-[Your Name]""",
-
-            "peer_story": f"""Subject: How [Similar District] solved {pain}
-
-Hi {name},
-
-A year ago, a district a lot like {district} was dealing with {pain}.
-They tried workshops. They didn't move the needle.
-
-Then they piloted Literacy Partners' ongoing coaching model.
-Year 1: Teacher confidence scores up 40%. Year 2: They expanded district-wide.
+    def _generate_variant(self, prospect: dict, variant: str, client=None) -> tuple:
+        """
+        One variant: cached LLM output, fresh LLM output when a key is
+        configured, template otherwise or on failure. Only LLM output is
+        cached — templates are cheap and fallbacks should be retried.
+        """
+        if self.openai_key:
+            key = None
+            if self.cache is not None:
+                key = cache_key(prospect, variant, prompt_fingerprint(self), self.model_settings())
+                cached = self.cache.get(key)
+                metrics.cache_lookup("generations", hits=int(cached is not None), misses=int(cached is None))
+                if cached is not None:
+                    return cached, "cache"
+            try:
+                content = self._complete(self._build_prompt(prospect, variant), client)
+                if key is not None:
+                    self.cache.put(key, variant, content)
+                return content, "llm"
+            except Exception as e:
+                print(f"  LLM call failed for {prospect.get('district')} / {variant}: {e} — using template")
+        return self._get_template(prospect, variant), "template"
+
+    def model_settings(self) -> dict:
+        """Settings that change LLM output — part of the generation cache key."""
+        return {"model": self.model, "max_tokens": self.max_tokens,
+                "temperature": self.temperature, "base_url": self.base_url}
+
+    def _complete(self, prompt: str, client=None) -> str:
+        """
+        Chat completion with per-call timeout and jittered exponential backoff
+        on 429/5xx/timeouts (Retry-After is honoured when the server sends it).
+        """
+        import httpx
+
+        owns_client = client is None
+        client = client or httpx.Client()
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    with metrics.external_call("openai") as call:
+                        resp = client.post(
+                            f"{self.base_url}/chat/completions",
+                            headers={"Authorization": f"Bearer {self.openai_key}"},
+                            json={"model": self.model,
+                                  "messages": [{"role": "user", "content": prompt}],
+                                  "max_tokens": self.max_tokens,
+                                  "temperature": self.temperature},
+                            timeout=self.timeout,
+                        )
+                        if resp.status_code >= 400:
+                            call.fail()
+                except (httpx.TimeoutException, httpx.TransportError):
+                    if attempt == self.max_retries:
+                        raise
+                    time.sleep(self._backoff(attempt))
+                    continue
+                if resp.status_code in RETRYABLE_STATUS and attempt < self.max_retries:
+                    time.sleep(self._backoff(attempt, resp.headers.get("Retry-After")))
+                    continue
+                resp.raise_for_status()
+                return resp.json()["choices"][0]["message"]["content"]
+        finally:
+            if owns_client:
+                client.close()
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: str = None) -> float:
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        # Full jitter: uniform(0, 0.5s * 2^attempt), capped at 20s
+        return random.uniform(0, min(20.0, 0.5 * 2 ** attempt))
 
-Would you like to hear how they did it?
+    def _get_template(self, prospect: dict, variant: str) -> str:
+        """Template email for one variant (shared registry, see email_templates.py)."""
+        return TEMPLATES.render(variant, prospect)
 
-[Your Name]""",
-        }
-        return templates.get(variant, templates["subject_first"])
-
-    def batch_generate(self, prospects: list) -> list:
-        """Generate emails for a list of prospects."""
-        results = []
-        for p in prospects:
-            result = self.generate(p)
-            results.append(result)
+    def iter_batch_generate(self, prospects, concurrency: int = 8):
+        """
+        Generate emails for many prospects with at most ``concurrency``
+        completion calls in flight, yielding each prospect's result as soon
+        as all 3 of its variants are done (completion order, not input order).
+        Each result carries ``batch_index`` — its position in ``prospects``.
+
+        ``prospects`` may be any iterable (e.g. a generator over a CRM
+        export); it is consumed lazily, a window of ``2 * concurrency``
+        prospects at a time, so memory does not grow with batch size.
+        """
+        if not self.openai_key:
+            # Template-only: nothing to wait on, no threads needed
+            for i, p in enumerate(prospects):
+                result = self.generate(p)
+                result["batch_index"] = i
+                yield result
+            return
+
+        import httpx
+
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        source = enumerate(prospects)
+        window = max(2, 2 * concurrency)
+        with httpx.Client(limits=limits) as client, ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures, pending = {}, {}
+
+            def submit_next():
+                for i, p in source:
+                    pending[i] = (p, {}, {})
+                    for v in VARIANTS:
+                        futures[pool.submit(self._generate_variant, p, v, client)] = (i, v)
+                    return True
+                return False
+
+            while len(pending) < window and submit_next():
+                pass
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    i, v = futures.pop(fut)
+                    prospect, variants, sources = pending[i]
+                    variants[v], sources[v] = fut.result()
+                    if len(variants) == len(VARIANTS):
+                        del pending[i]
+                        result = self._finish(prospect, {k: variants[k] for k in VARIANTS},
+                                              {k: sources[k] for k in VARIANTS})
+                        result["batch_index"] = i
+                        yield result
+                        submit_next()
+
+    def batch_generate(self, prospects: list, concurrency: int = 8) -> list:
+        """Generate emails for a list of prospects (results in input order)."""
+        results = [None] * len(prospects)
+        for result in self.iter_batch_generate(prospects, concurrency):
+            results[result["batch_index"]] = result
         return results
 
     def export_to_csv(self, output_path: str = "generated_emails.csv"):
-        """Export all generated emails to CSV for HubSpot import."""
-        rows = []
-        for email in self.generated_emails:
-            for variant, content in email["variants"].items():
-                rows.append({
-                    "prospect_name": email["prospect_name"],
-                    "district": email["district"],
-                    "variant": variant,
-                    "email_content": content,
-                    "generated_at": email["generated_at"],
-                    "ready_to_send": email["ready_to_send"],
-                })
+        """
+        Export the emails still in ``generated_emails`` for HubSpot import
+        (.jsonl for JSON lines, .gz for gzip; any other name is written as
+        CSV). Returns the exported rows as a DataFrame (EXPORT_COLUMNS).
+        Warns when a bounded history_size has already dropped results. For
+        large campaigns use export_stream, which never holds the rows in memory.
+        """
         import pandas as pd
-        df = pd.DataFrame(rows)
-        df.to_csv(output_path, index=False)
+
+        if self.evicted:
+            warnings.warn(f"history_size={self.generated_emails.maxlen} dropped {self.evicted} earlier "
+                          f"result(s); {output_path} only has the most recent "
+                          f"{len(self.generated_emails)} (use export_stream for whole campaigns)",
+                          RuntimeWarning, stacklevel=2)
+        try:
+            export_format(output_path)
+            fmt = None
+        except ValueError:
+            fmt = "csv"   # the original contract: any file name, CSV contents
+        emails = list(self.generated_emails)
+        write_export(emails, output_path, fmt=fmt)
+        df = pd.DataFrame(list(export_rows(emails)), columns=EXPORT_COLUMNS)
         print(f"Exported {len(df)} email variants to {output_path}")
         return df
 
+    def export_stream(self, prospects, output_path: str, concurrency: int = 8) -> int:
+        """
+        Generate and export in one pass: each prospect's variants are written
+        as soon as they are ready, so a 50k-prospect campaign never holds
+        more than a window of results in memory.
+
+        Args:
+            prospects: any iterable of prospect dicts
+            output_path: .csv / .jsonl, optionally with .gz
+            concurrency: completion calls in flight
+
+        Returns:
+            Number of rows (variants) written
+        """
+        n = write_export(self.iter_batch_generate(prospects, concurrency), output_path)
+        print(f"Exported {n} email variants to {output_path}")
+        return n
+
 
 if __name__ == "__main__":
     generator = K8EmailGenerator()
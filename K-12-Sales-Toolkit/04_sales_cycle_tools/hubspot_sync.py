@@ -0,0 +1,377 @@
+"""
+hubspot_sync.py
+Incremental HubSpot deal sync into a local SQLite mirror.
+
+- One pooled requests.Session (keep-alive) for every page.
+- First run pages through the whole deals table; after that only deals
+  with ``hs_lastmodifieddate`` at or after the stored watermark are pulled
+  (CRM search API, ascending by modification time).
+- Delta pages are upserted and the watermark advanced in one transaction,
+  so an interrupted delta sync resumes where it stopped. A full pull is
+  unordered, so its watermark (the pull's start time) is only written
+  once every page is in.
+- 429 / 5xx are retried with backoff (Retry-After honoured); anything
+  else raises instead of silently truncating the pull.
+- Delta queries never return archived or deleted deals, so every
+  ``reconcile_days`` the sync is a full pull instead, and mirrored deals
+  that pull didn't return are marked archived.
+
+The pipeline notebook and the Streamlit app read the mirror via
+``load_deals`` / ``pipeline_frame``.
+
+Docs: https://developers.hubspot.com/docs/api/crm/deals
+      https://developers.hubspot.com/docs/api/crm/search
+
+Run: python hubspot_sync.py            (delta sync; HUBSPOT_API_KEY in .env)
+     python hubspot_sync.py --full     (re-pull everything)
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, "..", "01_district_intelligence"))
+from frame_schema import DEAL_SCHEMA, apply_schema
+
+load_dotenv()
+
+DEFAULT_MIRROR_PATH = os.path.join(_HERE, "..", "data", "cache", "hubspot_mirror.sqlite")
+BASE_URL = "https://api.hubapi.com"
+
+DEAL_PROPERTIES = [
+    "dealname", "amount", "dealstage", "closedate", "hs_deal_stage_probability",
+    "createdate", "num_contacted_notes", "notes_last_updated", "hs_lastmodifieddate",
+    "hubspot_owner_id",
+]
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# The search API stops paging at 10,000 results per query; past that the
+# query is re-issued from the newest modification date seen so far.
+SEARCH_RESULT_LIMIT = 10_000
+
+# HubSpot's default sales-pipeline stage ids -> the analysis stages
+# (pipeline_health.STAGES). Ids of custom pipelines pass through unchanged:
+# add them here or pass stage_map to pipeline_frame.
+HUBSPOT_STAGE_MAP = {
+    "appointmentscheduled": "discovery",
+    "qualifiedtobuy": "discovery",
+    "presentationscheduled": "evaluation",
+    "decisionmakerboughtin": "proposal_sent",
+    "contractsent": "negotiation",
+    "closedwon": "closed_won",
+    "closedlost": "closed_lost",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deals (
+    id                  TEXT PRIMARY KEY,
+    dealname            TEXT,
+    amount              REAL,
+    dealstage           TEXT,
+    closedate           TEXT,
+    stage_probability   REAL,
+    createdate          TEXT,
+    num_contacted_notes INTEGER,
+    notes_last_updated  TEXT,
+    hs_lastmodifieddate TEXT,
+    hubspot_owner_id    TEXT,
+    archived            INTEGER NOT NULL DEFAULT 0,
+    properties_json     TEXT NOT NULL,
+    synced_at           REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deals_modified ON deals(hs_lastmodifieddate);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _to_epoch_ms(iso: str) -> int:
+    return int(datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp() * 1000)
+
+
+def _num(value, cast=float):
+    try:
+        return cast(float(value)) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class HubSpotDealSync:
+    """
+    Usage:
+        sync = HubSpotDealSync()            # HUBSPOT_API_KEY from .env
+        summary = sync.sync()               # full first time, delta after
+        deals = pipeline_frame(load_deals())
+
+    Args:
+        api_key: private-app token (defaults to HUBSPOT_API_KEY)
+        db_path: SQLite mirror
+        base_url: API root (a local mock server in tests)
+        page_size: deals per request (HubSpot max: 100 for list/search)
+        max_retries: retries per request on 429/5xx/connection errors
+        timeout: per-request timeout in seconds
+        overlap_seconds: delta queries start this far before the watermark
+                         (search indexing lags writes; upserts are idempotent)
+        reconcile_days: run a full pull (archiving deals it doesn't return)
+                        when the last one is older than this; None = never
+    """
+
+    def __init__(self, api_key: str = None, db_path: str = DEFAULT_MIRROR_PATH,
+                 base_url: str = BASE_URL, page_size: int = 100, max_retries: int = 5,
+                 timeout: float = 30.0, overlap_seconds: float = 60.0, reconcile_days: float = 7.0):
+        self.api_key = api_key or os.getenv("HUBSPOT_API_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.overlap_seconds = overlap_seconds
+        self.reconcile_days = reconcile_days
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {self.api_key}",
+                                     "Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_SCHEMA)
+        self.stats = {"requests": 0, "retries": 0}
+
+    # ------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------
+    def sync(self, full: bool = False) -> dict:
+        """
+        Pull new/changed deals into the mirror.
+
+        Args:
+            full: ignore the watermark and page through every deal (also
+                  done automatically once the last full pull is older
+                  than reconcile_days)
+
+        Returns:
+            dict with keys: mode ("full" / "delta"), pages, upserted,
+            archived (mirrored deals a full pull no longer returned),
+            watermark (newest hs_lastmodifieddate mirrored), seconds
+        """
+        start = time.perf_counter()
+        pull_started = time.time()
+        started_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        watermark = None if full or self._reconcile_due() else self.watermark()
+        delta = watermark is not None
+        summary = {"mode": "delta" if delta else "full", "pages": 0, "upserted": 0, "archived": 0}
+        pages = self._search_pages(watermark) if delta else self._list_pages()
+        for deals in pages:
+            summary["pages"] += 1
+            summary["upserted"] += self._upsert(deals, advance_watermark=delta)
+        if not delta:
+            # Every live deal was just rewritten; the rest were archived or deleted.
+            # Anything modified after the pull started is picked up next delta.
+            with self._conn:
+                summary["archived"] = self._conn.execute(
+                    "UPDATE deals SET archived = 1 WHERE archived = 0 AND synced_at < ?",
+                    (pull_started,)).rowcount
+                self._set_watermark(started_at)
+                self._conn.execute("INSERT OR REPLACE INTO sync_state VALUES ('last_full_sync', ?)",
+                                   (str(pull_started),))
+        summary["watermark"] = self.watermark()
+        summary["seconds"] = round(time.perf_counter() - start, 2)
+        return summary
+
+    def _reconcile_due(self) -> bool:
+        """True when the last complete full pull is older than reconcile_days."""
+        if self.reconcile_days is None:
+            return False
+        row = self._conn.execute(
+            "SELECT value FROM sync_state WHERE key='last_full_sync'").fetchone()
+        return row is None or time.time() - float(row[0]) >= self.reconcile_days * 86400
+
+    def _list_pages(self):
+        """GET /crm/v3/objects/deals, cursor-paged — the full pull."""
+        params = {"limit": self.page_size, "properties": ",".join(DEAL_PROPERTIES)}
+        while True:
+            data = self._request("GET", "/crm/v3/objects/deals", params=params)
+            yield data.get("results", [])
+            after = data.get("paging", {}).get("next", {}).get("after")
+            if not after:
+                return
+            params["after"] = after
+
+    def _search_pages(self, watermark: str):
+        """POST /crm/v3/objects/deals/search, modified >= watermark, oldest first."""
+        since_ms = _to_epoch_ms(watermark) - int(self.overlap_seconds * 1000)
+        while True:
+            body = {
+                "filterGroups": [{"filters": [{"propertyName": "hs_lastmodifieddate",
+                                               "operator": "GTE",
+                                               "value": str(since_ms)}]}],
+                "sorts": [{"propertyName": "hs_lastmodifieddate", "direction": "ASCENDING"}],
+                "properties": DEAL_PROPERTIES,
+                "limit": self.page_size,
+            }
+            newest = None
+            while True:
+                data = self._request("POST", "/crm/v3/objects/deals/search", json=body)
+                results = data.get("results", [])
+                yield results
+                for r in results:
+                    stamp = r["properties"].get("hs_lastmodifieddate")
+                    if stamp and (newest is None or stamp > newest):
+                        newest = stamp
+                after = data.get("paging", {}).get("next", {}).get("after")
+                if not after:
+                    return
+                if int(after) >= SEARCH_RESULT_LIMIT:
+                    break  # restart the query from the newest date seen
+                body["after"] = after
+            if newest is None or _to_epoch_ms(newest) <= since_ms:
+                # >10k deals share one timestamp; nothing more we can page to
+                return
+            since_ms = _to_epoch_ms(newest)
+
+    def _request(self, method: str, path: str, **kwargs) -> dict:
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            self.stats["requests"] += 1
+            try:
+                resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self.stats["retries"] += 1
+                time.sleep(self._backoff(attempt))
+                continue
+            if resp.status_code in RETRYABLE_STATUS and attempt < self.max_retries:
+                self.stats["retries"] += 1
+                time.sleep(self._backoff(attempt, resp.headers.get("Retry-After")))
+                continue
+            resp.raise_for_status()
+            return resp.json()
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: str = None) -> float:
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        # Full jitter: uniform(0, 1s * 2^attempt), capped at 30s (HubSpot
+        # rate-limit windows are 10s, so a few retries clear one)
+        return random.uniform(0, min(30.0, 2 ** attempt))
+
+    def _upsert(self, deals: list, advance_watermark: bool = True) -> int:
+        """Write one page (and advance the watermark) in one transaction."""
+        if not deals:
+            return 0
+        now = time.time()
+        rows = []
+        for d in deals:
+            p = d.get("properties", {})
+            rows.append((
+                str(d["id"]), p.get("dealname"), _num(p.get("amount")), p.get("dealstage"),
+                p.get("closedate"), _num(p.get("hs_deal_stage_probability")), p.get("createdate"),
+                _num(p.get("num_contacted_notes"), int), p.get("notes_last_updated"),
+                p.get("hs_lastmodifieddate"), p.get("hubspot_owner_id"),
+                int(bool(d.get("archived"))), json.dumps(p, sort_keys=True), now,
+            ))
+        newest = max((r[9] for r in rows if r[9]), default=None)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO deals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            if newest and advance_watermark:
+                self._set_watermark(newest)
+        return len(rows)
+
+    def _set_watermark(self, value: str):
+        """Never moves backwards; caller owns the transaction."""
+        self._conn.execute(
+            "INSERT INTO sync_state VALUES ('deals_watermark', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value=MAX(value, excluded.value)", (value,))
+
+    # ------------------------------------------------------------
+    # Read side
+    # ------------------------------------------------------------
+    def watermark(self) -> str:
+        """Newest hs_lastmodifieddate in the mirror (None before the first sync)."""
+        row = self._conn.execute(
+            "SELECT value FROM sync_state WHERE key='deals_watermark'").fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        self.session.close()
+        self._conn.close()
+
+
+def load_deals(db_path: str = DEFAULT_MIRROR_PATH) -> pd.DataFrame:
+    """All mirrored (non-archived) deals, one row per deal, HubSpot column names."""
+    if not os.path.exists(db_path):
+        return pd.DataFrame(columns=["id"] + DEAL_PROPERTIES)
+    with sqlite3.connect(db_path) as conn:
+        return pd.read_sql_query(
+            "SELECT id, dealname, amount, dealstage, closedate, stage_probability AS "
+            "hs_deal_stage_probability, createdate, num_contacted_notes, notes_last_updated, "
+            "hs_lastmodifieddate, hubspot_owner_id FROM deals WHERE archived = 0 ORDER BY id", conn)
+
+
+def pipeline_frame(deals: pd.DataFrame, now: datetime = None,
+                   stage_map: dict = HUBSPOT_STAGE_MAP) -> pd.DataFrame:
+    """
+    Mirror rows -> the analysis schema used by the pipeline notebook:
+    deal_name, amount, stage, close_date, days_since_last_activity,
+    contact_count, created_date, stage_probability, weighted_value —
+    stored as DEAL_SCHEMA (frame_schema.py: stage categorical, int16
+    counts).
+
+    HubSpot stage ids are mapped through ``stage_map`` ("closedwon" ->
+    "closed_won"), so pipeline_health's closed / late-stage rules apply.
+    A deal with no activity timestamp keeps days_since_last_activity NaN.
+    """
+    now = pd.Timestamp(now or datetime.now(timezone.utc))
+    if now.tzinfo is None:
+        now = now.tz_localize("UTC")
+
+    def ts(col):
+        return pd.to_datetime(deals[col], utc=True, errors="coerce", format="ISO8601")
+
+    last_activity = ts("notes_last_updated").fillna(ts("hs_lastmodifieddate"))
+    out = pd.DataFrame({
+        "deal_id": deals["id"],
+        "deal_name": deals["dealname"],
+        "amount": pd.to_numeric(deals["amount"], errors="coerce").fillna(0.0),
+        "stage": deals["dealstage"].replace(stage_map),
+        "close_date": ts("closedate").dt.tz_localize(None),
+        "days_since_last_activity": (now - last_activity).dt.days,
+        "contact_count": pd.to_numeric(deals["num_contacted_notes"], errors="coerce").fillna(0).astype(int),
+        "created_date": ts("createdate").dt.tz_localize(None),
+        "stage_probability": pd.to_numeric(deals["hs_deal_stage_probability"], errors="coerce").fillna(0.0),
+    })
+    out["weighted_value"] = out["amount"] * out["stage_probability"]
+    return apply_schema(out, DEAL_SCHEMA)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync HubSpot deals into the local mirror")
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark; re-pull all deals")
+    parser.add_argument("--db", default=DEFAULT_MIRROR_PATH)
+    args = parser.parse_args()
+
+    client = HubSpotDealSync(db_path=args.db)
+    if not client.api_key:
+        raise SystemExit("HUBSPOT_API_KEY is not set (add it to .env)")
+    result = client.sync(full=args.full)
+    print(f"{result['mode']} sync: {result['upserted']} deals in {result['pages']} pages "
+          f"({result['seconds']}s); watermark {result['watermark']}")
+    client.close()
@@ -0,0 +1,233 @@
+"""
+dashboard_data.py
+Data helpers behind the Streamlit dashboard, importable without Streamlit
+(benchmarks and tests use them directly).
+
+- load_districts: the columnar district dataset (only the columns the
+  app uses), falling back to the sample data when it hasn't been built;
+  adds conversion_probability once a conversion model has been trained.
+  Validated and stored in DISTRICT_SCHEMA's compact dtypes
+  (frame_schema.py).
+- synthetic_districts: the sample district frame the app ships with,
+  seedable and sized so benchmarks can generate 1k..1M rows.
+- filter_districts: the District Prioritizer sidebar filter + sort.
+- with_ranking_updates: a district frame with a session's ranking-index
+  updates (SOR tracking) applied, so filters and tables use one set of scores.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "01_district_intelligence"))
+from conversion_model import DEFAULT_MODEL_PATH, INPUT_COLUMNS as MODEL_COLUMNS, predict_proba
+from district_dataset import APP_COLUMNS, DEFAULT_DATASET_PATH, dataset_columns, read_dataset
+from district_geo import GEO_COLUMNS, LA_HOME, haversine_miles
+from district_scoring import SOR_STAGES, score_districts
+from frame_schema import DISTRICT_SCHEMA, apply_schema
+
+COUNTIES = ["Los Angeles", "San Diego", "Sacramento", "Fresno", "Orange",
+            "Riverside", "San Bernardino", "Alameda", "Kern", "Santa Clara"]
+# CDE county codes (first two digits of a district's CDS code)
+COUNTY_CODES = {"Alameda": "01", "Fresno": "10", "Kern": "15", "Los Angeles": "19", "Orange": "30",
+                "Riverside": "33", "Sacramento": "34", "San Bernardino": "36", "San Diego": "37",
+                "Santa Clara": "43"}
+# Approximate county centroids (latitude, longitude); sample districts scatter around them
+COUNTY_CENTROIDS = {"Alameda": (37.65, -121.91), "Fresno": (36.76, -119.65), "Kern": (35.34, -118.73),
+                    "Los Angeles": (34.32, -118.22), "Orange": (33.70, -117.76),
+                    "Riverside": (33.74, -116.00), "Sacramento": (38.45, -121.34),
+                    "San Bernardino": (34.84, -116.18), "San Diego": (33.03, -116.74),
+                    "Santa Clara": (37.23, -121.70)}
+COUNTY_JITTER_DEG = 0.15   # std. dev. around the centroid (~10 miles)
+
+
+def synthetic_districts(n: int = 150, seed: int = 42, start: int = 0,
+                        score: bool = True) -> pd.DataFrame:
+    """
+    Sample California K-8 districts (replace with live CAASPP / EdData).
+
+    Args:
+        n: number of districts
+        seed: RNG seed; seed=42, start=0 reproduces the app's sample data
+        start: first district number (names stay unique across chunks)
+        score: add readiness_score + tier via score_districts
+
+    Returns:
+        DataFrame with one row per district
+    """
+    rng = np.random.RandomState(seed)
+    districts = pd.DataFrame({
+        "district_name": [f"District {i:03d}" for i in range(start, start + n)],
+        "county": rng.choice(COUNTIES, n),
+        "enrollment_k8": rng.randint(500, 80000, n),
+        "pct_ela_proficient": rng.uniform(20, 75, n),
+        "pct_title1_students": rng.uniform(10, 95, n),
+        "pd_budget_per_student_est": rng.uniform(50, 500, n),
+        "sor_adoption_signal": rng.choice(SOR_STAGES, n, p=[0.3, 0.3, 0.25, 0.15]),
+        "recent_literacy_initiative": rng.choice([True, False], n, p=[0.4, 0.6]),
+        "superintendent_tenure_yrs": rng.uniform(0.5, 15, n),
+        "teacher_turnover_rate": rng.uniform(5, 45, n),
+    })
+    # Made-up CDE district codes: county code + 5 digits (unique per district number)
+    districts["cds_code"] = (districts["county"].map(COUNTY_CODES)
+                             + pd.Series(range(start, start + n)).map("{:05d}".format))
+    # Coordinates inside the district's county (centroid + jitter); miles_from_la follows from them
+    centroids = np.array([COUNTY_CENTROIDS[c] for c in COUNTIES])[
+        pd.Categorical(districts["county"], categories=COUNTIES).codes]
+    coords = centroids + rng.normal(0, COUNTY_JITTER_DEG, (n, 2))
+    districts["latitude"], districts["longitude"] = coords[:, 0], coords[:, 1]
+    districts["miles_from_la"] = haversine_miles(coords[:, 0], coords[:, 1], *LA_HOME)
+    if score:
+        districts = score_districts(districts)
+    return districts
+
+
+def load_districts(path: str = DEFAULT_DATASET_PATH, columns: list = None,
+                   model_path: str = DEFAULT_MODEL_PATH) -> pd.DataFrame:
+    """
+    Scored districts from the Arrow/Parquet dataset (memory-mapped, only
+    ``columns`` — APP_COLUMNS by default); the 150-district sample when
+    no dataset has been built yet (see district_dataset.py convert).
+    When a conversion model exists (conversion_model.py), its inputs are
+    read too and conversion_probability is added — no training at startup.
+    cds_code and latitude / longitude are read whenever the dataset has them
+    (district_resolver.py, district_geo.py).
+
+    The result is in DISTRICT_SCHEMA dtypes (categoricals, float32, small
+    ints); a dataset that doesn't fit raises frame_schema.SchemaError.
+    Scores are computed from the cast inputs, so re-scoring a row
+    (ranking_index.py, the What-If page) gives the score shown.
+    """
+    if not os.path.exists(path):
+        districts = synthetic_districts(n=150, seed=42, score=False)
+    else:
+        columns = list(columns or APP_COLUMNS)
+        available = set(dataset_columns(path))
+        optional = ["cds_code"] + GEO_COLUMNS + (MODEL_COLUMNS if os.path.exists(model_path) else [])
+        columns += [c for c in optional if c not in columns and c in available]
+        districts = read_dataset(path, columns)
+    districts = score_districts(apply_schema(districts, DISTRICT_SCHEMA))
+    return apply_schema(with_conversion_scores(districts, model_path), DISTRICT_SCHEMA)
+
+
+def with_conversion_scores(districts: pd.DataFrame, model_path: str = DEFAULT_MODEL_PATH) -> pd.DataFrame:
+    """Add conversion_probability when the model and all its inputs are available."""
+    if os.path.exists(model_path) and set(MODEL_COLUMNS) <= set(districts.columns):
+        districts["conversion_probability"] = predict_proba(districts, model_path)
+    return districts
+
+
+def with_ranking_updates(districts: pd.DataFrame, changes: pd.DataFrame,
+                         key_col: str = "cds_code") -> pd.DataFrame:
+    """
+    ``districts`` with the rows a RankingIndex changed (its changed_rows())
+    overwritten — readiness_score, tier and the score inputs — and removed
+    districts dropped. Without changes the frame is returned as is.
+    """
+    if changes.empty:
+        return districts
+    keys = districts[key_col].astype(str) if key_col == "cds_code" else districts[key_col]
+    pos = pd.Index(changes[key_col]).get_indexer(keys)
+    hit = pos >= 0
+    out = districts.copy(deep=False)
+    for col in changes.columns.drop(key_col):
+        if col in out.columns:
+            values = pd.Series(changes[col].to_numpy()[pos[hit]], index=out.index[hit])
+            out[col] = out[col].astype(object).where(~hit, values.reindex(out.index))
+    removed = hit & np.isnan(changes["readiness_score"].to_numpy(dtype="float64")[np.where(hit, pos, 0)])
+    return apply_schema(out[~removed], DISTRICT_SCHEMA)
+
+
+def filter_districts(districts: pd.DataFrame, counties=None, min_score: float = 0,
+                     sor_stages=None, sort: bool = True) -> pd.DataFrame:
+    """
+    District Prioritizer filter: empty county / stage selections mean
+    "all"; result is sorted by readiness_score, highest first (pass
+    sort=False when paging with page_of, which sorts only what it shows).
+    """
+    mask = districts["readiness_score"].to_numpy() >= min_score
+    if counties:
+        mask &= districts["county"].isin(counties).to_numpy()
+    if sor_stages:
+        mask &= districts["sor_adoption_signal"].isin(sor_stages).to_numpy()
+    filtered = districts[mask]
+    return filtered.sort_values("readiness_score", ascending=False) if sort else filtered
+
+
+# ============================================================
+# DISTRICT PRIORITIZER RENDERING
+# ============================================================
+
+# Above this many points the scatter switches to WebGL (SVG stalls the
+# browser at a few thousand markers); above SCATTER_MAX_POINTS it is
+# downsampled as well.
+SCATTER_WEBGL_THRESHOLD = 2_000
+SCATTER_MAX_POINTS = 5_000
+
+
+def scatter_sample(filtered: pd.DataFrame, max_points: int = SCATTER_MAX_POINTS,
+                   seed: int = 0) -> pd.DataFrame:
+    """
+    At most ``max_points`` rows for the scatter plot. Tier 1 districts are
+    kept first (they are the ones reps hover over); the remaining budget is
+    a seeded uniform sample of the other tiers, so the cloud keeps its shape.
+    """
+    if len(filtered) <= max_points:
+        return filtered
+    is_t1 = (filtered["tier"] == "Tier 1").to_numpy()
+    rng = np.random.default_rng(seed)
+    t1 = np.flatnonzero(is_t1)
+    if len(t1) >= max_points:
+        keep = rng.choice(t1, max_points, replace=False)
+    else:
+        rest = np.flatnonzero(~is_t1)
+        keep = np.concatenate([t1, rng.choice(rest, max_points - len(t1), replace=False)])
+    return filtered.iloc[np.sort(keep)]
+
+
+def page_of(filtered: pd.DataFrame, page: int, page_size: int = 50,
+            sort_by: str = "readiness_score", ascending: bool = False) -> pd.DataFrame:
+    """
+    One page of the priority table, sorted server-side. Only the rows up to
+    the end of the requested page are ordered (partition + sort of that
+    prefix), so early pages of a large table cost O(n), not O(n log n).
+
+    Args:
+        page: 0-based page number (clamped to the last page)
+    """
+    n = len(filtered)
+    if n == 0:
+        return filtered
+    page = min(max(page, 0), (n - 1) // page_size)
+    end = min(n, (page + 1) * page_size)
+    col = filtered[sort_by]
+    if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col):
+        values = col.to_numpy(dtype="float64", na_value=np.nan)
+        key = np.where(np.isnan(values), np.inf, values if ascending else -values)  # NaN last
+        # Stable tie-break on position keeps pages consistent across reruns
+        if end < n:
+            cut = np.partition(key, end - 1)[end - 1]
+            candidates = np.flatnonzero(key <= cut)
+        else:
+            candidates = np.arange(n)
+        order = candidates[np.lexsort((candidates, key[candidates]))][page * page_size:end]
+        return filtered.iloc[order]
+    ordered = filtered.sort_values(sort_by, ascending=ascending, kind="stable", na_position="last")
+    return ordered.iloc[page * page_size:end]
+
+
+def n_pages(n_rows: int, page_size: int) -> int:
+    return max(1, -(-n_rows // page_size))
+
+
+def csv_chunks(df: pd.DataFrame, columns: list, chunk_rows: int = 10_000):
+    """Yield the CSV export as encoded chunks (header first), never one big string."""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows][columns].to_csv(
+            index=False, header=start == 0).encode("utf-8")
+
+
+def filter_state(counties, min_score, sor_stages) -> tuple:
+    """Hashable, order-insensitive key for a filter selection (cache key)."""
+    return (tuple(sorted(counties or ())), float(min_score), tuple(sorted(sor_stages or ())))
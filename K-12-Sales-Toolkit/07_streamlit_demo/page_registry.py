@@ -0,0 +1,44 @@
+"""
+page_registry.py — Sidebar label -> page module, imported on first use.
+
+Every Streamlit rerun executes app.py top to bottom, so anything app.py
+imports is paid on cold start *and* kept on the critical path of every
+page. Pages therefore live in views/<module>.py and are imported only when
+selected; Python caches the module afterwards, so switching back is free.
+
+Adding a page (e.g. discovery call prep): create views/<module>.py with a
+``render()`` function and add one entry to PAGES.
+"""
+import importlib
+
+# (sidebar label, module under views/) — order is the sidebar order
+PAGES = [
+    ("🏠 Home", "home"),
+    ("📊 District Prioritizer", "district_prioritizer"),
+    ("🎚️ Weight What-If", "weight_what_if"),
+    ("🗺️ Territory Planner", "territory_planner"),
+    ("✉️ Email Generator", "email_generator"),
+    ("📈 Pipeline Tracker", "pipeline_tracker"),
+    ("🥊 Battle Cards", "battle_cards"),
+]
+
+_MODULES = dict(PAGES)
+
+
+def page_labels() -> list:
+    return [label for label, _ in PAGES]
+
+
+def module_name(label: str) -> str:
+    """Dotted module path for a sidebar label (KeyError when unknown)."""
+    return f"views.{_MODULES[label]}"
+
+
+def load_page(label: str):
+    """
+    Import (first time) or fetch (afterwards) the page module for ``label``.
+
+    Returns:
+        the module; call its ``render()`` to draw the page
+    """
+    return importlib.import_module(module_name(label))
@@ -0,0 +1,110 @@
+"""
+startup_check.py — Cold-start and per-rerun latency budget for the dashboard.
+
+Drives app.py headlessly with Streamlit's AppTest (streamlit>=1.28) in a
+fresh interpreter and measures:
+
+- cold start: first script run (Home page) — what a new session waits for
+- first visit: opening each page for the first time (its imports load)
+- rerun: any widget interaction on an already-open page
+
+and checks that heavy libraries (plotly.express) are not imported for the Home
+page. Budgets are wall-clock seconds; scale them for slow CI machines
+with --budget-scale instead of editing the constants.
+
+Run: python startup_check.py [--budget-scale 2]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(_HERE, "app.py")
+
+COLD_START_BUDGET_S = 1.5     # first run of app.py (Home), Streamlit already imported
+FIRST_VISIT_BUDGET_S = 2.0    # first open of a page, including its imports (e.g. plotly)
+RERUN_BUDGET_S = 0.5          # rerun of a page that is already loaded
+# Must not be imported until a page draws a chart. (Streamlit itself loads
+# plotly core for its chart theme; plotly.express is the ~0.2s extra.)
+DEFERRED_MODULES = ("plotly.express", "plotly.subplots")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_import_s = time.perf_counter() - start
+sys.path.insert(0, {here!r})
+from page_registry import page_labels
+
+at = AppTest.from_file({app!r}, default_timeout={timeout})
+start = time.perf_counter()
+at.run()
+result = {{"streamlit_import_s": streamlit_import_s,
+          "cold_start_s": time.perf_counter() - start,
+          "deferred_loaded_on_home": [m for m in {deferred!r} if m in sys.modules],
+          "exceptions": [e.value for e in at.exception],
+          "pages": {{}}}}
+labels = page_labels()
+for label in labels[1:] + labels[:1]:
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value(label).run()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    at.run()
+    result["pages"][label] = {{"first_visit_s": first, "rerun_s": time.perf_counter() - start,
+                              "exceptions": [e.value for e in at.exception]}}
+print(json.dumps(result))
+"""
+
+
+def measure(app_path: str = APP_PATH, timeout: float = 60) -> dict:
+    """
+    Run the probe in a fresh interpreter (nothing pre-imported).
+
+    Returns:
+        dict: streamlit_import_s, cold_start_s, deferred_loaded_on_home,
+        exceptions, pages ({label: {first_visit_s, rerun_s, exceptions}})
+    """
+    code = _PROBE.format(here=_HERE, app=app_path, timeout=timeout, deferred=DEFERRED_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=_HERE, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def check(result: dict, scale: float = 1.0) -> list:
+    """Budget violations as human-readable strings (empty list = within budget)."""
+    problems = []
+    if result["cold_start_s"] > COLD_START_BUDGET_S * scale:
+        problems.append(f"cold start {result['cold_start_s']:.2f}s > {COLD_START_BUDGET_S * scale:.2f}s")
+    for module in result["deferred_loaded_on_home"]:
+        problems.append(f"{module} imported on the Home page (import it inside the page that uses it)")
+    for error in result["exceptions"]:
+        problems.append(f"Home raised: {error}")
+    for label, page in result["pages"].items():
+        if page["first_visit_s"] > FIRST_VISIT_BUDGET_S * scale:
+            problems.append(f"{label}: first visit {page['first_visit_s']:.2f}s > "
+                            f"{FIRST_VISIT_BUDGET_S * scale:.2f}s")
+        if page["rerun_s"] > RERUN_BUDGET_S * scale:
+            problems.append(f"{label}: rerun {page['rerun_s']:.2f}s > {RERUN_BUDGET_S * scale:.2f}s")
+        for error in page["exceptions"]:
+            problems.append(f"{label} raised: {error}")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard cold-start / rerun latency budget")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply every budget (e.g. 2 on a slow CI runner)")
+    args = parser.parse_args()
+
+    result = measure()
+    print(f"streamlit import  {result['streamlit_import_s']:6.2f}s (server start, paid once)")
+    print(f"cold start (Home) {result['cold_start_s']:6.2f}s   budget {COLD_START_BUDGET_S * args.budget_scale:.2f}s")
+    for label, page in result["pages"].items():
+        print(f"  {label:<24} first visit {page['first_visit_s']:5.2f}s   rerun {page['rerun_s']:5.2f}s")
+    problems = check(result, args.budget_scale)
+    for p in problems:
+        print(f"OVER BUDGET: {p}")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,60 @@
+"""
+theme.py — Brand colors and CSS shared by app.py and the page modules
+(no Streamlit import, so pages and tests can use it directly).
+"""
+
+# ============================================================
+# BRAND COLORS
+# ============================================================
+COLORS = {
+    "primary":   "#2E4057",
+    "secondary": "#048A81",
+    "accent":    "#F18F01",
+    "danger":    "#C73E1D",
+    "light":     "#F4F4F8",
+    "lp_purple": "#5C4B8A",
+}
+
+# ============================================================
+# CUSTOM CSS
+# ============================================================
+CUSTOM_CSS = """
+<style>
+    .main-header {
+        font-size: 2.2rem;
+        font-weight: 800;
+        color: #2E4057;
+        margin-bottom: 0.2rem;
+    }
+    .sub-header {
+        font-size: 1.1rem;
+        color: #048A81;
+        margin-bottom: 1.5rem;
+    }
+    .metric-card {
+        background: white;
+        border-radius: 12px;
+        padding: 1.2rem;
+        border-left: 4px solid #048A81;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+    }
+    .tier-1 { background-color: #FFEBEB; border-left: 4px solid #C73E1D; }
+    .tier-2 { background-color: #FFF8E1; border-left: 4px solid #F18F01; }
+    .tier-3 { background-color: #E8F5E9; border-left: 4px solid #048A81; }
+    .highlight-box {
+        background: linear-gradient(135deg, #2E4057, #048A81);
+        color: white;
+        border-radius: 12px;
+        padding: 1.5rem;
+        margin-bottom: 1.5rem;
+    }
+    .footer-note {
+        font-size: 0.8rem;
+        color: #9E9E9E;
+        text-align: center;
+        margin-top: 2rem;
+    }
+</style>
+"""
+
+
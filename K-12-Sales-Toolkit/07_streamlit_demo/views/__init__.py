@@ -0,0 +1,8 @@
+"""
+views — one module per dashboard page, each exposing ``render()``.
+
+Pages are imported by page_registry only when selected, so a page's
+dependencies (plotly, the HubSpot client, ...) cost nothing until a rep
+opens it. Import chart libraries inside the page module that draws, never
+in app.py.
+"""
@@ -0,0 +1,53 @@
+"""
+common.py — Cached data shared by several pages.
+"""
+import streamlit as st
+
+from dashboard_data import load_districts
+import metrics
+
+
+# ============================================================
+# SAMPLE DATA GENERATORS
+# (Replace with real API calls — see notebooks for data sources)
+# ============================================================
+
+@st.cache_data
+def load_district_data():
+    """
+    Load California K-8 district data: data/processed/ca_districts.arrow
+    (memory-mapped, app columns only) or the built-in sample.
+    TODO (Jules): Replace with live CAASPP API + EdData scraper.
+    See: 01_district_intelligence/california_district_prioritization_model.ipynb
+    """
+    with metrics.stage("data.load_district_data"):   # cache misses only
+        return load_districts()
+
+
+@st.cache_resource
+def load_ranking_index():
+    """
+    Readiness ranking over all districts (01_district_intelligence/ranking_index.py),
+    keyed by cds_code when the dataset has it. Shared by every session and
+    never updated: pages apply tracking results to session_ranking_index().
+    """
+    from ranking_index import RankingIndex
+    districts = load_district_data()
+    with metrics.stage("data.load_ranking_index"):
+        return RankingIndex.from_districts(districts)
+
+
+def session_ranking_index():
+    """This session's copy of load_ranking_index(), for SOR tracking updates."""
+    if "ranking_index" not in st.session_state:
+        st.session_state["ranking_index"] = load_ranking_index().copy()
+    return st.session_state["ranking_index"]
+
+
+@st.cache_resource
+def load_district_resolver():
+    """Free-text district mentions -> CDE codes (01_district_intelligence/district_resolver.py)."""
+    from district_resolver import DistrictResolver
+    districts = load_district_data()
+    with metrics.stage("data.load_district_resolver"):
+        return DistrictResolver.from_districts(districts)
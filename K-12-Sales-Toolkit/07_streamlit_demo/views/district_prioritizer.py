@@ -0,0 +1,143 @@
+"""
+district_prioritizer.py — District Prioritizer page: filters, need-vs-budget
+scatter, paged priority table and CSV export.
+"""
+import io
+
+import plotly.express as px
+import streamlit as st
+
+from dashboard_data import (SCATTER_WEBGL_THRESHOLD, csv_chunks, filter_districts, filter_state,
+                            n_pages, page_of, scatter_sample, with_ranking_updates)
+from theme import COLORS
+from views.common import load_district_data, load_district_resolver, session_ranking_index
+
+
+def render():
+    st.header("📊 California District Prioritizer")
+    st.markdown("*ML-powered account scoring — find your Tier 1 targets instantly*")
+
+    ranking = session_ranking_index()
+    # This session's tracking updates applied before filtering: every widget
+    # below (metrics, scatter, table, CSV) sees the ranking index's scores
+    changes = ranking.changed_rows()
+    districts = with_ranking_updates(load_district_data(), changes, ranking.key_col)
+
+    # Filters
+    st.sidebar.markdown("### 🔽 Filters")
+    selected_county = st.sidebar.multiselect(
+        "County", options=sorted(districts["county"].unique()),
+        default=["Los Angeles", "Orange", "Riverside"]
+    )
+    min_score = st.sidebar.slider("Min Readiness Score", 0, 100, 50)
+    sor_filter = st.sidebar.multiselect(
+        "SOR Adoption Stage",
+        options=["None", "Exploring", "Committed", "Implementing"],
+        default=["Committed", "Implementing"]
+    )
+
+    # Filter (unsorted: the table sorts only the page it shows)
+    filtered = filter_districts(districts, selected_county, min_score, sor_filter, sort=False)
+
+    # Metrics
+    has_model = "conversion_probability" in filtered.columns  # conversion_model.py has been trained
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Districts Found", len(filtered))
+    c2.metric("Tier 1 Targets", (filtered["tier"] == "Tier 1").sum())
+    c3.metric("Avg Score", f"{filtered['readiness_score'].mean():.0f}")
+    if has_model:
+        c4.metric("Avg Conversion Prob.", f"{filtered['conversion_probability'].mean():.0%}",
+                  help="Persisted random-forest model (01_district_intelligence/conversion_model.py)")
+
+    # Scatter Plot — WebGL + downsampling once SVG would stall the browser
+    plotted = scatter_sample(filtered)
+    fig = px.scatter(
+        plotted,
+        x="pct_ela_proficient",
+        y="pd_budget_per_student_est",
+        color="tier",
+        size="enrollment_k8",
+        hover_name="district_name",
+        hover_data={"readiness_score": True, "sor_adoption_signal": True,
+                    "county": True, **({"conversion_probability": ":.0%"} if has_model else {})},
+        color_discrete_map={"Tier 1": COLORS["danger"], "Tier 2": COLORS["accent"],
+                             "Tier 3": COLORS["secondary"]},
+        title="District Prioritization Matrix: Need vs. Budget",
+        labels={"pct_ela_proficient": "ELA Proficiency % (lower = higher need)",
+                "pd_budget_per_student_est": "PD Budget per Student ($)"},
+        render_mode="webgl" if len(filtered) > SCATTER_WEBGL_THRESHOLD else "svg",
+    )
+    fig.update_layout(height=450)
+    st.plotly_chart(fig, use_container_width=True)
+    if len(plotted) < len(filtered):
+        st.caption(f"Showing {len(plotted):,} of {len(filtered):,} districts "
+                   "(all Tier 1 first, then a random sample).")
+
+    # Table — paged and sorted server-side
+    st.markdown("### 🎯 Priority List")
+    display_cols = ["district_name", "county", "readiness_score", "tier",
+                    "pct_ela_proficient", "sor_adoption_signal", "enrollment_k8"]
+    if has_model:
+        display_cols.insert(3, "conversion_probability")
+    t1, t2, t3 = st.columns([2, 1, 1])
+    sort_by = t1.selectbox("Sort by", display_cols, index=display_cols.index("readiness_score"))
+    ascending = t2.checkbox("Ascending", value=False)
+    page_size = t3.selectbox("Rows per page", [30, 100, 500], index=0)
+    pages = n_pages(len(filtered), page_size)
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1) - 1
+    rows = page_of(filtered, page, page_size, sort_by, ascending)
+    shown = show_ranking(rows[display_cols].reset_index(drop=True), rows[ranking.key_col], ranking)
+    st.dataframe(shown, use_container_width=True, height=400)
+
+    render_tier_changes(ranking)
+
+    # Export — built only when asked for, then cached per filter state
+    state = filter_state(selected_county, min_score, sor_filter)
+    if (st.session_state.get("priority_csv_state") == state
+            or st.button("📄 Prepare Priority List CSV")):
+        st.session_state["priority_csv_state"] = state
+        st.download_button(
+            "⬇️ Download Priority List (CSV)",
+            data=build_priority_csv(*state, tuple(display_cols), changes, ranking.key_col),
+            file_name="tier1_district_targets.csv",
+            mime="text/csv",
+        )
+
+
+def show_ranking(shown, keys, ranking):
+    """Statewide rank of each shown row from the ranking index (scores are already its own)."""
+    keys = keys.astype(str).tolist() if ranking.key_col == "cds_code" else keys.tolist()
+    shown = shown.copy()
+    shown.insert(0, "statewide_rank", ranking.ranks(keys))
+    return shown
+
+
+def render_tier_changes(ranking):
+    """Feed the latest weekly SOR tracking partitions into the ranking; list who changed tier."""
+    st.markdown("### 🔔 Tier Changes from SOR Tracking")
+    st.caption("Filters, metrics, scatter, priority list and CSV include every tracking result "
+               "applied here (this session only).")
+    if st.button("Apply latest SOR tracking results"):
+        from weekly_tracking_job import load_partitions
+
+        # Tracker names are free text ("LAUSD", "Los Angeles Unified School District")
+        events = ranking.apply_tracker_results(load_partitions(), resolver=load_district_resolver())
+        st.session_state["tier_change_log"] = [str(e) for e in events] + \
+            st.session_state.get("tier_change_log", [])
+        if events:
+            st.rerun()   # redraw the list, metrics and scatter with the new scores
+        st.caption("No district changed tier.")
+    for line in st.session_state.get("tier_change_log", [])[:20]:
+        st.markdown(f"- {line}")
+
+
+@st.cache_data(max_entries=16, show_spinner="Building CSV…")
+def build_priority_csv(counties: tuple, min_score: float, sor_stages: tuple, columns: tuple,
+                       changes, key_col: str) -> bytes:
+    """CSV for one filter state and set of ranking updates, written chunk by chunk; cached per state."""
+    districts = with_ranking_updates(load_district_data(), changes, key_col)
+    filtered = filter_districts(districts, list(counties), min_score, list(sor_stages))
+    buf = io.BytesIO()
+    for chunk in csv_chunks(filtered, list(columns)):
+        buf.write(chunk)
+    return buf.getvalue()
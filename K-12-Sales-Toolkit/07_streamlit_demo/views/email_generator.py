@@ -0,0 +1,57 @@
+"""
+email_generator.py — Email Generator page: three template variants per prospect.
+"""
+import os
+import sys
+
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "03_outreach_automation"))
+from email_templates import TEMPLATES
+
+
+def render():
+    st.header("✉️ Personalized Email Generator")
+    st.markdown("*Enter prospect details → get 3 personalized email variants in seconds*")
+
+    st.info("🔑 For AI-powered generation, add your OpenAI API key to `.env`. "
+            "Showing template-based previews below.", icon="ℹ️")
+
+    with st.form("email_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            name = st.text_input("Contact Name", placeholder="Dr. Jane Smith")
+            title = st.text_input("Title", placeholder="Assistant Superintendent of Curriculum")
+            district = st.text_input("District", placeholder="Los Angeles Unified School District")
+        with col2:
+            ela_pct = st.number_input("District ELA Proficiency %", 0, 100, 38)
+            sor_stage = st.selectbox("SOR Adoption Stage",
+                                     ["None", "Exploring", "Committed", "Implementing"])
+            pain_point = st.text_input("Key Pain Point",
+                                       placeholder="Inconsistent SOR implementation")
+        submitted = st.form_submit_button("🚀 Generate Emails")
+
+    if submitted and district:
+        st.markdown("---")
+        st.markdown(f"### Generated Emails for **{name}** at **{district}**")
+
+        tab1, tab2, tab3 = st.tabs(["📌 Subject-First", "💡 Problem-Focused", "📖 Peer Story"])
+
+        # Same templates the generator falls back to, rendered for st.markdown
+        emails = TEMPLATES.render_all({
+            "name": name, "title": title, "district": district,
+            "ela_proficiency_pct": ela_pct, "sor_stage": sor_stage, "pain_point": pain_point,
+        }, markdown=True)
+
+        with tab1:
+            st.markdown(emails["subject_first"])
+            st.button("📋 Copy", key="copy1")
+        with tab2:
+            st.markdown(emails["problem_focused"])
+            st.button("📋 Copy", key="copy2")
+        with tab3:
+            st.markdown(emails["peer_story"])
+            st.button("📋 Copy", key="copy3")
+
+        st.markdown("---")
+        st.success("✅ Review and add 1 specific detail before sending. Personalization = higher reply rates.")
@@ -0,0 +1,78 @@
+"""
+pipeline_tracker.py — Pipeline Tracker page: HubSpot mirror, at-risk deals
+and stage health.
+"""
+import os
+import sys
+
+import plotly.express as px
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "04_sales_cycle_tools"))
+from hubspot_sync import load_deals, pipeline_frame
+from pipeline_health import RiskThresholds, describe_risks, pipeline_health
+from theme import COLORS
+from views.common import load_district_data, load_district_resolver
+
+
+@st.cache_data(ttl=300)
+def load_pipeline():
+    """Deals from the local HubSpot mirror (refreshed by hubspot_sync.py)."""
+    return pipeline_frame(load_deals())
+
+
+def render():
+    st.header("📈 Pipeline Tracker")
+    st.markdown("*HubSpot deals from the local mirror — refresh with "
+                "`python 04_sales_cycle_tools/hubspot_sync.py`*")
+
+    deals = load_pipeline()
+    if deals.empty:
+        st.info("No deals mirrored yet. Add `HUBSPOT_API_KEY` to `.env` and run "
+                "`python 04_sales_cycle_tools/hubspot_sync.py`.", icon="ℹ️")
+        return
+
+    with st.sidebar:
+        st.subheader("At-Risk Rules")
+        thresholds = RiskThresholds(
+            stale_days=st.slider("Stale after (days idle)", 1, 60, 14),
+            close_window_days=st.slider("Close-date window (days)", 1, 60, 14),
+            min_contacts=st.slider("Min contacts (evaluation / proposal)", 1, 10, 3),
+        )
+    flags, stage_health = pipeline_health(deals, thresholds)
+    at_risk = flags != 0
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Deals", f"{len(deals):,}")
+    c2.metric("Pipeline", f"${deals['amount'].sum():,.0f}")
+    c3.metric("Weighted Pipeline", f"${deals['weighted_value'].sum():,.0f}")
+    c4.metric("🔴 At Risk", f"{int(at_risk.sum()):,}",
+              help=f"${stage_health['at_risk_value'].sum():,.0f} of pipeline")
+
+    by_stage = stage_health.reset_index()
+    fig = px.bar(by_stage, x="stage", y=["total_value", "at_risk_value"], barmode="overlay",
+                 title="Pipeline Value by Stage (at-risk overlaid)",
+                 color_discrete_sequence=[COLORS["secondary"], COLORS["danger"]])
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(stage_health, use_container_width=True)
+
+    st.subheader("At-Risk Deals")
+    flagged = deals.assign(risk_bits=flags)[at_risk].nlargest(200, "weighted_value")
+    flagged["risk"] = describe_risks(flagged, flagged["risk_bits"].to_numpy(), thresholds)
+    flagged = with_district_tiers(flagged)
+    st.dataframe(
+        flagged[["deal_name", "district", "tier", "stage", "amount", "close_date",
+                 "days_since_last_activity", "contact_count", "risk"]].reset_index(drop=True),
+        use_container_width=True,
+        height=400,
+    )
+
+
+def with_district_tiers(deals):
+    """Resolve each deal name to its district ("LAUSD - Pilot" -> LAUSD) and add its readiness tier."""
+    resolved = load_district_resolver().resolve_batch(deals["deal_name"])
+    districts = load_district_data()
+    key = "cds_code" if "cds_code" in districts.columns else "district_name"
+    tiers = districts.drop_duplicates(key).set_index(key)["tier"]
+    return deals.assign(district=resolved["district_name"].to_numpy(),
+                        tier=resolved[key].map(tiers).to_numpy())
@@ -0,0 +1,80 @@
+"""
+territory_planner.py — Territory Planner page: split districts between reps'
+home bases, re-score geography from each home, and query what is near a rep
+(district_geo.py).
+"""
+import os
+import sys
+
+import plotly.express as px
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "01_district_intelligence"))
+from district_geo import (GEO_COLUMNS, HOME_BASES, DistrictSpatialIndex, assign_territories,
+                          score_from_home, territory_summary)
+from dashboard_data import scatter_sample
+from theme import COLORS
+from views.common import load_district_data
+
+DEFAULT_REPS = ["Los Angeles", "Fresno", "Sacramento", "San Diego"]
+REP_COLORS = [COLORS["primary"], COLORS["accent"], COLORS["secondary"], COLORS["danger"]]
+
+
+@st.cache_resource(max_entries=8)
+def home_index(home: str) -> DistrictSpatialIndex:
+    """Districts scored from one home base, with a spatial index over them."""
+    return DistrictSpatialIndex(score_from_home(load_district_data(), *HOME_BASES[home]))
+
+
+def render():
+    st.header("🗺️ Territory Planner")
+    st.markdown("*Split the state between reps — every district is scored from its nearest "
+                "rep's home base instead of Los Angeles*")
+
+    districts = load_district_data()
+    if not set(GEO_COLUMNS) <= set(districts.columns):
+        st.info("The district dataset has no latitude / longitude yet — see data/README.md.", icon="ℹ️")
+        return
+
+    with st.sidebar:
+        st.subheader("Reps")
+        n_reps = st.number_input("Number of reps", 1, len(DEFAULT_REPS), 2)
+        homes = [st.selectbox(f"Rep {i + 1} home base", sorted(HOME_BASES),
+                              index=sorted(HOME_BASES).index(DEFAULT_REPS[i]), key=f"rep_home_{i}")
+                 for i in range(int(n_reps))]
+        radius = st.slider("Drive radius (miles)", 10, 300, 60)
+        k = st.slider("Nearest Tier 1 districts", 5, 50, 10)
+
+    reps = {f"Rep {i + 1} ({home})": HOME_BASES[home] for i, home in enumerate(homes)}
+    territories = assign_territories(districts, reps)
+
+    st.markdown("### 📋 Territory Split")
+    st.dataframe(territory_summary(territories), use_container_width=True, hide_index=True)
+
+    # Downsampled like the prioritizer scatter: every marker is drawn client-side
+    plotted = scatter_sample(territories)
+    fig = px.scatter_geo(
+        plotted, lat="latitude", lon="longitude", color="rep", symbol="tier",
+        hover_name="district_name",
+        hover_data={"readiness_score": True, "miles_from_home": True, "latitude": False,
+                    "longitude": False},
+        color_discrete_sequence=REP_COLORS, title="Districts by rep territory",
+    )
+    fig.update_geos(fitbounds="locations", showsubunits=True)
+    fig.update_layout(height=500)
+    st.plotly_chart(fig, use_container_width=True)
+    if len(plotted) < len(territories):
+        st.caption(f"Showing {len(plotted):,} of {len(territories):,} districts "
+                   "(all Tier 1 first, then a random sample).")
+
+    st.markdown("### 📍 Around One Rep")
+    focus = st.selectbox("Rep", homes, format_func=lambda h: f"{h} home base")
+    geo = home_index(focus)
+    cols = ["district_name", "county", "readiness_score", "tier", "miles_from_home"]
+    left, right = st.columns(2)
+    nearby = geo.within(*HOME_BASES[focus], miles=radius)
+    left.markdown(f"**{len(nearby):,} districts within {radius} miles**")
+    left.dataframe(nearby[cols].head(200), use_container_width=True, hide_index=True, height=380)
+    right.markdown(f"**Nearest {k} Tier 1 districts**")
+    right.dataframe(geo.nearest(*HOME_BASES[focus], k=k, tier="Tier 1")[cols],
+                    use_container_width=True, hide_index=True, height=380)
@@ -0,0 +1,74 @@
+"""
+weight_what_if.py — Weight What-If page: how tiers and ranks move when the
+readiness weights change (weight_sensitivity.py).
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "01_district_intelligence"))
+from theme import COLORS
+from views.common import load_district_data
+from weight_sensitivity import (COMPONENTS, DEFAULT_WEIGHTS, component_matrix, perturbed_weights,
+                                sweep)
+
+LABELS = {"need": "ELA Need", "budget": "PD Budget", "sor": "SOR Stage",
+          "leadership": "Leadership Signals", "geography": "Geography"}
+
+
+@st.cache_data
+def load_components():
+    """Score components of every district (computed once; sliders only re-weight)."""
+    return component_matrix(load_district_data())
+
+
+def render():
+    st.header("🎚️ Weight What-If")
+    st.markdown("*Move the readiness weights and see which districts change tier or rank — "
+                "every district is re-scored under a whole grid of nearby weight sets*")
+
+    districts = load_district_data()
+    components = load_components()
+
+    with st.sidebar:
+        st.subheader("Readiness Weights")
+        center = np.array([st.slider(LABELS[c], 0, 50, int(w)) for c, w in zip(COMPONENTS, DEFAULT_WEIGHTS)],
+                          dtype=np.float64)
+        spread = st.slider("Uncertainty around each weight (±%)", 0, 50, 25) / 100
+        n_sets = st.select_slider("Weight sets evaluated", [100, 250, 1000, 2500], value=1000)
+        top_k = st.number_input("Priority list size (top K)", 5, 500, 50)
+
+    if center.sum() <= 0:
+        st.warning("Give at least one component a positive weight.")
+        return
+
+    start = time.perf_counter()
+    result = sweep(components, perturbed_weights(n_sets, spread, center), top_k=int(top_k))
+    elapsed = time.perf_counter() - start
+
+    grid = result.grid_frame()
+    chosen = grid.iloc[0]  # row 0 = the slider weights (renormalized to 100)
+    base_counts = np.bincount(result.baseline_tier, minlength=3)
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Tier 1 (your weights)", int(chosen["Tier 1"]), delta=int(chosen["Tier 1"] - base_counts[0]))
+    c2.metric("Tier 2 (your weights)", int(chosen["Tier 2"]), delta=int(chosen["Tier 2"] - base_counts[1]))
+    c3.metric(f"Top-{int(top_k)} kept", f"{chosen['topk_overlap']:.0%}",
+              help="Share of today's top-K priority list still in the top K")
+    c4.metric("Median top-K kept (grid)", f"{grid['topk_overlap'].median():.0%}")
+    st.caption(f"{n_sets:,} weight sets × {len(districts):,} districts in {elapsed * 1000:.0f} ms")
+
+    fig = px.histogram(grid, x="Tier 1", nbins=30, title="Tier 1 size across the weight grid",
+                       color_discrete_sequence=[COLORS["danger"]])
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### 🔀 Most weight-sensitive districts")
+    summary = result.district_frame(districts)
+    st.dataframe(
+        summary.head(100).style.format({"tier1_share": "{:.0%}", "tier_change_share": "{:.0%}"}),
+        use_container_width=True,
+        height=400,
+    )
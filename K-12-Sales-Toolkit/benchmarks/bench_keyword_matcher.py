@@ -0,0 +1,81 @@
+"""
+bench_keyword_matcher.py
+Compares KeywordMatcher against the original per-keyword ``in`` loop from
+classify_adoption_stage.
+
+Run: python benchmarks/bench_keyword_matcher.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from keyword_matcher import KeywordMatcher
+from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+FILLER = ("the district board approved a new plan for teachers professor students "
+          "reading literacy instruction budget school superintendent coaching").split()
+# Without "professor": no near-miss ("sor") for the word-boundary check to reject
+PLAIN_FILLER = [w for w in FILLER if w != "professor"]
+
+
+def legacy_counts(text, sor_keywords, resistance_keywords):
+    """The loop classify_adoption_stage used before KeywordMatcher."""
+    text = text.lower()
+    return (sum(kw.lower() in text for kw in sor_keywords),
+            sum(kw.lower() in text for kw in resistance_keywords))
+
+
+def synthetic_texts(n, words_per_text, keywords, seed=42, filler=FILLER):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        words = [rng.choice(filler) for _ in range(words_per_text)]
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        texts.append(" ".join(words))
+    return texts
+
+
+def best_of(fn, texts, repeat=3):
+    """Fastest of ``repeat`` passes of ``fn`` over ``texts`` (seconds)."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for t in texts:
+            fn(t)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench(label, texts, sor_keywords, resistance_keywords):
+    matcher = KeywordMatcher({"sor": sor_keywords, "resistance": resistance_keywords})
+    scan = KeywordMatcher({"sor": sor_keywords, "resistance": resistance_keywords})
+    scan._probes = None  # always the single-pass trie scan
+
+    legacy = best_of(lambda t: legacy_counts(t, sor_keywords, resistance_keywords), texts)
+    trie = best_of(scan.distinct_counts, texts)
+    compiled = best_of(matcher.distinct_counts, texts)
+    with_spans = best_of(matcher.match, texts)
+
+    print(f"{label:<42} {len(texts):>7,} texts | legacy {legacy:7.3f}s | trie scan {trie:7.3f}s | "
+          f"matcher {compiled:7.3f}s ({legacy / compiled:4.1f}x) | with spans {with_spans:7.3f}s")
+
+
+if __name__ == "__main__":
+    sor = SORAdoptionTracker.SOR_KEYWORDS
+    res = SORAdoptionTracker.RESISTANCE_KEYWORDS
+    extra = [f"literacy term {i}" for i in range(200)]
+
+    print("KeywordMatcher vs. per-keyword `in` loop")
+    print("=" * 130)
+    bench("articles, default keywords (13)", synthetic_texts(20_000, 60, sor + res), sor, res)
+    bench("articles, default, no near-misses", synthetic_texts(20_000, 60, sor + res, filler=PLAIN_FILLER),
+          sor, res)
+    bench("articles, expanded keywords (213)", synthetic_texts(20_000, 60, sor + res + extra),
+          sor + extra, res)
+    bench("board minutes (~20k words), default", synthetic_texts(20, 20_000, sor + res), sor, res)
+    bench("board minutes (~20k words), expanded", synthetic_texts(20, 20_000, sor + res + extra),
+          sor + extra, res)
@@ -0,0 +1,400 @@
+"""
+run_benchmarks.py
+Benchmark suite for the toolkit's hot paths, with machine-readable results.
+
+Each benchmark times only the code under test (fixture generation is
+excluded) and reports rows/sec. Results go to a JSON file keyed by git
+commit, and --compare flags regressions against an earlier run.
+
+Run:
+    python benchmarks/run_benchmarks.py                        # 1k + 100k
+    python benchmarks/run_benchmarks.py --sizes 1k,100k,1M     # full suite
+    python benchmarks/run_benchmarks.py --only scoring,filter --repeat 5
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<base>.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+for _dir in ("01_district_intelligence", "03_outreach_automation", "04_sales_cycle_tools",
+             "07_streamlit_demo"):
+    sys.path.insert(0, os.path.join(_HERE, "..", _dir))
+sys.path.insert(0, _HERE)
+
+from synthetic import (article_chunks, district_chunks, district_frame, parse_size,
+                       prospect_stream)
+
+DEFAULT_RESULTS_DIR = os.path.join(_HERE, "results")
+
+
+# ============================================================
+# Benchmarks: fn(n, seed) -> seconds spent in the code under test
+# ============================================================
+
+def bench_scoring(n, seed):
+    from district_scoring import score_districts
+
+    elapsed = 0.0
+    for chunk in district_chunks(n, seed):
+        start = time.perf_counter()
+        score_districts(chunk)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def bench_classify(n, seed):
+    """n = number of articles, 10 per district."""
+    from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+    tracker = SORAdoptionTracker()
+    elapsed = 0.0
+    for batch in article_chunks(n, seed):
+        start = time.perf_counter()
+        for district, articles in batch:
+            tracker.classify_adoption_stage(district, articles)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def bench_classify_dedup(n, seed):
+    """n articles, each story syndicated by 4 outlets, through a fresh dedup index."""
+    import random
+    from article_dedup import SignatureIndex
+    from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+    stories = [a for batch in article_chunks(max(1, n // 4), seed) for _, arts in batch for a in arts]
+    rng = random.Random(seed)
+    copies = [dict(a, title=f"{a['title']} - Outlet {c}", url=f"https://outlet{c}.example/{i}")
+              for i, a in enumerate(stories) for c in range(4)][:n]
+    rng.shuffle(copies)
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = SORAdoptionTracker(dedup=SignatureIndex(os.path.join(tmp, "signatures.sqlite")))
+        start = time.perf_counter()
+        for lo in range(0, len(copies), 10):
+            tracker.classify_adoption_stage(f"District {lo // 10:07d}", copies[lo:lo + 10])
+        elapsed = time.perf_counter() - start
+        tracker.dedup.close()
+    return elapsed
+
+
+def _template_generator(**kwargs):
+    from personalized_email_generator import K8EmailGenerator
+
+    gen = K8EmailGenerator(**kwargs)
+    gen.openai_key = None  # template path: measures our code, not the API
+    return gen
+
+
+def bench_email_generate(n, seed):
+    gen = _template_generator(history_size=0)
+    prospects = prospect_stream(n, seed)
+    start = time.perf_counter()
+    for p in prospects:
+        gen.generate(p)
+    return time.perf_counter() - start
+
+
+def bench_email_batch_generate(n, seed):
+    gen = _template_generator(history_size=0)
+    prospects = list(prospect_stream(n, seed))
+    start = time.perf_counter()
+    gen.batch_generate(prospects)
+    return time.perf_counter() - start
+
+
+def bench_email_export_to_csv(n, seed):
+    """export_to_csv over an n-prospect history (3 rows per prospect)."""
+    gen = _template_generator(history_size=None)
+    for p in prospect_stream(n, seed):
+        gen.generate(p)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        gen.export_to_csv(os.path.join(tmp, "emails.csv"))
+        return time.perf_counter() - start
+
+
+def bench_email_export_stream(n, seed):
+    """Generate + stream to gzipped JSONL in one pass (bounded memory)."""
+    gen = _template_generator(history_size=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        gen.export_stream(prospect_stream(n, seed), os.path.join(tmp, "emails.jsonl.gz"))
+        return time.perf_counter() - start
+
+
+def bench_filter(n, seed):
+    """District Prioritizer sidebar filter + sort on an n-row table."""
+    from dashboard_data import filter_districts
+
+    districts = district_frame(n, seed)
+    start = time.perf_counter()
+    filter_districts(districts, ["Los Angeles", "Orange", "Riverside"], 50,
+                     ["Committed", "Implementing"])
+    return time.perf_counter() - start
+
+
+def bench_filter_compact(n, seed):
+    """The same filter on DISTRICT_SCHEMA dtypes (categorical county / SOR stage)."""
+    from dashboard_data import filter_districts
+    from frame_schema import DISTRICT_SCHEMA, apply_schema
+
+    districts = apply_schema(district_frame(n, seed), DISTRICT_SCHEMA)
+    start = time.perf_counter()
+    filter_districts(districts, ["Los Angeles", "Orange", "Riverside"], 50,
+                     ["Committed", "Implementing"])
+    return time.perf_counter() - start
+
+
+def bench_apply_schema(n, seed):
+    """Validate + cast an n-row scored district frame to DISTRICT_SCHEMA."""
+    from frame_schema import DISTRICT_SCHEMA, apply_schema
+
+    districts = district_frame(n, seed)
+    start = time.perf_counter()
+    apply_schema(districts, DISTRICT_SCHEMA)
+    return time.perf_counter() - start
+
+
+def bench_pipeline_health(n, seed):
+    """Risk bitmask + stage aggregates over an n-deal history."""
+    from pipeline_health import pipeline_health, synthetic_deals
+
+    deals = synthetic_deals(n, seed)
+    start = time.perf_counter()
+    pipeline_health(deals)
+    return time.perf_counter() - start
+
+
+def bench_conversion_predict(n, seed):
+    """Batch predict_proba from a saved, memory-mapped conversion model."""
+    from conversion_model import ConversionModel
+    from dashboard_data import synthetic_districts
+
+    train = synthetic_districts(500, seed=seed)
+    model = ConversionModel.fit(train, (train["readiness_score"] > 60).astype(int))
+    districts = district_frame(n, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = model.save(os.path.join(tmp, "model.lpcm"))
+        start = time.perf_counter()
+        ConversionModel.load(path).predict_proba(districts)
+        return time.perf_counter() - start
+
+
+def bench_weight_sweep(n, seed):
+    """1,000 readiness weight sets over n districts (one matrix product)."""
+    from weight_sensitivity import component_matrix, perturbed_weights, sweep
+
+    components = component_matrix(district_frame(n, seed))
+    weights = perturbed_weights(1000, seed=seed)
+    start = time.perf_counter()
+    sweep(components, weights)
+    return time.perf_counter() - start
+
+
+def bench_ranking_update(n, seed):
+    """n SOR-stage changes applied one at a time to a 100k-district ranking index."""
+    import numpy as np
+    from ranking_index import RankingIndex
+
+    districts = district_frame(100_000, seed)
+    index = RankingIndex.from_districts(districts)
+    rng = np.random.default_rng(seed)
+    names = districts[index.key_col].to_numpy()[rng.integers(0, len(districts), n)].tolist()
+    stages = rng.choice(["None", "Exploring", "Committed", "Implementing"], n).tolist()
+    start = time.perf_counter()
+    for name, stage in zip(names, stages):
+        index.update(name, sor_adoption_signal=stage)
+    return time.perf_counter() - start
+
+
+def bench_territories(n, seed):
+    """Four-rep territory split + re-score, then a spatial index and 100 radius queries."""
+    from district_geo import HOME_BASES, DistrictSpatialIndex, assign_territories
+
+    districts = district_frame(n, seed)
+    reps = {name: HOME_BASES[name] for name in ("Los Angeles", "Fresno", "Sacramento", "San Diego")}
+    homes = list(HOME_BASES.values())
+    start = time.perf_counter()
+    assign_territories(districts, reps)
+    geo = DistrictSpatialIndex(districts)
+    for i in range(100):
+        geo.within(*homes[i % len(homes)], miles=30)
+    return time.perf_counter() - start
+
+
+def bench_resolve_mentions(n, seed):
+    """n district mentions (1 in 10 misspelled) resolved against 1,000 districts."""
+    import numpy as np
+    from district_resolver import DistrictResolver
+
+    districts = district_frame(1_000, seed)
+    resolver = DistrictResolver.from_districts(districts, alias_path=None)
+    rng = np.random.default_rng(seed)
+    names = districts["district_name"].to_numpy()[rng.integers(0, len(districts), n)]
+    cut = rng.integers(2, 8, n)
+    mentions = [f"{m[:-c]}{m[-c + 1:]} USD" if i % 10 == 0 else m.upper()
+                for i, (m, c) in enumerate(zip(names, cut))]
+    start = time.perf_counter()
+    resolver.resolve_batch(mentions)
+    return time.perf_counter() - start
+
+
+def bench_ingest_documents(n, seed):
+    """n HTML board-minutes pages (~6 KB, 100 districts): parse in a process pool + classify."""
+    from document_ingest import DocumentIngestor
+    from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "documents")
+        for batch in article_chunks(n, seed, per_district=max(1, n // 100)):
+            for district, articles in batch:
+                os.makedirs(os.path.join(root, district), exist_ok=True)
+                for i, article in enumerate(articles):
+                    body = "".join(f"<p>{article['description']}</p>" for _ in range(20))
+                    with open(os.path.join(root, district, f"minutes_{i}.html"), "w") as f:
+                        f.write(f"<html><body><h1>{article['title']}</h1>{body}</body></html>")
+        ingestor = DocumentIngestor(SORAdoptionTracker(), root=root,
+                                    state_path=os.path.join(tmp, "state.sqlite"))
+        start = time.perf_counter()
+        ingestor.run()
+        elapsed = time.perf_counter() - start
+        ingestor.close()
+    return elapsed
+
+
+# name -> (fn, largest size it runs at; None = no cap)
+BENCHMARKS = {
+    "scoring": (bench_scoring, None),
+    "classify_adoption_stage": (bench_classify, None),
+    "classify_dedup": (bench_classify_dedup, None),
+    "email_generate": (bench_email_generate, None),
+    "email_batch_generate": (bench_email_batch_generate, None),
+    # Holds the whole history in memory by design; export_stream covers 1M
+    "email_export_to_csv": (bench_email_export_to_csv, 100_000),
+    "email_export_stream": (bench_email_export_stream, None),
+    "filter": (bench_filter, None),
+    "filter_compact": (bench_filter_compact, None),
+    "apply_schema": (bench_apply_schema, None),
+    "pipeline_health": (bench_pipeline_health, None),
+    "conversion_predict": (bench_conversion_predict, None),
+    # (1000 x n) score matrix: 8 GB at 1M districts
+    "weight_sweep": (bench_weight_sweep, 100_000),
+    "ranking_update": (bench_ranking_update, None),
+    "territories": (bench_territories, None),
+    "resolve_mentions": (bench_resolve_mentions, None),
+    # One file per document on disk
+    "ingest_documents": (bench_ingest_documents, 10_000),
+}
+
+
+# ============================================================
+# Runner
+# ============================================================
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(names=None, sizes=("1k", "100k"), repeat: int = 3, seed: int = 42, quiet: bool = False) -> dict:
+    """
+    Run benchmarks and return the results document.
+
+    Returns:
+        dict with keys: commit, timestamp, python, platform, results
+        (one entry per benchmark x size: benchmark, size, rows, seconds
+        (best of ``repeat``), rows_per_sec, skipped)
+    """
+    import contextlib
+    import io
+
+    results = []
+    for name in names or BENCHMARKS:
+        fn, cap = BENCHMARKS[name]
+        for label in sizes:
+            n = parse_size(label)
+            entry = {"benchmark": name, "size": str(label), "rows": n}
+            if cap is not None and n > cap:
+                entry.update(seconds=None, rows_per_sec=None, skipped=f"capped at {cap:,} rows")
+            else:
+                with contextlib.redirect_stdout(io.StringIO()):  # silence progress prints
+                    best = min(fn(n, seed) for _ in range(repeat))
+                entry.update(seconds=round(best, 6), rows_per_sec=round(n / best, 1) if best else None,
+                             skipped=None)
+            results.append(entry)
+            if not quiet:
+                rate = f"{entry['rows_per_sec']:>14,.0f} rows/s" if entry["rows_per_sec"] else entry["skipped"]
+                print(f"{name:<26} {label:>6}  {rate}")
+    return {"commit": git_commit(), "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "results": results}
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.2) -> list:
+    """
+    Regressions: benchmarks whose rows/sec dropped by more than
+    ``tolerance`` (0.2 = 20%) against the baseline.
+
+    Returns:
+        list of dicts: benchmark, size, baseline, current, change
+    """
+    base = {(r["benchmark"], r["size"]): r["rows_per_sec"] for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        before = base.get((r["benchmark"], r["size"]))
+        if not before or not r["rows_per_sec"]:
+            continue
+        change = r["rows_per_sec"] / before - 1
+        if change < -tolerance:
+            regressions.append({"benchmark": r["benchmark"], "size": r["size"], "baseline": before,
+                                "current": r["rows_per_sec"], "change": round(change, 3)})
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Toolkit hot-path benchmarks")
+    parser.add_argument("--sizes", default="1k,100k", help="Comma-separated: 1k,100k,1M or integers")
+    parser.add_argument("--only", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Results JSON (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed rows/sec drop (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else None
+    unknown = set(names or ()) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    doc = run(names, args.sizes.split(","), args.repeat, args.seed)
+    out = args.out or os.path.join(DEFAULT_RESULTS_DIR, f"{doc['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(doc, f, indent=2)
+    print(f"\nResults written to {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(doc, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['benchmark']} @ {r['size']}: {r['baseline']:,.0f} -> "
+                  f"{r['current']:,.0f} rows/s ({r['change']:+.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} vs {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
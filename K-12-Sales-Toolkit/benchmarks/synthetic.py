@@ -0,0 +1,93 @@
+"""
+synthetic.py
+Seedable synthetic fixtures for the benchmark suite.
+
+Every generator is deterministic for a given (n, seed) and streams large
+sizes in chunks, so a 1M-row benchmark never needs 1M rows of fixture data
+in memory unless the code under test does.
+"""
+import os
+import random
+import sys
+
+import pandas as pd
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, "..", "07_streamlit_demo"))
+
+from dashboard_data import synthetic_districts
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+DEFAULT_CHUNK = 100_000
+
+FILLER = ("the district board approved a new plan for teachers students reading literacy "
+          "instruction budget school superintendent coaching meeting agenda").split()
+SOR_TERMS = ["science of reading", "structured literacy", "phonics instruction",
+             "decodable texts", "LETRS", "phonemic awareness"]
+RESISTANCE_TERMS = ["balanced literacy", "three-cueing", "reading recovery"]
+PAIN_POINTS = ["teacher retention", "inconsistent SOR implementation",
+               "coach turnover", "low third-grade reading scores"]
+
+
+def parse_size(label) -> int:
+    """'1k' / '100k' / '1M' / plain integers."""
+    label = str(label)
+    if label in SIZES:
+        return SIZES[label]
+    return int(label.replace("_", ""))
+
+
+def _chunks(n: int, chunk_size: int):
+    for start in range(0, n, chunk_size):
+        yield start, min(chunk_size, n - start)
+
+
+def district_chunks(n: int, seed: int = 42, chunk_size: int = DEFAULT_CHUNK, score: bool = False):
+    """Yield DataFrames of synthetic districts totalling n rows."""
+    for k, (start, size) in enumerate(_chunks(n, chunk_size)):
+        yield synthetic_districts(size, seed=seed + k, start=start, score=score)
+
+
+def district_frame(n: int, seed: int = 42, chunk_size: int = DEFAULT_CHUNK) -> pd.DataFrame:
+    """Scored districts as one frame (for code paths that need the whole table)."""
+    return pd.concat(district_chunks(n, seed, chunk_size, score=True), ignore_index=True)
+
+
+def article_chunks(n: int, seed: int = 42, chunk_size: int = 10_000, per_district: int = 10,
+                   words: int = 40):
+    """
+    Yield lists of (district_name, articles) covering n articles in total,
+    ``per_district`` NewsAPI-style articles per district.
+    """
+    rng = random.Random(seed)
+    keywords = SOR_TERMS + RESISTANCE_TERMS
+    made = 0
+    while made < n:
+        batch = []
+        for _ in range(max(1, min(chunk_size, n - made) // per_district)):
+            district = f"District {made // per_district:07d}"
+            articles = []
+            for _ in range(min(per_district, n - made)):
+                body = [rng.choice(FILLER) for _ in range(words)]
+                for _ in range(rng.randint(0, 3)):
+                    body.insert(rng.randrange(len(body)), rng.choice(keywords))
+                articles.append({"title": f"{district} {rng.choice(FILLER)} update",
+                                 "description": " ".join(body),
+                                 "publishedAt": "2026-10-01T00:00:00Z"})
+                made += 1
+            batch.append((district, articles))
+            if made >= n:
+                break
+        yield batch
+
+
+def prospect_stream(n: int, seed: int = 42):
+    """Lazily yield n prospect dicts for the email generator."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {"name": f"Dr. Prospect {i}",
+               "title": "Assistant Superintendent of Curriculum & Instruction",
+               "district": f"District {i:07d}",
+               "ela_proficiency_pct": rng.randint(20, 75),
+               "sor_stage": rng.choice(["Exploring", "Committed", "Implementing"]),
+               "pain_point": rng.choice(PAIN_POINTS)}
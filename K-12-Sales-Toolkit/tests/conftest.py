@@ -0,0 +1,28 @@
+"""
+Shared pytest options.
+
+Wall-clock assertions (throughput floors, latency ceilings) depend on the
+machine and its load, so tests marked ``timing`` are skipped unless pytest
+runs with --timing. The same hot paths are tracked for regressions by
+benchmarks/run_benchmarks.py --compare.
+
+Run: pytest tests/ --timing
+"""
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--timing", action="store_true", help="also run wall-clock timing tests")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "timing: wall-clock assertion; only runs with --timing")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--timing"):
+        return
+    skip = pytest.mark.skip(reason="wall-clock timing test; run with --timing")
+    for item in items:
+        if "timing" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,84 @@
+"""
+Tests for the dashboard's lazy page registry and startup budget.
+"""
+import ast
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(__file__), "..", "07_streamlit_demo")
+sys.path.insert(0, APP_DIR)
+
+import startup_check
+from page_registry import PAGES, load_page, module_name, page_labels
+
+
+def _module_path(label):
+    return os.path.join(APP_DIR, *module_name(label).split(".")) + ".py"
+
+
+def _top_level_imports(path):
+    tree = ast.parse(open(path, encoding="utf-8").read())
+    names = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.add(node.module)
+    return names, tree
+
+
+def test_registry_pages_exist_and_define_render():
+    labels = page_labels()
+    assert labels[0] == "🏠 Home" and len(set(labels)) == len(labels) == len(PAGES)
+    for label in labels:
+        _, tree = _top_level_imports(_module_path(label))
+        assert any(isinstance(n, ast.FunctionDef) and n.name == "render" for n in tree.body), label
+    with pytest.raises(KeyError):
+        module_name("📅 90-Day Plan")
+
+
+def test_app_imports_no_pages_or_chart_libraries():
+    names, _ = _top_level_imports(os.path.join(APP_DIR, "app.py"))
+    assert not any(n.startswith(("plotly", "views", "pandas", "numpy")) for n in names)
+    source = open(os.path.join(APP_DIR, "app.py"), encoding="utf-8").read()
+    assert "https://" not in source.split("st.sidebar.image")[1].split(")")[0]  # no remote logo
+    # The timing checkbox is per session; it must not switch process-wide collection
+    calls = {node.func.attr for node in ast.walk(ast.parse(source))
+             if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)}
+    assert not calls & {"enable", "disable"}
+
+
+def test_only_charting_pages_import_plotly():
+    for label in page_labels():
+        names, _ = _top_level_imports(_module_path(label))
+        uses_plotly = any(n.startswith("plotly") for n in names)
+        draws = "plotly_chart" in open(_module_path(label), encoding="utf-8").read()
+        assert uses_plotly == draws, label
+
+
+def test_check_reports_budget_violations():
+    ok = {"cold_start_s": 0.5, "deferred_loaded_on_home": [], "exceptions": [],
+          "pages": {"📊 District Prioritizer": {"first_visit_s": 0.3, "rerun_s": 0.1, "exceptions": []}}}
+    assert startup_check.check(ok) == []
+    slow = dict(ok, cold_start_s=9.0, deferred_loaded_on_home=["plotly.express"],
+                pages={"📊 District Prioritizer": {"first_visit_s": 0.3, "rerun_s": 2.0, "exceptions": ["boom"]}})
+    problems = startup_check.check(slow)
+    assert len(problems) == 4 and startup_check.check(slow, scale=100) != []  # import + error still fail
+
+
+def test_pages_load_lazily_and_within_budget():
+    pytest.importorskip("streamlit.testing.v1")
+    pytest.importorskip("plotly")
+    result = startup_check.measure()
+    assert result["deferred_loaded_on_home"] == []
+    assert set(result["pages"]) == set(page_labels())
+    # Generous scale: shared CI machines are noisy; the CLI enforces the real budget
+    assert startup_check.check(result, scale=3) == []
+
+
+def test_load_page_is_cached_after_first_import():
+    pytest.importorskip("streamlit")
+    first = load_page("🥊 Battle Cards")
+    assert load_page("🥊 Battle Cards") is first and callable(first.render)
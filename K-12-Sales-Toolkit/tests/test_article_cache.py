@@ -0,0 +1,126 @@
+"""
+Tests for the SQLite article cache used by search_district_news.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from article_cache import ArticleCache
+
+
+def _article(i, day):
+    return {"title": f"Article {i}", "description": "science of reading " * 5,
+            "publishedAt": f"2026-10-{day:02d}T12:00:00Z", "url": f"https://news.example/{i}"}
+
+
+class FakeNewsAPI:
+    def __init__(self, articles):
+        self.articles = articles
+        self.calls = []
+
+    def __call__(self, since):
+        self.calls.append(since)
+        return [a for a in self.articles if a["publishedAt"][:10] >= since]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ArticleCache(str(tmp_path / "cache.sqlite"), ttl_seconds=3600)
+    yield c
+    c.close()
+
+
+def test_fresh_hit_makes_no_network_call(cache):
+    api = FakeNewsAPI([_article(1, 2), _article(2, 5)])
+    first = cache.fetch("LAUSD", "newsapi", "q", "2026-10-01", api)
+    second = cache.fetch("LAUSD", "newsapi", "q", "2026-10-01", api)
+    assert len(api.calls) == 1
+    assert {a["url"] for a in second} == {a["url"] for a in first}
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_stale_entry_fetches_only_after_newest_published(cache):
+    api = FakeNewsAPI([_article(1, 2), _article(2, 5)])
+    cache.fetch("LAUSD", "newsapi", "q", "2026-10-01", api)
+    cache.ttl_seconds = 0
+    api.articles.append(_article(3, 9))
+    result = cache.fetch("LAUSD", "newsapi", "q", "2026-10-01", api)
+    assert api.calls == ["2026-10-01", "2026-10-05"]
+    assert [a["url"] for a in result] == [f"https://news.example/{i}" for i in (3, 2, 1)]
+
+
+def test_wider_window_than_cached_is_a_miss(cache):
+    api = FakeNewsAPI([_article(1, 2)])
+    cache.fetch("LAUSD", "newsapi", "q", "2026-10-05", api)
+    cache.fetch("LAUSD", "newsapi", "q", "2026-10-01", api)
+    assert api.calls == ["2026-10-05", "2026-10-01"]
+
+
+def test_article_bodies_stored_once(cache):
+    shared = FakeNewsAPI([_article(1, 2)])
+    cache.fetch("LAUSD", "newsapi", "q1", "2026-10-01", shared)
+    cache.fetch("Long Beach USD", "edweek", "q2", "2026-10-01", shared)
+    n = cache._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+    assert n == 1
+
+
+def test_lru_size_eviction(tmp_path):
+    cache = ArticleCache(str(tmp_path / "small.sqlite"), max_bytes=10**9)
+    for i in range(5):
+        cache.fetch(f"District {i}", "newsapi", "q", "2026-10-01", FakeNewsAPI([_article(i, 3)]))
+    cache.lookup("District 0", "newsapi", "q", "2026-10-01")  # touch: most recently used
+    per_article = cache.size_bytes() // 5
+    cache.evict(max_bytes=per_article * 2)
+    remaining = {r[0] for r in cache._conn.execute("SELECT district FROM queries")}
+    assert "District 0" in remaining
+    assert cache.size_bytes() <= per_article * 2
+    cache.close()
+
+
+def test_running_size_matches_table(tmp_path):
+    path = str(tmp_path / "sized.sqlite")
+    cache = ArticleCache(path, max_bytes=10**9)
+
+    def table_total():
+        return cache._conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM articles").fetchone()[0]
+
+    shared = FakeNewsAPI([_article(i, 3) for i in range(4)])
+    for i in range(6):
+        cache.fetch(f"District {i}", "newsapi", "q", "2026-10-01", shared)  # bodies shared
+    assert cache.size_bytes() == table_total() > 0
+    cache.evict(max_bytes=1)
+    assert cache.size_bytes() == table_total() == 0
+    cache.fetch("District 9", "newsapi", "q", "2026-10-01", shared)
+    cache.purge_expired(max_age_seconds=3600)
+    assert cache.size_bytes() == table_total() > 0
+    stored = cache.size_bytes()
+    cache.close()
+    reopened = ArticleCache(path)
+    assert reopened.size_bytes() == stored
+    reopened.close()
+
+
+def test_stale_served_when_refresh_fails(cache):
+    cache.fetch("LAUSD", "newsapi", "q", "2026-10-01", FakeNewsAPI([_article(1, 2)]))
+    cache.ttl_seconds = 0
+
+    def down(since):
+        raise ConnectionError("NewsAPI unavailable")
+
+    assert len(cache.fetch("LAUSD", "newsapi", "q", "2026-10-01", down)) == 1
+
+
+def test_tracker_search_uses_cache(cache, monkeypatch):
+    from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+    tracker = SORAdoptionTracker(cache=cache)
+    calls = []
+    real = tracker._fetch_newsapi
+    monkeypatch.setattr(tracker, "_fetch_newsapi", lambda *a: calls.append(a) or real(*a))
+    first = tracker.search_district_news("Compton Unified School District")
+    second = tracker.search_district_news("Compton Unified School District")
+    assert len(calls) == 1
+    assert first == second
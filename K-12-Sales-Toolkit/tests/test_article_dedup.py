@@ -0,0 +1,75 @@
+"""
+Tests for near-duplicate article detection in front of SOR classification.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from article_dedup import SignatureIndex, minhash, similarity
+from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+STORY = ("The district board voted to adopt a structured literacy curriculum with "
+         "explicit phonics instruction and decodable readers for every K-2 classroom "
+         "starting next fall, after a year-long pilot at four elementary schools")
+OTHER = ("Parents packed the meeting to protest the proposed bus route cuts and asked "
+         "trustees to delay the transportation budget vote until the spring session")
+
+
+def copy(story, outlet, url):
+    return {"title": f"Board adopts new reading program - {outlet}", "description": story,
+            "url": url, "publishedAt": "2026-10-01T00:00:00Z"}
+
+
+def test_minhash_estimates_similarity():
+    sigs = minhash([STORY, STORY + " Reporting by staff.", OTHER, ""])
+    assert sigs.shape == (4, 64) and sigs.dtype == np.uint32
+    assert similarity(sigs[0], sigs[1]) > 0.7
+    assert similarity(sigs[0], sigs[2]) < 0.2
+    assert (sigs[3] == np.iinfo(np.uint32).max).all()
+    assert (minhash([STORY])[0] == sigs[0]).all()  # deterministic: signatures are persisted
+
+
+def test_near_duplicates_share_a_cluster(tmp_path):
+    index = SignatureIndex(str(tmp_path / "sig.sqlite"))
+    articles = [copy(STORY, "AP", "https://ap.example/1"),
+                copy(STORY + " Reporting by staff.", "LA Times", "https://latimes.example/9"),
+                copy(OTHER, "Patch", "https://patch.example/3"),
+                copy(STORY, "AP", "https://ap.example/1")]   # same URL again
+    clusters = index.assign(articles)
+    assert clusters[0] == clusters[1] == clusters[3] != clusters[2]
+    assert len(index) == 2 and index.stats["duplicates"] == 2
+
+
+def test_index_persists_across_runs(tmp_path):
+    path = str(tmp_path / "sig.sqlite")
+    index = SignatureIndex(path)
+    [first] = index.assign([copy(STORY, "AP", "https://ap.example/1")])
+    index.remember({first: {"sor": 3, "resistance": 0}}, "keyword_counts")
+    index.close()
+
+    reopened = SignatureIndex(path)
+    [later] = reopened.assign([copy(STORY, "EdSource", "https://edsource.example/44")])
+    assert later == first
+    assert reopened.features(later, "keyword_counts") == {"sor": 3, "resistance": 0}
+    assert reopened.stats["clusters"] == 0
+
+
+def test_duplicates_are_classified_once_and_counted_once(tmp_path):
+    tracker = SORAdoptionTracker(dedup=SignatureIndex(str(tmp_path / "sig.sqlite")))
+    calls = []
+    distinct_counts = tracker.matcher.distinct_counts
+    tracker.matcher.distinct_counts = lambda text: calls.append(text) or distinct_counts(text)
+
+    syndicated = [copy(STORY, outlet, f"https://{outlet}.example/1") for outlet in ("ap", "kqed", "patch")]
+    plain = SORAdoptionTracker().classify_adoption_stage("Alpha USD", syndicated[:1])
+    result = tracker.classify_adoption_stage("Alpha USD", syndicated)
+    assert result["sor_signal_count"] == plain["sor_signal_count"] > 0
+    assert result["articles_analyzed"] == 3 and result["unique_articles"] == 1
+    assert len(calls) == 1
+
+    # The same wire story in another district's search: served from the index
+    again = tracker.classify_adoption_stage("Beta USD", [copy(STORY, "Daily Breeze", "https://db.example/7")])
+    assert again["sor_signal_count"] == plain["sor_signal_count"] and len(calls) == 1
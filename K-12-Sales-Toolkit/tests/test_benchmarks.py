@@ -0,0 +1,52 @@
+"""
+Smoke tests for the benchmark suite: fixtures are deterministic and
+chunked, results are machine-readable, and regressions are detected.
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from run_benchmarks import compare, main, run
+from synthetic import article_chunks, district_chunks, parse_size, prospect_stream
+
+
+def test_fixtures_are_seeded_and_chunked():
+    chunks = list(district_chunks(250, seed=7, chunk_size=100))
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    assert chunks[2]["district_name"].iloc[-1] == "District 249"
+    again = list(district_chunks(250, seed=7, chunk_size=100))
+    assert all(a.equals(b) for a, b in zip(chunks, again))
+
+    batches = list(article_chunks(95, seed=7, chunk_size=40))
+    assert sum(len(a) for batch in batches for _, a in batch) == 95
+    assert list(prospect_stream(3, seed=1)) == list(prospect_stream(3, seed=1))
+    assert parse_size("1M") == 1_000_000 and parse_size("2_500") == 2500
+
+
+def test_run_produces_comparable_results():
+    doc = run(["scoring", "filter", "email_export_to_csv"], sizes=["200", "200000"],
+              repeat=1, quiet=True)
+    json.dumps(doc)  # machine-readable
+    by_key = {(r["benchmark"], r["size"]): r for r in doc["results"]}
+    assert by_key[("scoring", "200")]["rows_per_sec"] > 0
+    assert by_key[("email_export_to_csv", "200000")]["skipped"]
+
+    slower = json.loads(json.dumps(doc))
+    for r in slower["results"]:
+        if r["rows_per_sec"]:
+            r["rows_per_sec"] /= 2
+    assert compare(doc, doc) == []
+    regressions = compare(slower, doc, tolerance=0.2)
+    assert {r["benchmark"] for r in regressions} == {"scoring", "filter", "email_export_to_csv"}
+
+
+def test_cli_writes_json_and_fails_on_regression(tmp_path):
+    base = tmp_path / "base.json"
+    assert main(["--only", "scoring", "--sizes", "500", "--repeat", "1", "--out", str(base)]) == 0
+    doc = json.loads(base.read_text())
+    doc["results"][0]["rows_per_sec"] *= 1000  # pretend the baseline was far faster
+    base.write_text(json.dumps(doc))
+    assert main(["--only", "scoring", "--sizes", "500", "--repeat", "1",
+                 "--out", str(tmp_path / "new.json"), "--compare", str(base)]) == 1
@@ -0,0 +1,125 @@
+"""
+Tests for the persisted conversion model artifact and batch scoring.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "07_streamlit_demo"))
+
+pytest.importorskip("sklearn")  # training needs scikit-learn
+
+from conversion_model import (ConversionModel, encode_features, label_hash, load_model,
+                              retrain)
+from dashboard_data import load_districts, synthetic_districts
+from district_dataset import write_dataset
+
+
+@pytest.fixture(scope="module")
+def trained():
+    districts = synthetic_districts(600, seed=3)
+    y = (districts["readiness_score"] > 60).astype(int)
+    return districts, y, ConversionModel.fit(districts, y, n_estimators=25)
+
+
+def test_matches_sklearn_pipeline(trained):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    districts, y, model = trained
+    categories = model.manifest["categories"]
+    X = encode_features(districts, categories)
+    scaler = StandardScaler().fit(X)
+    forest = RandomForestClassifier(n_estimators=25, random_state=42).fit(scaler.transform(X), y)
+
+    new = synthetic_districts(3000, seed=11)
+    expected = forest.predict_proba(scaler.transform(encode_features(new, categories)))[:, 1]
+    assert np.array_equal(model.predict_proba(new), expected)
+    assert np.array_equal(model._numpy_proba(model.transform(new)), expected)
+    assert np.allclose(model.feature_importances.to_numpy(), forest.feature_importances_)
+
+
+def test_artifact_roundtrip_is_memory_mapped(trained, tmp_path):
+    districts, _, model = trained
+    path = model.save(str(tmp_path / "model.lpcm"))
+    assert not os.path.exists(path + ".tmp")
+
+    loaded = ConversionModel.load(path)
+    assert isinstance(loaded.arrays["threshold"], np.memmap)
+    assert loaded.manifest["categories"] == model.manifest["categories"]
+    assert np.array_equal(loaded.predict_proba(districts), model.predict_proba(districts))
+    assert np.array_equal(ConversionModel.load(path, mmap=False).predict_proba(districts),
+                          model.predict_proba(districts))
+
+
+def test_unseen_category_and_missing_values_still_score(trained):
+    _, _, model = trained
+    odd = synthetic_districts(3, seed=5)
+    odd["sor_adoption_signal"] = ["Resistant", None, "Committed"]
+    odd.loc[0, "teacher_turnover_rate"] = np.nan
+    proba = model.predict_proba(odd)
+    assert proba.shape == (3,) and ((proba >= 0) & (proba <= 1)).all()
+
+
+def test_rejects_non_artifact(tmp_path):
+    bogus = tmp_path / "model.lpcm"
+    bogus.write_bytes(b"not a model")
+    with pytest.raises(ValueError):
+        ConversionModel.load(str(bogus))
+
+
+def test_retrain_only_when_training_inputs_change(tmp_path):
+    districts = synthetic_districts(300, seed=8)
+    labels = pd.DataFrame({"district_name": districts["district_name"][:200],
+                           "converted": (districts["readiness_score"][:200] > 60).astype(int)})
+    labels_path, model_path = tmp_path / "labels.csv", str(tmp_path / "model.lpcm")
+    labels.to_csv(labels_path, index=False)
+
+    def status(frame=districts, **fit_kwargs):
+        return retrain(str(labels_path), frame, model_path=model_path,
+                       **{"n_estimators": 10, **fit_kwargs})["status"]
+
+    first = retrain(str(labels_path), districts, model_path=model_path, n_estimators=10)
+    assert first["status"] == "trained" and first["matched"] == 200
+    assert status() == "unchanged"
+
+    # Same labels and districts, different order: still unchanged
+    labels.sample(frac=1, random_state=0).to_csv(labels_path, index=False)
+    assert status(districts.sample(frac=1, random_state=1)) == "unchanged"
+
+    # Different hyperparameters, or a labelled district's features changed: refit
+    assert status(n_estimators=12) == "trained"
+    assert status() == "trained" and status() == "unchanged"
+    moved = districts.copy()
+    moved.loc[0, "pct_ela_proficient"] += 10
+    assert status(moved) == "trained" and status() == "trained"
+    # ... but not an unlabelled one
+    unlabelled = districts.copy()
+    unlabelled.loc[299, "pct_ela_proficient"] += 10
+    assert status(unlabelled) == "unchanged"
+
+    # A new conversion arrives
+    labels = pd.concat([labels, pd.DataFrame({"district_name": [districts["district_name"][250]],
+                                              "converted": [1]})])
+    labels.to_csv(labels_path, index=False)
+    second = retrain(str(labels_path), districts, model_path=model_path, n_estimators=10)
+    assert second["status"] == "trained" and second["matched"] == 201
+    assert load_model(model_path).manifest["training_digest"] == second["digest"] != first["digest"]
+    assert load_model(model_path).manifest["labels_digest"] == label_hash(labels)
+
+
+def test_load_districts_adds_model_scores(trained, tmp_path):
+    districts, _, model = trained
+    model_path = model.save(str(tmp_path / "model.lpcm"))
+    dataset = write_dataset(districts.drop(columns=["readiness_score", "tier"]),
+                            str(tmp_path / "districts.arrow"))
+
+    scored = load_districts(dataset, model_path=model_path)
+    # Stored as float32 (frame_schema.DISTRICT_SCHEMA)
+    assert np.array_equal(scored["conversion_probability"].to_numpy(),
+                          model.predict_proba(districts).astype(np.float32))
+    assert "conversion_probability" not in load_districts(dataset, model_path=str(tmp_path / "none"))
@@ -0,0 +1,101 @@
+"""
+Tests for the Streamlit dashboard data helpers (no Streamlit needed).
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "07_streamlit_demo"))
+
+from dashboard_data import (csv_chunks, filter_districts, filter_state, load_districts, n_pages,
+                            page_of, scatter_sample, synthetic_districts, with_ranking_updates)
+from frame_schema import DISTRICT_SCHEMA, validate
+from ranking_index import RankingIndex
+
+
+@pytest.fixture(scope="module")
+def districts():
+    return synthetic_districts(5_000, seed=3)
+
+
+def test_sample_data_is_the_apps_150_districts():
+    df = synthetic_districts()
+    assert len(df) == 150 and df["district_name"].iloc[-1] == "District 149"
+    assert {"readiness_score", "tier"} <= set(df.columns)
+
+
+def test_filter_matches_boolean_indexing(districts):
+    got = filter_districts(districts, ["Fresno", "Kern"], 40, ["Committed"])
+    expected = districts[districts["county"].isin(["Fresno", "Kern"])
+                         & (districts["readiness_score"] >= 40)
+                         & (districts["sor_adoption_signal"] == "Committed")]
+    assert sorted(got.index) == sorted(expected.index)
+    assert got["readiness_score"].is_monotonic_decreasing
+    assert len(filter_districts(districts, [], 0, [])) == len(districts)
+
+
+@pytest.mark.parametrize("sort_by,ascending", [("readiness_score", False),
+                                               ("enrollment_k8", True),
+                                               ("district_name", False)])
+def test_page_of_matches_full_sort(districts, sort_by, ascending):
+    full = districts.sort_values(sort_by, ascending=ascending, kind="stable")
+    for page in (0, 3, 99):
+        got = page_of(districts, page, 50, sort_by, ascending)
+        assert got[sort_by].tolist() == full[sort_by].iloc[page * 50:(page + 1) * 50].tolist()
+    # Past the end clamps to the last page
+    assert len(page_of(districts, 10_000, 300, sort_by, ascending)) == 5_000 % 300
+    assert n_pages(5_000, 300) == 17 and n_pages(0, 30) == 1
+
+
+def test_page_of_puts_nan_last():
+    df = pd.DataFrame({"readiness_score": [50.0, np.nan, 90.0, 70.0]})
+    assert page_of(df, 0, 3)["readiness_score"].tolist() == [90.0, 70.0, 50.0]
+    assert np.isnan(page_of(df, 1, 3)["readiness_score"].iloc[0])
+
+
+def test_scatter_sample_keeps_tier1_and_caps_points(districts):
+    sample = scatter_sample(districts, max_points=1_000)
+    assert len(sample) == 1_000
+    n_t1 = (districts["tier"] == "Tier 1").sum()
+    assert (sample["tier"] == "Tier 1").sum() == min(n_t1, 1_000)
+    assert scatter_sample(districts, max_points=10_000) is districts
+
+
+def test_csv_chunks_equal_one_shot_csv(districts):
+    cols = ["district_name", "county", "readiness_score", "tier"]
+    streamed = b"".join(csv_chunks(districts, cols, chunk_rows=777))
+    assert streamed == districts[cols].to_csv(index=False).encode("utf-8")
+    assert b"".join(csv_chunks(districts.iloc[:0], cols)) == b"district_name,county,readiness_score,tier\n"
+
+
+def test_filter_state_is_order_insensitive():
+    assert filter_state(["Kern", "Fresno"], 50, ["Committed"]) == filter_state(["Fresno", "Kern"], 50.0, ["Committed"])
+    assert filter_state(None, 0, None) == ((), 0.0, ())
+
+
+def test_ranking_updates_feed_filters_and_sort(tmp_path):
+    base = load_districts(str(tmp_path / "missing.arrow"), model_path=str(tmp_path / "none"))
+    ranking = RankingIndex.from_districts(base)
+    assert with_ranking_updates(base, ranking.changed_rows()) is base
+
+    top = base.loc[base["readiness_score"].idxmax(), "cds_code"]
+    low = base.loc[base["readiness_score"].idxmin(), "cds_code"]
+    ranking.update(top, sor_adoption_signal="None", pct_ela_proficient=95.0)
+    ranking.update(low, sor_adoption_signal="Implementing", pct_ela_proficient=5.0,
+                   pd_budget_per_student_est=500.0)
+    ranking.remove(base["cds_code"].iloc[0])
+    merged = with_ranking_updates(base, ranking.changed_rows())
+
+    assert len(merged) == len(base) - 1 and validate(merged, DISTRICT_SCHEMA) == []
+    for code in merged["cds_code"]:
+        row = merged[merged["cds_code"] == code].iloc[0]
+        assert (row["readiness_score"], row["tier"]) == (ranking.score_of(code), ranking.tier_of(code))
+    assert merged.loc[merged["cds_code"] == low, "sor_adoption_signal"].item() == "Implementing"
+    # One set of scores: the sorted filter agrees with the index's ranks
+    shown = filter_districts(merged, [], ranking.score_of(low), [])
+    assert low in shown["cds_code"].tolist() and top not in shown["cds_code"].tolist()
+    assert ranking.ranks(shown["cds_code"].tolist()).tolist() == sorted(ranking.ranks(shown["cds_code"].tolist()))
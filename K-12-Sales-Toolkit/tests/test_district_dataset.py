@@ -0,0 +1,81 @@
+"""
+Tests for the columnar (Arrow / Parquet) district dataset loader.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "07_streamlit_demo"))
+
+from dashboard_data import load_districts, synthetic_districts
+from district_dataset import (APP_COLUMNS, convert_csv, dataset_columns, read_dataset,
+                              read_table, write_dataset)
+from district_geo import GEO_COLUMNS
+from district_scoring import score_districts
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return synthetic_districts(2_000, seed=5, score=False)
+
+
+@pytest.mark.parametrize("ext", [".arrow", ".parquet"])
+def test_round_trip_with_projection(sample, tmp_path, ext):
+    path = write_dataset(sample, str(tmp_path / f"districts{ext}"))
+    assert dataset_columns(path) == list(sample.columns)
+    cols = ["miles_from_la", "district_name", "county"]
+    df = read_dataset(path, cols)
+    assert list(df.columns) == cols
+    pd.testing.assert_series_equal(df["miles_from_la"], sample["miles_from_la"])
+    assert df["district_name"].tolist() == sample["district_name"].tolist()
+    # Low-cardinality strings come back as Categoricals
+    assert isinstance(df["county"].dtype, pd.CategoricalDtype)
+    assert df["county"].astype(str).tolist() == sample["county"].tolist()
+
+
+def test_arrow_reads_are_memory_mapped_zero_copy(sample, tmp_path):
+    path = write_dataset(sample, str(tmp_path / "districts.arrow"))
+    col = read_table(path, ["pct_ela_proficient"]).column(0)
+    assert col.num_chunks == 1
+    col.chunk(0).to_numpy(zero_copy_only=True)  # raises if a copy were needed
+
+
+def test_missing_columns_and_formats_rejected(sample, tmp_path):
+    path = write_dataset(sample, str(tmp_path / "districts.arrow"))
+    with pytest.raises(KeyError, match="no_such_col"):
+        read_dataset(path, ["district_name", "no_such_col"])
+    with pytest.raises(ValueError):
+        write_dataset(sample, str(tmp_path / "districts.xlsx"))
+
+
+def test_convert_csv_in_chunks(sample, tmp_path):
+    csv = tmp_path / "ca_districts.csv"
+    sample.to_csv(csv, index=False)
+    out = convert_csv(str(csv), str(tmp_path / "ca_districts.arrow"), chunksize=700)
+    df = read_dataset(out, ["district_name", "sor_adoption_signal", "enrollment_k8"])
+    assert len(df) == 2_000
+    assert df["sor_adoption_signal"].astype(str).tolist() == sample["sor_adoption_signal"].tolist()
+    assert df["enrollment_k8"].tolist() == sample["enrollment_k8"].tolist()
+
+
+def test_load_districts_projects_and_scores(sample, tmp_path):
+    path = write_dataset(sample, str(tmp_path / "districts.arrow"))
+    df = load_districts(path)
+    # District codes and coordinates come along whenever the dataset has them
+    optional = {"cds_code"} | set(GEO_COLUMNS)
+    assert set(df.columns) == set(APP_COLUMNS) | optional | {"readiness_score", "tier"}
+    assert set(load_districts(write_dataset(sample.drop(columns=list(optional)),
+                                            str(tmp_path / "no_geo.arrow"))).columns) == \
+        set(APP_COLUMNS) | {"readiness_score", "tier"}
+    expected = synthetic_districts(2_000, seed=5)
+    # Scored from the stored float32 inputs: at most one rounding step from the float64 score
+    np.testing.assert_allclose(df["readiness_score"], expected["readiness_score"], atol=0.0100001)
+    pd.testing.assert_series_equal(df["readiness_score"], score_districts(df)["readiness_score"])
+    # No dataset yet: fall back to the app's built-in sample
+    assert len(load_districts(str(tmp_path / "missing.arrow"))) == 150
@@ -0,0 +1,88 @@
+"""
+Tests for district coordinates, spatial queries and rep territories.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "07_streamlit_demo"))
+
+from dashboard_data import COUNTY_CENTROIDS, synthetic_districts
+from district_geo import (HOME_BASES, LA_HOME, DistrictSpatialIndex, assign_territories,
+                          haversine_miles, score_from_home, territory_summary)
+from district_scoring import score_districts
+
+
+@pytest.fixture(scope="module")
+def districts():
+    return synthetic_districts(3000, seed=5)
+
+
+def test_haversine_known_distance_and_broadcasting():
+    la, sf = HOME_BASES["Los Angeles"], HOME_BASES["San Francisco"]
+    assert haversine_miles(*la, *sf) == pytest.approx(347.4, abs=1.0)
+    lat = np.array([la[0], sf[0]])
+    lon = np.array([la[1], sf[1]])
+    matrix = haversine_miles(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    assert matrix.shape == (2, 2) and np.allclose(np.diag(matrix), 0) and np.allclose(matrix, matrix.T)
+
+
+def test_synthetic_coordinates_match_miles_from_la(districts):
+    miles = haversine_miles(districts["latitude"], districts["longitude"], *LA_HOME)
+    assert np.allclose(miles, districts["miles_from_la"], atol=1e-6)
+
+
+def test_synthetic_coordinates_lie_in_their_county(districts):
+    centroids = np.array([COUNTY_CENTROIDS[c] for c in districts["county"]])
+    off = haversine_miles(districts["latitude"], districts["longitude"], centroids[:, 0], centroids[:, 1])
+    assert np.median(off) < 20 and off.max() < 80
+    by_county = districts.groupby("county", observed=True)["miles_from_la"].median()
+    assert by_county["Los Angeles"] < by_county["Fresno"] < by_county["Sacramento"]
+
+
+def test_within_and_nearest_match_brute_force(districts):
+    geo = DistrictSpatialIndex(districts)
+    home = HOME_BASES["Fresno"]
+    miles = haversine_miles(districts["latitude"], districts["longitude"], *home)
+
+    near = geo.within(*home, miles=75)
+    assert set(near["district_name"]) == set(districts["district_name"][miles <= 75])
+    assert near["miles_from_home"].is_monotonic_increasing
+
+    t1 = (districts["tier"] == "Tier 1").to_numpy()
+    expected = districts["district_name"][t1].to_numpy()[np.argsort(miles[t1])[:7]]
+    nearest = geo.nearest(*home, k=7, tier="Tier 1")
+    assert nearest["district_name"].tolist() == expected.tolist()
+    assert len(geo.nearest(*home, k=len(districts) + 5)) == len(districts)
+
+
+def test_brute_force_fallback_matches_tree(districts):
+    geo = DistrictSpatialIndex(districts)
+    flat = DistrictSpatialIndex(districts)
+    flat._tree = None
+    home = HOME_BASES["Sacramento"]
+    assert set(flat.within(*home, 120)["district_name"]) == set(geo.within(*home, 120)["district_name"])
+    assert flat.nearest(*home, 15)["district_name"].tolist() == geo.nearest(*home, 15)["district_name"].tolist()
+
+
+def test_score_from_la_matches_precomputed_column(districts):
+    rescored = score_from_home(districts, *LA_HOME)
+    assert np.allclose(rescored["readiness_score"], score_districts(districts)["readiness_score"], atol=0.011)
+
+
+def test_territories_assign_nearest_rep_and_rescore(districts):
+    reps = {"south": HOME_BASES["San Diego"], "north": HOME_BASES["Sacramento"]}
+    split = assign_territories(districts, reps)
+    d_south = haversine_miles(districts["latitude"], districts["longitude"], *reps["south"])
+    d_north = haversine_miles(districts["latitude"], districts["longitude"], *reps["north"])
+    assert ((split["rep"] == "south").to_numpy() == (d_south <= d_north)).all()
+    assert np.allclose(split["miles_from_home"], np.minimum(d_south, d_north), atol=0.05)
+
+    summary = territory_summary(split)
+    assert summary["districts"].sum() == len(districts)
+    assert (summary[["Tier 1", "Tier 2", "Tier 3"]].sum(axis=1) == summary["districts"]).all()
+    with pytest.raises(ValueError):
+        assign_territories(districts, {})
@@ -0,0 +1,109 @@
+"""
+Tests for resolving free-text district mentions to CDE codes.
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from district_resolver import DistrictResolver, normalize_mention, resolve_column
+
+DISTRICTS = {
+    "1964733": "Los Angeles Unified School District",
+    "1964881": "Pasadena Unified School District",
+    "1964907": "Pomona Unified School District",
+    "3768338": "San Diego Unified School District",
+    "4369427": "Fremont Union High School District",
+    "0161176": "Fremont Unified School District",
+}
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return DistrictResolver(DISTRICTS, aliases=[("1964733", "L.A. Unified"),
+                                                ("3768338", "San Diego City Schools")])
+
+
+def test_normalize_mention():
+    assert normalize_mention("Los Angeles Unified School District") == normalize_mention("Los Angeles USD")
+    assert normalize_mention("L.A. Unified") == normalize_mention("los angeles unified")
+    assert normalize_mention("LAUSD - K-8 Literacy Pilot (2026)") == "lausd"
+    assert normalize_mention(None) == "" and normalize_mention("  ") == ""
+
+
+def test_exact_and_alias_mentions(resolver):
+    mentions = ["Los Angeles Unified School District", "LAUSD", "L.A. Unified", "Los Angeles USD",
+                "LAUSD: renewal", "San Diego City Schools", "SDUSD", "Fremont Union High"]
+    out = resolver.resolve_batch(mentions)
+    assert out["cds_code"].tolist() == ["1964733"] * 5 + ["3768338"] * 2 + ["4369427"]
+    assert (out["method"] == "exact").all() and (out["match_score"] == 1.0).all()
+
+
+def test_ambiguous_aliases_are_not_guessed(resolver):
+    # "PUSD" could be Pasadena or Pomona; "Fremont" is two districts
+    out = resolver.resolve_batch(["PUSD", "Fremont"], fuzzy=False)
+    assert out["cds_code"].isna().all()
+
+
+def test_fuzzy_matches_typos_and_rejects_noise(resolver):
+    pytest.importorskip("scipy")
+    out = resolver.resolve_batch(["Pasadena Unifed", "Los Angelos Unified", "San Deigo USD",
+                                  "Chicago Public Schools", "", None])
+    assert out["cds_code"].tolist()[:3] == ["1964881", "1964733", "3768338"]
+    assert (out["method"][:3] == "fuzzy").all() and (out["match_score"][:3] >= 0.6).all()
+    assert out["cds_code"][3:].isna().all()
+    assert resolver.resolve("Pomona Unifid School Dist")["district_name"] == DISTRICTS["1964907"]
+    assert resolver.resolve("Chicago Public Schools") is None
+
+
+def test_batch_keeps_index_and_order(resolver):
+    pytest.importorskip("scipy")
+    mentions = pd.Series(["LAUSD", "Pasadena Unifed", "LAUSD", None] * 250,
+                         index=range(1000, 2000))
+    out = resolver.resolve_batch(mentions)
+    assert out.index.equals(mentions.index)
+    assert out["cds_code"].iloc[:3].tolist() == ["1964733", "1964881", "1964733"]
+
+    deals = pd.DataFrame({"deal_name": ["LAUSD - Pilot", "Pasadena USD (renewal)", "Acme Corp"]})
+    linked = resolve_column(deals, "deal_name", resolver)
+    assert linked["cds_code"].tolist()[:2] == ["1964733", "1964881"]
+    assert pd.isna(linked["cds_code"][2]) and list(deals.columns) == ["deal_name"]
+
+
+def test_from_districts_reads_alias_csv(tmp_path):
+    districts = pd.DataFrame({"district_name": ["Alpha Valley Elementary School District"],
+                              "cds_code": ["1900001"]})
+    alias_path = tmp_path / "aliases.csv"
+    pd.DataFrame({"cds_code": ["1900001"], "alias": ["Alpha Valley Schools"]}).to_csv(alias_path, index=False)
+    resolver = DistrictResolver.from_districts(districts, alias_path=str(alias_path))
+    assert resolver.resolve("Alpha Valley Schools")["cds_code"] == "1900001"
+    assert resolver.resolve("AVESD")["cds_code"] == "1900001"
+    assert resolver.resolve("LAUSD")["cds_code"] == "1964733"  # KNOWN_DISTRICTS are always included
+
+
+def test_from_districts_without_codes_keys_on_names():
+    districts = pd.DataFrame({"district_name": ["Alpha Valley Elementary School District",
+                                                "Los Angeles Unified School District"]})
+    resolver = DistrictResolver.from_districts(districts, alias_path=None)
+    assert resolver.resolve("AVESD")["cds_code"] == "Alpha Valley Elementary School District"
+    assert resolver.resolve("LAUSD")["cds_code"] == "1964733"   # not made ambiguous by its name entry
+
+
+def test_place_names_alone_do_not_resolve():
+    pytest.importorskip("scipy")
+    resolver = DistrictResolver.from_districts(pd.DataFrame({"district_name": [], "cds_code": []}),
+                                               alias_path=None)
+    # Newspapers, colleges and county offices share a district's place name, not the district
+    noise = ["LA Times", "Los Angeles Times", "Compton College", "San Diego County", "Fresno County",
+             "Fresno County Office of Education", "Los Angeles County Office of Education",
+             "San Diego State University", "Fresno City College"]
+    out = resolver.resolve_batch(noise)
+    assert out["cds_code"].isna().all(), out[out["cds_code"].notna()]
+    # Misspellings of the district itself still resolve
+    out = resolver.resolve_batch(["Compton Unifed", "Fresno Unifid School Dist", "Los Angelos Unified",
+                                  "San Deigo USD"])
+    assert out["cds_code"].tolist() == ["1973437", "1062166", "1964733", "3768338"]
+    assert (out["method"] == "fuzzy").all()
@@ -0,0 +1,127 @@
+"""
+Tests for incremental board-minutes / CDE document ingestion (offline, local directory).
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from article_dedup import SignatureIndex
+from document_ingest import STATEWIDE, DocumentIngestor, iter_passages, iter_text
+from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+MINUTES = """<html><head><title>Board</title><style>p {color: red}</style></head><body>
+<h1>Regular Board Meeting</h1>
+<p>Item 7: The board approved adoption of a structured literacy curriculum with
+phonics instruction and decodable readers for grades K-2.</p>
+<script>var phonics = "not text";</script>
+<p>Item 8: Phonemic awareness screening under AB 2222 begins in spring.</p>
+</body></html>"""
+
+
+class CountingTracker(SORAdoptionTracker):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    def classify_batch(self, district_articles):
+        self.batches.append({d: len(a) for d, a in district_articles})
+        return super().classify_batch(district_articles)
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def docs(tmp_path):
+    root = tmp_path / "documents"
+    write(root / "Pasadena Unified School District" / "2026-09-12_minutes.html", MINUTES)
+    write(root / "Compton Unified School District" / "agenda.txt", "Budget and bus routes. " * 200)
+    write(root / "cde_literacy_framework.txt", "Statewide guidance on phonics instruction.")
+    write(root / "notes.docx", "unsupported")
+    return root
+
+
+def make_ingestor(tmp_path, root, workers=1, **kwargs):
+    tracker = CountingTracker(dedup=kwargs.pop("dedup", None))
+    return DocumentIngestor(tracker, root=str(root), state_path=str(tmp_path / "state.sqlite"),
+                            workers=workers, **kwargs), tracker
+
+
+def test_html_is_streamed_as_visible_text(docs):
+    text = "".join(iter_text(str(docs / "Pasadena Unified School District" / "2026-09-12_minutes.html")))
+    assert "structured literacy" in text and "AB 2222" in text
+    assert "not text" not in text and "color: red" not in text
+    passages = list(iter_passages(["word " * 1000], size=300))
+    assert all(len(p) <= 300 for p in passages) and " ".join(passages) == ("word " * 1000).strip()
+
+
+def test_first_run_classifies_each_district(tmp_path, docs):
+    ingestor, tracker = make_ingestor(tmp_path, docs)
+    summary = ingestor.run()
+    assert summary["scanned"] == 3 and summary["ingested"] == 3 and not summary["errors"]
+    results = summary["results"].set_index("district")
+    assert results.loc["Pasadena Unified School District", "stage"] == "Implementing"
+    assert results.loc["Compton Unified School District", "stage"] == "Exploring"
+    assert STATEWIDE in results.index
+    assert len(tracker.batches) == 1   # every district in one classifier call
+    assert len(ingestor.documents()) == 3
+
+
+def test_only_new_or_changed_text_is_reclassified(tmp_path, docs):
+    ingestor, tracker = make_ingestor(tmp_path, docs)
+    ingestor.run()
+    tracker.batches.clear()
+
+    again = ingestor.run()
+    assert again["skipped"] == 3 and again["ingested"] == 0 and tracker.batches == []
+
+    compton = docs / "Compton Unified School District" / "agenda.txt"
+    compton.write_text(compton.read_text())   # same bytes, new mtime
+    os.utime(compton, ns=(1, 1))
+    write(docs / "Compton Unified School District" / "minutes.txt", "Board adopts the science of reading.")
+    summary = ingestor.run()
+    assert summary["unchanged"] == 1 and summary["ingested"] == 1
+    assert tracker.batches == [{"Compton Unified School District": 1}]
+    assert ingestor.run()["skipped"] == 4
+
+
+def test_rewritten_document_is_reclassified_through_dedup(tmp_path, docs):
+    ingestor, _ = make_ingestor(tmp_path, docs, dedup=SignatureIndex(":memory:"))
+    compton = "Compton Unified School District"
+    assert ingestor.run()["results"].set_index("district").loc[compton, "stage"] == "Exploring"
+
+    write(docs / compton / "agenda.txt", "The board adopted structured literacy, phonics instruction, "
+          "decodable texts, LETRS training and the science of reading. " * 20)
+    result = ingestor.run()["results"].set_index("district").loc[compton]
+    assert result["stage"] == "Implementing" and result["sor_signal_count"] >= 3
+
+
+def test_large_runs_are_classified_in_district_batches(tmp_path, docs):
+    ingestor, tracker = make_ingestor(tmp_path, docs, batch_passages=1)
+    summary = ingestor.run()
+    assert summary["batches"] == 3 and len(summary["results"]) == 3
+    assert [set(b) for b in tracker.batches] == [{STATEWIDE}, {"Compton Unified School District"},
+                                                {"Pasadena Unified School District"}]
+    assert len(ingestor.documents()) == 3
+
+
+def test_process_pool_matches_in_process(tmp_path, docs):
+    serial, _ = make_ingestor(tmp_path / "a", docs)
+    pooled, _ = make_ingestor(tmp_path / "b", docs, workers=2)
+    cols = ["district", "stage", "sor_signal_count", "documents"]
+    expected = serial.run()["results"][cols].sort_values("district").reset_index(drop=True)
+    actual = pooled.run()["results"][cols].sort_values("district").reset_index(drop=True)
+    assert actual.equals(expected)
+
+
+def test_unreadable_document_is_reported_and_retried(tmp_path, docs):
+    (docs / "Compton Unified School District" / "broken.pdf").write_bytes(b"not a pdf")
+    ingestor, _ = make_ingestor(tmp_path, docs)
+    summary = ingestor.run()
+    assert list(summary["errors"]) == [os.path.join("Compton Unified School District", "broken.pdf")]
+    assert ingestor.run()["errors"]   # not recorded as ingested
@@ -0,0 +1,241 @@
+"""
+Tests for K8EmailGenerator batch generation, against a local mock
+OpenAI-compatible completion server.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "03_outreach_automation"))
+
+from personalized_email_generator import VARIANTS, K8EmailGenerator
+
+
+class MockCompletions(BaseHTTPRequestHandler):
+    """
+    POST /v1/chat/completions  -> 50 ms latency, echoes the district back
+    Prompts mentioning "Flaky" get a 429 on their first attempt;
+    prompts mentioning "Broken" always get a 503.
+    """
+    seen = {}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][0]["content"]
+        with self.lock:
+            n = self.seen[prompt] = self.seen.get(prompt, 0) + 1
+        if "Broken" in prompt or ("Flaky" in prompt and n == 1):
+            return self._send(503 if "Broken" in prompt else 429, {"error": "try later"})
+        time.sleep(0.05)
+        district = prompt.split("- District: ")[1].split("\n")[0]
+        self._send(200, {"choices": [{"message": {"content": f"LLM email for {district}"}}]})
+
+    def _send(self, code, body):
+        payload = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def mock_base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockCompletions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+@pytest.fixture
+def llm_generator(mock_base_url, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    gen = K8EmailGenerator(base_url=mock_base_url, max_retries=2, timeout=5)
+    monkeypatch.setattr(gen, "_backoff", lambda attempt, retry_after=None: 0.01)
+    return gen
+
+
+def _prospects(n, prefix="District"):
+    return [{"name": f"Dr. {i}", "district": f"{prefix} {i:03d}", "ela_proficiency_pct": 40}
+            for i in range(n)]
+
+
+def test_template_fallback_without_api_key(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    gen = K8EmailGenerator()
+    results = gen.batch_generate(_prospects(3))
+    assert [r["district"] for r in results] == ["District 000", "District 001", "District 002"]
+    assert all(set(r["variant_sources"].values()) == {"template"} for r in results)
+
+
+def test_batch_is_concurrent_and_ordered(llm_generator):
+    prospects = _prospects(20)
+    start = time.perf_counter()
+    results = llm_generator.batch_generate(prospects, concurrency=16)
+    elapsed = time.perf_counter() - start
+    # 60 calls x 50 ms sequentially = 3 s
+    assert elapsed < 1.5
+    assert [r["district"] for r in results] == [p["district"] for p in prospects]
+    assert all(list(r["variants"]) == VARIANTS for r in results)
+    assert results[5]["variants"]["peer_story"] == "LLM email for District 005"
+
+
+def test_stream_yields_as_prospects_complete(llm_generator):
+    stream = llm_generator.iter_batch_generate(_prospects(6), concurrency=3)
+    first = next(stream)
+    assert set(first["variant_sources"].values()) == {"llm"}
+    assert len(list(stream)) == 5
+
+
+def test_retries_429_then_uses_llm(llm_generator):
+    result = llm_generator.batch_generate(_prospects(1, prefix="Flaky"), concurrency=3)[0]
+    assert set(result["variant_sources"].values()) == {"llm"}
+
+
+def test_persistent_5xx_falls_back_to_template(llm_generator):
+    result = llm_generator.batch_generate(_prospects(1, prefix="Broken"), concurrency=3)[0]
+    assert set(result["variant_sources"].values()) == {"template"}
+    assert "Broken 000" in result["variants"]["subject_first"]
+
+
+# ============================================================
+# Test: Content-addressed generation cache
+# ============================================================
+
+@pytest.fixture
+def cached_generator(llm_generator, tmp_path):
+    from generation_cache import GenerationCache
+
+    llm_generator.cache = GenerationCache(str(tmp_path / "gen.sqlite"))
+    yield llm_generator
+    llm_generator.cache.close()
+
+
+def _calls():
+    return sum(MockCompletions.seen.values())
+
+
+def test_unchanged_campaign_rerun_is_all_cache_hits(cached_generator):
+    prospects = _prospects(5, prefix="Cached")
+    cached_generator.batch_generate(prospects)
+    calls = _calls()
+    rerun = cached_generator.batch_generate(prospects)
+    assert _calls() == calls
+    assert all(set(r["variant_sources"].values()) == {"cache"} for r in rerun)
+    assert cached_generator.cache.hit_rate() == 0.5  # 15 misses, then 15 hits
+
+
+def test_cache_key_ignores_non_prompt_fields_but_not_prompt_fields(cached_generator):
+    base = {"name": "Dr. Key", "district": "Keyed USD", "ela_proficiency_pct": 40}
+    cached_generator.generate(base)
+    same = cached_generator.generate({**base, "hubspot_id": "123", "name": "  Dr.  Key "})
+    assert set(same["variant_sources"].values()) == {"cache"}
+    changed = cached_generator.generate({**base, "pain_point": "coach turnover"})
+    assert set(changed["variant_sources"].values()) == {"llm"}
+
+
+def test_lp_context_and_model_changes_invalidate(cached_generator):
+    prospect = {"name": "Dr. Inv", "district": "Invalidation USD"}
+    cached_generator.generate(prospect)
+    cached_generator.LP_CONTEXT = "Literacy Partners — updated positioning."
+    assert set(cached_generator.generate(prospect)["variant_sources"].values()) == {"llm"}
+    cached_generator.temperature = 0.2
+    assert set(cached_generator.generate(prospect)["variant_sources"].values()) == {"llm"}
+
+
+def test_lru_eviction_keeps_recent_entries(tmp_path):
+    from generation_cache import GenerationCache
+
+    cache = GenerationCache(str(tmp_path / "lru.sqlite"), max_entries=10)
+    for i in range(10):
+        cache.put(f"k{i}", "subject_first", f"email {i}")
+    cache.get("k0")  # most recently used now
+    cache.put("k10", "subject_first", "email 10")
+    assert len(cache) <= 10
+    assert cache.get("k0") == "email 0" and cache.get("k10") == "email 10"
+    assert cache.get("k1") is None
+    cache.close()
+
+
+# ============================================================
+# Test: Streaming export
+# ============================================================
+
+def test_export_stream_csv_gz_and_jsonl(llm_generator, tmp_path):
+    import csv
+    import gzip
+
+    path = tmp_path / "hubspot.csv.gz"
+    assert llm_generator.export_stream(_prospects(4, prefix="Export"), str(path), concurrency=4) == 12
+    with gzip.open(path, "rt", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert {r["district"] for r in rows} == {f"Export {i:03d}" for i in range(4)}
+    assert {r["variant_source"] for r in rows} == {"llm"}
+    assert not os.path.exists(str(path) + ".tmp")
+
+    jsonl = tmp_path / "hubspot.jsonl"
+    df = llm_generator.export_to_csv(str(jsonl))
+    assert len(df) == 12 and set(df["variant_source"]) == {"llm"}
+    lines = jsonl.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == df.to_dict("records")
+
+
+def test_history_is_bounded(monkeypatch, tmp_path):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    gen = K8EmailGenerator(history_size=5)
+    gen.batch_generate(_prospects(12))
+    assert [r["district"] for r in gen.generated_emails] == [f"District {i:03d}" for i in range(7, 12)]
+    with pytest.warns(RuntimeWarning, match="dropped 7 earlier"):
+        assert len(gen.export_to_csv(str(tmp_path / "recent.csv"))) == 15
+
+
+def test_export_to_csv_keeps_whole_campaign_and_any_name(monkeypatch, tmp_path):
+    import csv
+    import warnings
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    gen = K8EmailGenerator()
+    gen.batch_generate(_prospects(1500))
+    path = tmp_path / "emails.txt"
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        df = gen.export_to_csv(str(path))
+    assert len(df) == 4500 and df["district"].iloc[0] == "District 000"
+    with open(path, newline="") as f:
+        assert len(list(csv.DictReader(f))) == 4500
+
+
+def test_stream_export_memory_is_flat(monkeypatch, tmp_path):
+    import tracemalloc
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    gen = K8EmailGenerator(history_size=0)
+
+    def peak(n):
+        prospects = ({"name": f"Dr. {i}", "district": f"District {i}"} for i in range(n))
+        tracemalloc.start()
+        gen.export_stream(prospects, str(tmp_path / f"out_{n}.jsonl"))
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak_bytes
+
+    peak(5000)  # warm-up: one-time allocations (encoders, caches)
+    small, large = peak(200), peak(5000)
+    assert large < small * 2
+    assert large < 2 * 1024 * 1024
+
+
+def test_unknown_export_format_rejected(tmp_path):
+    from email_export import write_export
+
+    with pytest.raises(ValueError):
+        write_export([], str(tmp_path / "emails.xlsx"))
@@ -0,0 +1,70 @@
+"""
+Tests for the shared compiled email template registry.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "03_outreach_automation"))
+
+from email_templates import TEMPLATES, CompiledTemplate, TemplateRegistry
+from personalized_email_generator import K8EmailGenerator
+
+PROSPECT = {"name": "Dr. Rivera", "district": "Compton USD", "ela_proficiency_pct": 31,
+            "pain_point": "coach turnover"}
+
+
+def test_render_fills_fields_and_defaults():
+    email = TEMPLATES.render("problem_focused", PROSPECT)
+    assert "Hi Dr. Rivera," in email and "With 31% ELA proficiency" in email
+    blank = TEMPLATES.render("peer_story", {"name": "Dr. X", "pain_point": "  "})
+    assert "[District]" in blank and "solved teacher retention" in blank
+
+
+def test_unknown_variant_falls_back_to_subject_first():
+    assert TEMPLATES.render("nope", PROSPECT) == TEMPLATES.render("subject_first", PROSPECT)
+
+
+def test_markdown_style_for_streamlit():
+    md = TEMPLATES.render("subject_first", PROSPECT, markdown=True)
+    assert md.startswith("**Subject:** SOR Implementation Support for Compton USD")
+    assert "\n*P.S. — I'm a former K-8 teacher." in md
+
+
+def test_generator_uses_registry(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    result = K8EmailGenerator().generate(PROSPECT)
+    assert result["variants"] == TEMPLATES.render_all(PROSPECT)
+
+
+def test_render_frame_matches_per_prospect_render():
+    df = pd.DataFrame({"name": ["Dr. A", "Dr. B", None],
+                       "district": ["A USD", "B USD", "C USD"],
+                       "ela_proficiency_pct": [38.0, np.nan, 52.0]})
+    for variant in TEMPLATES.variants:
+        bulk = TEMPLATES.render_frame(df, variant)
+        one_by_one = TEMPLATES.render_batch(df.to_dict("records"), variant)
+        assert bulk.tolist() == one_by_one
+    assert "With 38% ELA" in TEMPLATES.render_frame(df, "problem_focused").iloc[0]
+
+
+def test_percent_signs_in_literals_survive():
+    registry = TemplateRegistry({"v": "{name}: 40% more, 100%% sure"}, default_variant="v")
+    assert registry.render("v", {"name": "A"}) == "A: 40% more, 100%% sure"
+    with pytest.raises(ValueError):
+        CompiledTemplate("{name:>10}")
+
+
+@pytest.mark.timing
+def test_bulk_rendering_throughput():
+    n = 100_000
+    df = pd.DataFrame({"name": [f"Dr. {i}" for i in range(n)],
+                       "district": [f"District {i}" for i in range(n)],
+                       "pain_point": ["coach turnover"] * n})
+    start = time.perf_counter()
+    TEMPLATES.render_frame(df, "peer_story")
+    assert n / (time.perf_counter() - start) > 100_000
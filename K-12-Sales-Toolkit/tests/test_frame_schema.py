@@ -0,0 +1,93 @@
+"""
+Tests for the declared district / deal dtypes and their validation.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "04_sales_cycle_tools"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "07_streamlit_demo"))
+
+from dashboard_data import filter_districts, load_districts, synthetic_districts
+from frame_schema import (DEAL_SCHEMA, DISTRICT_SCHEMA, SchemaError, apply_schema,
+                          bytes_per_row, validate)
+from district_scoring import score_districts
+from pipeline_health import pipeline_health, synthetic_deals
+from ranking_index import RankingIndex
+
+
+@pytest.fixture(scope="module")
+def loose():
+    """The sample districts with object-string columns, as CSV-era frames had them."""
+    df = synthetic_districts(5_000, seed=11)
+    return df.astype({"county": object, "sor_adoption_signal": object, "tier": object})
+
+
+def test_districts_are_stored_compactly(loose):
+    compact = apply_schema(loose, DISTRICT_SCHEMA)
+    assert compact["county"].dtype == "category" and compact["sor_adoption_signal"].dtype == "category"
+    assert compact["pct_ela_proficient"].dtype == np.float32
+    assert compact["enrollment_k8"].dtype == np.int32
+    assert compact["recent_literacy_initiative"].dtype == bool
+    # Identifiers (district_name, cds_code) are untouched; everything declared shrinks
+    declared = [c for c in loose.columns if c in DISTRICT_SCHEMA]
+    assert bytes_per_row(loose[declared]) > 2.5 * bytes_per_row(compact[declared])
+    assert bytes_per_row(compact) < bytes_per_row(loose)
+    assert compact["district_name"].equals(loose["district_name"])
+    np.testing.assert_allclose(compact["miles_from_la"], loose["miles_from_la"], rtol=1e-6)
+    assert apply_schema(compact, DISTRICT_SCHEMA) is compact   # already compact: no copy
+
+
+def test_filters_agree_on_compact_frames(loose):
+    compact = apply_schema(loose, DISTRICT_SCHEMA)
+    args = (["Fresno", "Kern"], 40, ["Committed", "Implementing"])
+    expected = filter_districts(loose, *args)
+    got = filter_districts(compact, *args)
+    assert got["district_name"].tolist() == expected["district_name"].tolist()
+
+
+def test_validation_reports_every_bad_column(loose):
+    bad = loose.head(100).copy()
+    bad.loc[:2, "sor_adoption_signal"] = "Adopted"
+    bad.loc[:4, "pct_ela_proficient"] = 130.0
+    bad["enrollment_k8"] = bad["enrollment_k8"].astype(object)
+    bad.loc[7, "enrollment_k8"] = "n/a"
+    bad["recent_literacy_initiative"] = bad["recent_literacy_initiative"].astype(object)
+    bad.loc[9, "recent_literacy_initiative"] = "maybe"
+
+    problems = validate(bad, DISTRICT_SCHEMA)
+    assert len(problems) == 4
+    with pytest.raises(SchemaError) as err:
+        apply_schema(bad, DISTRICT_SCHEMA)
+    message = str(err.value)
+    assert "sor_adoption_signal: 3 value(s)" in message and "'Adopted'" in message
+    assert "pct_ela_proficient: 5 value(s) outside [0, 100]" in message
+    assert "enrollment_k8: 1 non-numeric" in message and "'maybe'" in message
+
+    # CSV-style strings and missing measurements are fine
+    ok = loose.head(3).astype({"recent_literacy_initiative": str})
+    ok.loc[0, "pct_ela_proficient"] = np.nan
+    assert apply_schema(ok, DISTRICT_SCHEMA)["recent_literacy_initiative"].tolist() == \
+        loose.head(3)["recent_literacy_initiative"].tolist()
+
+
+def test_loaders_and_deals_use_the_schema(tmp_path):
+    districts = load_districts(str(tmp_path / "missing.arrow"), model_path=str(tmp_path / "none"))
+    assert validate(districts, DISTRICT_SCHEMA) == []
+    assert districts["readiness_score"].dtype == np.float64 and districts["county"].dtype == "category"
+    # Scored from the stored (float32) inputs: a re-score of any row agrees exactly
+    np.testing.assert_array_equal(score_districts(districts)["readiness_score"], districts["readiness_score"])
+    index = RankingIndex.from_districts(districts)
+    assert [index.score_of(c) for c in districts["cds_code"]] == districts["readiness_score"].tolist()
+
+    deals = synthetic_deals(1_000, now=pd.Timestamp("2026-10-01"))
+    assert deals["amount"].dtype == np.float64 and deals["contact_count"].dtype == np.int16
+    assert deals["weighted_value"].dtype == np.float64
+    flags, summary = pipeline_health(deals)
+    assert summary["count"].sum() == 1_000 and flags.dtype == np.uint8
+    with pytest.raises(SchemaError, match="stage_probability"):
+        apply_schema(deals.assign(stage_probability=1.5), DEAL_SCHEMA)
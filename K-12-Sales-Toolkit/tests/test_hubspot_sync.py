@@ -0,0 +1,209 @@
+"""
+Tests for the incremental HubSpot deal sync, against a local mock
+HubSpot CRM server.
+"""
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "04_sales_cycle_tools"))
+
+import hubspot_sync
+from hubspot_sync import HubSpotDealSync, load_deals, pipeline_frame
+
+T0 = datetime(2026, 9, 1, tzinfo=timezone.utc)
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class MockHubSpot(BaseHTTPRequestHandler):
+    """
+    GET  /crm/v3/objects/deals         -> cursor-paged list of all deals
+    POST /crm/v3/objects/deals/search  -> hs_lastmodifieddate GTE filter, ascending
+    The first ``fail_next`` requests get a 429 with Retry-After: 0.
+    """
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+    deals = {}
+    log = []
+    ports = set()
+    fail_next = 0
+    lock = threading.Lock()
+
+    def _reject_if_rate_limited(self):
+        with self.lock:
+            MockHubSpot.ports.add(self.client_address[1])
+            if MockHubSpot.fail_next > 0:
+                MockHubSpot.fail_next -= 1
+                self._send(429, {"message": "rate limited"}, {"Retry-After": "0"})
+                return True
+        return False
+
+    def do_GET(self):
+        if self._reject_if_rate_limited():
+            return
+        url = urlparse(self.path)
+        qs = parse_qs(url.query)
+        offset, limit = int(qs.get("after", ["0"])[0]), int(qs["limit"][0])
+        ordered = sorted(self.deals.values(), key=lambda d: d["id"])
+        self.log.append(("list", offset))
+        self._page(ordered, offset, limit)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self._reject_if_rate_limited():
+            return
+        since = int(body["filterGroups"][0]["filters"][0]["value"])
+        matches = sorted((d for d in self.deals.values()
+                          if hubspot_sync._to_epoch_ms(d["properties"]["hs_lastmodifieddate"]) >= since),
+                         key=lambda d: (d["properties"]["hs_lastmodifieddate"], d["id"]))
+        offset = int(body.get("after", 0))
+        self.log.append(("search", since, offset))
+        self._page(matches, offset, body["limit"])
+
+    def _page(self, rows, offset, limit):
+        out = {"results": rows[offset:offset + limit]}
+        if offset + limit < len(rows):
+            out["paging"] = {"next": {"after": str(offset + limit)}}
+        self._send(200, out)
+
+    def _send(self, code, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(code)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _deal(i, modified, stage="discovery", amount=50000):
+    return {"id": str(i), "archived": False, "properties": {
+        "dealname": f"District_{i:03d} — Literacy PD Pilot", "amount": str(amount),
+        "dealstage": stage, "closedate": _iso(T0 + timedelta(days=30)),
+        "hs_deal_stage_probability": "0.25", "createdate": _iso(T0 - timedelta(days=20)),
+        "num_contacted_notes": "4", "hs_lastmodifieddate": _iso(modified)}}
+
+
+@pytest.fixture(scope="module")
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), MockHubSpot)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+
+
+@pytest.fixture
+def client(server, tmp_path, monkeypatch):
+    MockHubSpot.deals = {str(i): _deal(i, T0 + timedelta(hours=i)) for i in range(250)}
+    MockHubSpot.log, MockHubSpot.ports, MockHubSpot.fail_next = [], set(), 0
+    sync = HubSpotDealSync(api_key="test", db_path=str(tmp_path / "mirror.sqlite"),
+                           base_url=server, overlap_seconds=0)
+    monkeypatch.setattr(sync, "_backoff", lambda attempt, retry_after=None: 0)
+    yield sync
+    sync.close()
+
+
+def test_first_sync_is_full_and_pooled(client):
+    summary = client.sync()
+    assert summary["mode"] == "full" and summary["upserted"] == 250 and summary["pages"] == 3
+    assert len(load_deals(client.db_path)) == 250
+    assert len(MockHubSpot.ports) == 1  # one keep-alive connection for every page
+
+
+def test_second_sync_pulls_only_modified_deals(client):
+    client.sync()
+    MockHubSpot.log.clear()
+    later = datetime.now(timezone.utc) + timedelta(minutes=5)
+    MockHubSpot.deals["7"] = _deal(7, later, stage="proposal_sent", amount=90000)
+    MockHubSpot.deals["999"] = _deal(999, later + timedelta(seconds=1))
+    summary = client.sync()
+    assert summary["mode"] == "delta" and summary["upserted"] == 2
+    assert all(entry[0] == "search" for entry in MockHubSpot.log)
+    deals = load_deals(client.db_path).set_index("id")
+    assert len(deals) == 251 and deals.loc["7", "dealstage"] == "proposal_sent"
+    assert client.watermark() == _iso(later + timedelta(seconds=1))
+
+
+def test_429_is_retried_not_swallowed(client):
+    MockHubSpot.fail_next = 2
+    summary = client.sync()
+    assert summary["upserted"] == 250
+    assert client.stats["retries"] == 2
+
+
+def test_persistent_errors_raise(client, monkeypatch):
+    import requests
+
+    monkeypatch.setattr(client, "max_retries", 1)
+    MockHubSpot.fail_next = 5
+    with pytest.raises(requests.HTTPError):
+        client.sync()
+    assert client.watermark() is None  # an incomplete full pull sets no watermark
+
+
+def test_search_result_cap_restarts_from_newest(client, monkeypatch):
+    monkeypatch.setattr(hubspot_sync, "SEARCH_RESULT_LIMIT", 100)
+    client.sync()
+    base = datetime.now(timezone.utc) + timedelta(minutes=5)
+    for i in range(250):
+        MockHubSpot.deals[str(i)] = _deal(i, base + timedelta(seconds=i))
+    MockHubSpot.log.clear()
+    summary = client.sync()
+    assert len(load_deals(client.db_path)) == 250
+    assert client.watermark() == _iso(base + timedelta(seconds=249))
+    # Two restarts past the 100-result cap, each from the newest date seen
+    assert len({entry[1] for entry in MockHubSpot.log}) == 3
+    assert summary["upserted"] >= 250
+
+
+def test_pipeline_frame_matches_notebook_schema(client):
+    client.sync()
+    frame = pipeline_frame(load_deals(client.db_path), now=T0 + timedelta(days=10))
+    assert {"deal_name", "amount", "stage", "close_date", "days_since_last_activity",
+            "contact_count", "created_date", "stage_probability", "weighted_value"} <= set(frame.columns)
+    row = frame.set_index("deal_id").loc["0"]
+    assert row["days_since_last_activity"] == 10 and row["weighted_value"] == 12500
+
+
+def test_pipeline_frame_maps_stage_ids_and_keeps_missing_activity():
+    from pipeline_health import RISK_NO_ACTIVITY, RISK_STALE, pipeline_health
+
+    mirror = load_deals("missing.sqlite").reindex(range(3))
+    mirror = mirror.assign(id=["1", "2", "3"], dealname="LAUSD — Pilot", amount=1000.0,
+                           dealstage=["closedwon", "contractsent", "custom_stage_7"],
+                           closedate=_iso(T0 + timedelta(days=30)), hs_deal_stage_probability=0.5,
+                           num_contacted_notes=4,
+                           hs_lastmodifieddate=[_iso(T0 - timedelta(days=40))] * 2 + [None])
+    frame = pipeline_frame(mirror, now=T0)
+    assert frame["stage"].tolist() == ["closed_won", "negotiation", "custom_stage_7"]
+    assert np.isnan(frame["days_since_last_activity"][2])
+    flags, _ = pipeline_health(frame, now=T0)
+    # A won deal is closed, not stale; no timestamp is flagged, not "0 days idle"
+    assert flags.tolist() == [0, RISK_STALE, RISK_NO_ACTIVITY]
+
+
+def test_periodic_full_sync_archives_deleted_deals(client):
+    client.sync()
+    del MockHubSpot.deals["5"]           # deleted in HubSpot: no delta query returns it
+    assert client.sync()["mode"] == "delta"
+    assert "5" in set(load_deals(client.db_path)["id"])
+
+    client.reconcile_days = 0            # reconcile due
+    summary = client.sync()
+    assert summary["mode"] == "full" and summary["archived"] == 1
+    assert len(load_deals(client.db_path)) == 249 and "5" not in set(load_deals(client.db_path)["id"])
+    client.reconcile_days = 7
+    assert client.sync()["mode"] == "delta"
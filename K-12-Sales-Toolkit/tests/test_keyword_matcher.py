@@ -0,0 +1,82 @@
+"""
+Tests for the single-pass SOR keyword matcher and its use in classify_adoption_stage.
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from keyword_matcher import KeywordMatcher
+from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+
+@pytest.fixture
+def matcher():
+    return KeywordMatcher({"sor": SORAdoptionTracker.SOR_KEYWORDS,
+                           "resistance": SORAdoptionTracker.RESISTANCE_KEYWORDS})
+
+
+def test_word_boundaries(matcher):
+    text = "The professor discussed sorting MSVs and abstract AB 22220 budgets."
+    result = matcher.match(text)
+    assert result["sor"]["count"] == 0
+    assert result["resistance"]["count"] == 0
+
+
+def test_counts_and_spans_for_both_sets(matcher):
+    text = "SOR update: the district drops Balanced Literacy for the Science of Reading. SOR!"
+    result = matcher.match(text)
+    assert result["sor"]["count"] == 3
+    assert result["sor"]["distinct"] == 2
+    assert result["sor"]["keywords"] == {"SOR": 2, "science of reading": 1}
+    assert result["resistance"]["keywords"] == {"balanced literacy": 1}
+    for start, end, kw in result["sor"]["spans"] + result["resistance"]["spans"]:
+        assert text[start:end].lower() == kw.lower()
+
+
+def test_multiword_keywords_span_any_whitespace(matcher):
+    assert matcher.distinct_counts("Science  of\nReading and three-cueing") == {"sor": 1, "resistance": 1}
+
+
+def test_keywords_are_configurable():
+    tracker = SORAdoptionTracker(sor_keywords=["decodable text"], resistance_keywords=["cueing"])
+    articles = [{"title": "Board approves decodable text purchase", "description": "science of reading"}]
+    result = tracker.classify_adoption_stage("Compton Unified School District", articles)
+    assert result["sor_signal_count"] == 1
+    assert result["stage"] == "Committed"
+
+
+def test_same_keyword_in_two_sets_is_rejected():
+    with pytest.raises(ValueError):
+        KeywordMatcher({"sor": ["phonics"], "resistance": ["Phonics"]})
+
+
+def test_classifier_ignores_substring_false_positives():
+    tracker = SORAdoptionTracker()
+    articles = [{"title": "Professor wins award", "description": "A professor of education spoke."}]
+    result = tracker.classify_adoption_stage("Pasadena Unified School District", articles)
+    assert result["sor_signal_count"] == 0
+    assert result["stage"] == "Exploring"
+
+
+def test_probes_agree_with_single_pass_scan(matcher):
+    scan = KeywordMatcher(matcher.keyword_sets)
+    scan._probes = None
+    assert matcher._probes is not None
+    rng = random.Random(7)
+    pieces = (SORAdoptionTracker.SOR_KEYWORDS + SORAdoptionTracker.RESISTANCE_KEYWORDS
+              + ["professor", "sorting", "MSVs", "AB 22220", "science-based", "of", "the", "Reading"])
+    separators = [" ", "  ", "\n", "\t", ", ", "-", "(", ") ", ""]
+    for _ in range(2000):
+        text = "".join(rng.choice(pieces) + rng.choice(separators) for _ in range(rng.randint(0, 8)))
+        assert matcher.distinct_counts(text) == scan.distinct_counts(text), text
+
+
+def test_overlapping_keywords_use_single_pass_scan():
+    matcher = KeywordMatcher({"a": ["phonics"], "b": ["phonics instruction"]})
+    assert matcher._probes is None
+    assert matcher.distinct_counts("Phonics instruction") == {"a": 0, "b": 1}
+    assert matcher.distinct_counts("phonics, then phonics instruction") == {"a": 1, "b": 1}
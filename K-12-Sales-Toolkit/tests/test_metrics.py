@@ -0,0 +1,139 @@
+"""
+Tests for the timing / counter instrumentation layer and its exports.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "03_outreach_automation"))
+
+import metrics
+from metrics import BUCKETS, Registry
+from personalized_email_generator import K8EmailGenerator
+from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+
+@pytest.fixture
+def global_metrics():
+    was = metrics.enabled()
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    yield metrics.REGISTRY
+    metrics.REGISTRY.reset()
+    metrics.REGISTRY.enabled = was
+
+
+def test_disabled_registry_records_nothing():
+    registry = Registry(enabled=False)
+    with registry.stage("a") as timer:
+        timer.fail()
+    with registry.external_call("api"):
+        pass
+    registry.rows("a", 10)
+    registry.cache_lookup("c", hits=1)
+    assert registry.to_json()["histograms"] == [] and registry.to_json()["counters"] == []
+    assert registry.summary_frame().empty
+
+
+def test_stages_calls_caches_and_rows():
+    registry = Registry(enabled=True)
+    for _ in range(3):
+        with registry.stage("classify"):
+            pass
+    registry.rows("classify", 30)
+    with pytest.raises(TimeoutError):
+        with registry.external_call("newsapi"):
+            raise TimeoutError
+    with registry.external_call("newsapi") as call:
+        call.fail()   # e.g. HTTP 503
+    with registry.external_call("newsapi"):
+        pass
+    registry.cache_lookup("articles", hits=3, misses=1)
+
+    assert registry.histogram("stage_seconds", stage="classify").count == 3
+    assert registry.counter("external_calls_total", service="newsapi", outcome="error") == 2
+    assert registry.counter("external_calls_total", service="newsapi", outcome="ok") == 1
+    assert registry.cache_hit_rates() == {"articles": 0.75}
+
+    summary = registry.summary_frame().set_index("name")
+    assert summary.loc["classify", "calls"] == 3 and summary.loc["classify", "rows"] == 30
+    assert summary.loc["newsapi (external)", "errors"] == 2
+    assert (summary["p95_ms"] >= summary["p50_ms"]).all()
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    hist = metrics.Histogram()
+    for value in [0.002] * 50 + [0.2] * 50:
+        hist.observe(value)
+    assert 0.001 <= hist.quantile(0.5) <= 0.0025
+    assert 0.1 <= hist.quantile(0.95) <= 0.25
+    assert hist.sum == pytest.approx(10.1)
+
+
+def test_prometheus_and_json_exports(tmp_path):
+    registry = Registry(enabled=True)
+    registry._observe("stage_seconds", (("stage", "load"),), 0.003)
+    registry._observe("stage_seconds", (("stage", "load"),), 0.7)
+    registry.cache_lookup("embeddings", hits=2, misses=2)
+
+    text = registry.to_prometheus()
+    assert "# TYPE k12_stage_seconds histogram" in text
+    assert 'k12_stage_seconds_bucket{stage="load",le="0.005"} 1' in text
+    assert 'k12_stage_seconds_bucket{stage="load",le="+Inf"} 2' in text
+    assert 'k12_stage_seconds_count{stage="load"} 2' in text
+    assert 'k12_cache_requests_total{cache="embeddings",result="hit"} 2' in text
+    buckets = [line for line in text.splitlines() if line.startswith("k12_stage_seconds_bucket")]
+    assert len(buckets) == len(BUCKETS) + 1
+
+    out = registry.write(str(tmp_path / "metrics.json"))
+    data = json.load(open(out))
+    assert data["cache_hit_rates"] == {"embeddings": 0.5}
+    assert data["histograms"][0]["count"] == 2
+    assert registry.write(str(tmp_path / "metrics.prom")) and not os.path.exists(str(tmp_path / "metrics.prom.tmp"))
+
+
+def test_tracker_and_generator_are_instrumented(global_metrics):
+    articles = [{"title": "Board adopts structured literacy", "description": "phonics instruction",
+                 "url": f"https://n.example/{i}"} for i in range(4)]
+    SORAdoptionTracker().classify_batch([("Alpha USD", articles), ("Beta USD", articles[:1])])
+    generator = K8EmailGenerator()
+    generator.openai_key = None
+    generator.generate({"name": "A", "district": "Alpha USD"})
+
+    assert global_metrics.histogram("stage_seconds", stage="tracker.classify").count == 1
+    assert global_metrics.counter("rows_processed_total", stage="tracker.classify") == 5
+    assert global_metrics.histogram("stage_seconds", stage="email.generate").count == 1
+    assert global_metrics.counter("rows_processed_total", stage="email.generate") == 1
+
+
+def test_reads_are_snapshots_while_threads_record():
+    import threading
+
+    registry = Registry(enabled=True)
+    registry.cache_lookup("c0", hits=1)
+    stop = threading.Event()
+
+    def record():
+        i = 0
+        while not stop.is_set():
+            registry.cache_lookup(f"c{i % 500}", hits=1, misses=1)
+            registry._observe("stage_seconds", (("stage", f"s{i % 500}"),), 0.001)
+            i += 1
+
+    workers = [threading.Thread(target=record) for _ in range(2)]
+    for w in workers:
+        w.start()
+    try:
+        for _ in range(300):   # new series appear mid-read: must not raise
+            registry.cache_hit_rates()
+            registry.counter("cache_requests_total", cache="c0", result="hit")
+    finally:
+        stop.set()
+        for w in workers:
+            w.join()
+    snapshot = registry.histogram("stage_seconds", stage="s0")
+    registry._observe("stage_seconds", (("stage", "s0"),), 0.001)
+    assert registry.histogram("stage_seconds", stage="s0").count == snapshot.count + 1
@@ -0,0 +1,131 @@
+"""
+Tests for the vectorized pipeline-health / at-risk engine.
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "04_sales_cycle_tools"))
+
+from pipeline_health import (RISK_CLOSE_SOON, RISK_LOW_CONTACTS, RISK_NO_ACTIVITY, RISK_STALE, STAGES,
+                             RiskThresholds, describe_risks, pipeline_health, risk_flags,
+                             synthetic_deals)
+
+NOW = datetime(2026, 10, 1)
+
+
+def _notebook_flag_at_risk(row, now=NOW):
+    """The notebook's original row-wise rules (reference implementation)."""
+    risks = []
+    if row["days_since_last_activity"] > 14 and row["stage"] not in ["closed_won", "closed_lost"]:
+        risks.append(f"No activity in {row['days_since_last_activity']:.0f} days")
+    if row["close_date"] < now + timedelta(days=14) and row["stage"] not in ["closed_won", "closed_lost", "negotiation"]:
+        risks.append("Close date <14 days but not in negotiation")
+    if row["contact_count"] < 3 and row["stage"] in ["evaluation", "proposal_sent"]:
+        risks.append("Low contact count for this stage")
+    return "; ".join(risks) if risks else "Healthy"
+
+
+def _deals(n=2000):
+    deals = synthetic_deals(n, seed=7, now=NOW)
+    # Pull some close dates inside the 14-day window
+    deals.loc[::5, "close_date"] = NOW + timedelta(days=3)
+    return deals
+
+
+def test_matches_row_wise_reference():
+    deals = _deals()
+    flags = risk_flags(deals, now=NOW)
+    expected = deals.astype({"stage": object}).apply(_notebook_flag_at_risk, axis=1)
+    assert (describe_risks(deals, flags) == expected).all()
+    assert (flags != 0).any() and (flags == 0).any()
+
+
+def test_object_and_categorical_stages_agree():
+    deals = _deals()
+    flags_cat, summary_cat = pipeline_health(deals, now=NOW, stage_order=STAGES)
+    flags_obj, summary_obj = pipeline_health(deals.astype({"stage": object}), now=NOW, stage_order=STAGES)
+    assert np.array_equal(flags_cat, flags_obj)
+    pd.testing.assert_frame_equal(summary_cat, summary_obj)
+
+
+def test_stage_summary_aggregates():
+    deals = _deals()
+    flags, summary = pipeline_health(deals, now=NOW, stage_order=STAGES + ["on_hold"])
+    grouped = deals.assign(risky=flags != 0).groupby("stage", observed=True)
+    assert summary.loc["on_hold", "count"] == 0
+    for stage, group in grouped:
+        row = summary.loc[stage]
+        assert row["count"] == len(group)
+        assert row["total_value"] == group["amount"].sum()
+        assert np.isclose(row["weighted_value"], group["weighted_value"].sum())
+        assert row["at_risk"] == group["risky"].sum()
+        assert row["at_risk_value"] == group.loc[group["risky"], "amount"].sum()
+    assert summary["stale"].sum() == ((flags & RISK_STALE) != 0).sum()
+    assert summary.loc[["closed_won", "closed_lost"], "at_risk"].sum() == 0
+
+
+def test_thresholds_are_configurable():
+    deals = pd.DataFrame({
+        "stage": ["evaluation", "evaluation", "closed_won"],
+        "amount": [1.0, 1.0, 1.0],
+        "weighted_value": [0.25, 0.25, 1.0],
+        "close_date": [NOW + timedelta(days=20)] * 3,
+        "days_since_last_activity": [10, 20, 40],
+        "contact_count": [4, 2, 1],
+    })
+    default = risk_flags(deals, now=NOW)
+    assert default.tolist() == [0, RISK_STALE | RISK_LOW_CONTACTS, 0]
+
+    strict = RiskThresholds(stale_days=7, close_window_days=30, min_contacts=5)
+    assert risk_flags(deals, strict, now=NOW).tolist() == [
+        RISK_STALE | RISK_CLOSE_SOON | RISK_LOW_CONTACTS,
+        RISK_STALE | RISK_CLOSE_SOON | RISK_LOW_CONTACTS,
+        0,
+    ]
+
+
+def test_missing_stage_and_close_date_are_not_flagged_or_counted():
+    deals = pd.DataFrame({
+        "stage": [None, "discovery"],
+        "amount": [5.0, 7.0],
+        "weighted_value": [0.5, 0.7],
+        "close_date": [pd.NaT, pd.NaT],
+        "days_since_last_activity": [1, 1],
+        "contact_count": [5, 5],
+    })
+    flags, summary = pipeline_health(deals, now=NOW)
+    assert flags.tolist() == [0, 0]
+    assert summary["count"].sum() == 1 and summary.loc["discovery", "total_value"] == 7.0
+
+
+def test_missing_activity_is_flagged_not_read_as_fresh():
+    deals = pd.DataFrame({
+        "stage": ["discovery", "closed_won", "discovery"],
+        "amount": [5.0, 7.0, 9.0],
+        "weighted_value": [0.5, 7.0, 0.9],
+        "close_date": [NOW + timedelta(days=60)] * 3,
+        "days_since_last_activity": [np.nan, np.nan, 30.0],
+        "contact_count": [5, 5, 5],
+    })
+    flags, summary = pipeline_health(deals, now=NOW)
+    assert flags.tolist() == [RISK_NO_ACTIVITY, 0, RISK_STALE]
+    assert describe_risks(deals, flags).tolist() == ["No activity recorded", "Healthy",
+                                                     "No activity in 30 days"]
+    assert summary.loc["discovery", "no_activity"] == 1 and summary["stale"].sum() == 1
+
+
+@pytest.mark.timing
+def test_million_deals_well_under_a_second():
+    deals = synthetic_deals(1_000_000, seed=1, now=NOW)
+    pipeline_health(deals, now=NOW)  # warm-up
+    start = time.perf_counter()
+    flags, summary = pipeline_health(deals, now=NOW, stage_order=STAGES)
+    elapsed = time.perf_counter() - start
+    assert flags.dtype == np.uint8 and summary["count"].sum() == 1_000_000
+    assert elapsed < 0.5, f"{elapsed:.3f}s for 1M deals"
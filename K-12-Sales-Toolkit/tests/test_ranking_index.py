@@ -0,0 +1,161 @@
+"""
+Tests for the incremental readiness ranking index.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "07_streamlit_demo"))
+
+from dashboard_data import synthetic_districts
+from district_scoring import SCORE_COLUMNS, score_arrays, score_districts, score_one
+from ranking_index import RankingIndex, events_frame
+
+STAGES = ["None", "Exploring", "Committed", "Implementing", "Resistant"]
+
+
+def brute_force(districts):
+    """Full re-score + sort of the index's current inputs."""
+    scored = score_districts(districts)
+    scores = scored.set_index("cds_code")["readiness_score"]
+    ranks = scores.rank(method="min", ascending=False).astype(int)
+    return scored, scores, ranks
+
+
+def test_score_one_matches_score_arrays():
+    districts = synthetic_districts(5000, seed=2, score=False)
+    districts.loc[0, "pct_ela_proficient"] = np.nan
+    districts.loc[1, "sor_adoption_signal"] = None
+    expected = score_arrays(**{arg: districts[col] for arg, col in SCORE_COLUMNS.items()})
+    rows = districts[list(SCORE_COLUMNS.values())].to_dict("records")
+    got = [score_one(**{arg: r[col] for arg, col in SCORE_COLUMNS.items()}) for r in rows]
+    np.testing.assert_array_equal(np.array(got), expected)
+
+
+def test_ranks_and_top_k_match_full_resort_after_updates():
+    districts = synthetic_districts(800, seed=4, score=False)
+    index = RankingIndex.from_districts(districts)
+    rng = np.random.default_rng(1)
+    for i in rng.integers(0, len(districts), 300):
+        stage, budget = rng.choice(STAGES), float(rng.integers(50, 600))
+        index.update(districts.at[i, "cds_code"], sor_adoption_signal=stage,
+                     pd_budget_per_student_est=budget)
+        districts.loc[i, ["sor_adoption_signal", "pd_budget_per_student_est"]] = [stage, budget]
+
+    scored, scores, ranks = brute_force(districts)
+    codes = districts["cds_code"]
+    np.testing.assert_array_equal(index.ranks(codes), ranks[codes].to_numpy())
+    assert index.rank_of(codes[7]) == ranks[codes[7]]
+    assert index.score_of(codes[7]) == scores[codes[7]]
+
+    top = index.top_k(40)
+    expected = scored.sort_values(["readiness_score", "district_name"], ascending=[False, True]).head(40)
+    assert top["district_name"].tolist() == expected["district_name"].tolist()
+    assert top["cds_code"].tolist() == expected["cds_code"].tolist()
+    assert top["readiness_score"].tolist() == expected["readiness_score"].tolist()
+    assert index.tier_counts() == scored["tier"].value_counts().to_dict()
+
+
+def test_tier_change_events():
+    districts = pd.DataFrame({
+        "district_name": ["Alpha USD", "Beta USD"],
+        "pct_ela_proficient": [20.0, 55.0],
+        "pd_budget_per_student_est": [400.0, 100.0],
+        "sor_adoption_signal": ["None", "None"],
+        "recent_literacy_initiative": [True, False],
+        "superintendent_tenure_yrs": [2.0, 8.0],
+        "miles_from_la": [20.0, 300.0],
+    })
+    index = RankingIndex.from_districts(districts)
+    assert index.tier_of("Alpha USD") == "Tier 2"
+
+    events = index.update("Alpha USD", sor_adoption_signal="Implementing")
+    assert len(events) == 1 and str(events[0]).startswith("Alpha USD moved into Tier 1")
+    assert events[0].direction == "up" and index.rank_of("Alpha USD") == 1
+    assert index.update("Alpha USD", sor_adoption_signal="Committed") == []  # still Tier 1
+
+    down = index.update("Alpha USD", sor_adoption_signal="Resistant")
+    assert [e.new_tier for e in down] == ["Tier 2"] and down[0].direction == "down"
+    assert list(events_frame(events + down)["direction"]) == ["up", "down"]
+
+
+def test_insert_remove_and_validation():
+    index = RankingIndex.from_districts(synthetic_districts(50, seed=6, score=False))
+    new = dict(pct_ela_proficient=10.0, pd_budget_per_student_est=500.0,
+               sor_adoption_signal="Implementing", recent_literacy_initiative=True,
+               superintendent_tenure_yrs=1.0, miles_from_la=0.0)
+    [added] = index.update("New Charter", **new)
+    assert added.direction == "added" and index.rank_of("New Charter") == 1 and len(index) == 51
+
+    removed = index.remove("New Charter")
+    assert removed.direction == "removed" and "New Charter" not in index and len(index) == 50
+    with pytest.raises(KeyError):
+        index.update("Unknown District", sor_adoption_signal="Committed")
+    with pytest.raises(ValueError):
+        index.update("New Charter", enrollment_k8=100)
+
+
+def test_apply_tracker_results_skips_unknown_districts():
+    districts = synthetic_districts(30, seed=9, score=False)
+    districts["sor_adoption_signal"] = "None"
+    index = RankingIndex.from_districts(districts)
+    results = pd.DataFrame({"district": [districts["district_name"][0], "Not Indexed USD"],
+                            "stage": ["Implementing", "Implementing"]})
+    index.apply_tracker_results(results)   # exact names map to their cds_code
+    assert index.score_of(districts["cds_code"][0]) == score_districts(
+        districts.assign(sor_adoption_signal=["Implementing"] + ["None"] * 29))["readiness_score"][0]
+    assert "Not Indexed USD" not in index
+
+
+def test_apply_tracker_results_through_resolver():
+    pytest.importorskip("scipy")
+    from district_resolver import DistrictResolver
+
+    districts = synthetic_districts(30, seed=9, score=False)
+    districts.loc[0, ["district_name", "cds_code"]] = ["Los Angeles Unified School District", "1964733"]
+    districts["sor_adoption_signal"] = "None"
+    index = RankingIndex.from_districts(districts)
+    before = index.score_of("1964733")
+    results = pd.DataFrame({"district": ["LAUSD"], "stage": ["Implementing"]})
+    index.apply_tracker_results(results)  # "LAUSD" is not an indexed name: skipped
+    assert index.score_of("1964733") == before
+    index.apply_tracker_results(results, resolver=DistrictResolver.from_districts(districts))
+    assert index.score_of("1964733") == pytest.approx(before + 20)
+
+
+def test_keyed_by_cds_code_when_names_repeat():
+    districts = synthetic_districts(4, seed=3, score=False)
+    districts["district_name"] = "Jefferson Elementary School District"
+    districts["sor_adoption_signal"] = "None"
+    with pytest.raises(ValueError, match="district_name"):
+        RankingIndex.from_districts(districts, key_col="district_name")
+    index = RankingIndex.from_districts(districts)
+    assert index.key_col == "cds_code" and len(index) == 4
+
+    code = districts["cds_code"][2]
+    events = index.update(code, sor_adoption_signal="Implementing",
+                          pct_ela_proficient=10.0, pd_budget_per_student_est=500.0)
+    assert index.rank_of(code) == 1 and events[0].key == code
+    assert str(events[0]).startswith("Jefferson Elementary School District ")
+    assert index.top_k(1)[["district_name", "cds_code"]].values.tolist() == \
+        [["Jefferson Elementary School District", code]]
+    # An ambiguous name can't be applied without a resolver
+    assert index.apply_tracker_results(pd.DataFrame({"district": ["Jefferson Elementary School District"],
+                                                     "stage": ["Committed"]})) == []
+
+
+def test_copies_update_independently():
+    districts = synthetic_districts(50, seed=6, score=False)
+    shared = RankingIndex.from_districts(districts)
+    session = shared.copy()
+    code = districts["cds_code"][0]
+    before = shared.score_of(code), shared.rank_of(code), shared.tier_counts()
+    session.update(code, sor_adoption_signal="Implementing", pct_ela_proficient=5.0,
+                   pd_budget_per_student_est=500.0, miles_from_la=0.0)
+    session.remove(districts["cds_code"][1])
+    assert (shared.score_of(code), shared.rank_of(code), shared.tier_counts()) == before
+    assert len(shared) == 50 and len(session) == 49 and session.rank_of(code) == 1
@@ -0,0 +1,70 @@
+"""
+Tests for the vectorized district scoring engine (01_district_intelligence/district_scoring.py).
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from district_scoring import SOR_STAGES, assign_tiers, score_arrays, score_districts
+from test_district_scoring import score_district_helper
+
+
+def _random_districts(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "pct_ela_proficient": rng.uniform(0, 100, n),
+        "pd_budget_per_student_est": rng.uniform(0, 1000, n),
+        "sor_adoption_signal": rng.choice(SOR_STAGES, n),
+        "recent_literacy_initiative": rng.choice([True, False], n),
+        "superintendent_tenure_yrs": rng.uniform(0, 20, n),
+        "miles_from_la": rng.uniform(0, 500, n),
+    })
+
+
+def test_matches_row_wise_helper():
+    df = _random_districts(2_000)
+    scored = score_districts(df)
+    expected = [
+        score_district_helper(r.pct_ela_proficient, r.pd_budget_per_student_est,
+                              r.sor_adoption_signal, r.recent_literacy_initiative,
+                              r.superintendent_tenure_yrs, r.miles_from_la)
+        for r in df.itertuples()
+    ]
+    np.testing.assert_allclose(scored["readiness_score"], expected, atol=0.011)
+
+
+def test_tiers_assigned_in_same_pass():
+    scored = score_districts(_random_districts(500))
+    s = scored["readiness_score"]
+    assert ((scored["tier"] == "Tier 1") == (s >= 70)).all()
+    assert ((scored["tier"] == "Tier 2") == ((s >= 50) & (s < 70))).all()
+    assert ((scored["tier"] == "Tier 3") == (s < 50)).all()
+
+
+def test_custom_tier_labels_and_threshold_edges():
+    labels = ["Tier 1 — Immediate Outreach", "Tier 2 — Nurture", "Tier 3 — Monitor"]
+    tiers = assign_tiers([70.0, 69.99, 50.0, 49.99], labels=labels)
+    assert list(tiers) == [labels[0], labels[1], labels[1], labels[2]]
+
+
+def test_unknown_sor_stage_scores_zero_points():
+    base = dict(ela_pct=[40.0], budget=[250.0], recent_init=[False], supt_tenure=[10.0], miles=[200.0])
+    assert score_arrays(sor_signal=["Resistant"], **base)[0] == score_arrays(sor_signal=["None"], **base)[0]
+
+
+@pytest.mark.timing
+def test_throughput_at_least_one_million_per_second():
+    n = 1_000_000
+    df = _random_districts(n, seed=1)
+    df["sor_adoption_signal"] = pd.Categorical(df["sor_adoption_signal"], categories=SOR_STAGES)
+    score_districts(df.head(1000))  # warm-up
+    start = time.perf_counter()
+    score_districts(df)
+    elapsed = time.perf_counter() - start
+    assert n / elapsed >= 1_000_000, f"Only {n / elapsed:,.0f} districts/sec"
@@ -0,0 +1,135 @@
+"""
+Tests for the batched, cached embedding backend of the SOR tracker.
+
+A small bag-of-words encoder stands in for the sentence-transformers model
+(same encode() signature), so the batching, caching and tracker wiring are
+tested without downloading a model.
+"""
+import os
+import sys
+import zlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from article_dedup import SignatureIndex
+from science_of_reading_adoption_tracker import SORAdoptionTracker
+from sor_embedding_classifier import EmbeddingClassifier
+
+PROTOTYPES = {
+    "sor": ["phonics decoding structured literacy decodable readers"],
+    "resistance": ["balanced literacy whole language cueing leveled readers"],
+    "other": ["bus routes budget football stadium salaries"],
+}
+
+
+class BagOfWordsEncoder:
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=False,
+               show_progress_bar=False):
+        self.calls.append(list(texts))
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                out[i, zlib.crc32(word.encode()) % self.dim] += 1
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1, norms)
+
+
+def make_classifier(tmp_path, **kwargs):
+    encoder = BagOfWordsEncoder()
+    classifier = EmbeddingClassifier(model_name="bow", cache_path=str(tmp_path / "emb.sqlite"),
+                                     prototypes=PROTOTYPES, encoder=encoder, **kwargs)
+    classifier.centroids()
+    encoder.calls.clear()
+    return classifier, encoder
+
+
+def article(district, text, n=0):
+    return {"title": f"{district} board news", "description": text,
+            "url": f"https://news.example/{district}/{n}", "publishedAt": "2026-10-01T00:00:00Z"}
+
+
+def test_signal_counts_follow_nearest_prototype(tmp_path):
+    classifier, _ = make_classifier(tmp_path)
+    counts = classifier.signal_counts(["Teachers trained in phonics and decoding with decodable readers",
+                                       "Board keeps balanced literacy and whole language",
+                                       "Budget talks on bus routes and stadium", ""])
+    assert counts[:3] == [{"sor": 1, "resistance": 0}, {"sor": 0, "resistance": 1},
+                          {"sor": 0, "resistance": 0}]
+    assert counts[3] == {"sor": 0, "resistance": 0}   # blank article: no signal
+
+
+def test_embeddings_are_cached_by_text_and_model(tmp_path):
+    classifier, encoder = make_classifier(tmp_path)
+    texts = ["phonics pilot expands", "bus routes cut", "phonics pilot expands"]
+    first = classifier.embed(texts)
+    assert encoder.calls == [["phonics pilot expands", "bus routes cut"]]  # one batch, duplicates once
+    assert np.allclose(first[0], first[2]) and np.allclose(np.linalg.norm(first, axis=1), 1, atol=1e-3)
+    classifier.close()
+
+    reopened, encoder = make_classifier(tmp_path)
+    assert np.allclose(reopened.embed(texts), first) and encoder.calls == []
+    assert reopened.stats == {"embedded": 0, "cache_hits": 3}
+
+    int8, encoder = make_classifier(tmp_path, quantize=True)   # different embeddings: own cache key
+    int8.embed(texts[:1])
+    assert len(encoder.calls) == 1 and int8.name != reopened.name
+
+
+def test_tracker_embeds_all_districts_in_one_batch(tmp_path):
+    classifier, encoder = make_classifier(tmp_path)
+    tracker = SORAdoptionTracker(classifier=classifier)
+    batch = [(f"District {d}", [article(f"D{d}", f"structured literacy and phonics decoding, part {n}", n)
+                                for n in range(3)]) for d in range(4)]
+    results = tracker.classify_batch(batch)
+    assert len(encoder.calls) == 1 and len(encoder.calls[0]) == 12
+    assert [r["district"] for r in results] == [d for d, _ in batch]
+    assert all(r["stage"] == "Implementing" and r["sor_signal_count"] == 3 for r in results)
+
+    single = tracker.classify_adoption_stage("District 0", batch[0][1])
+    assert single["stage"] == "Implementing" and len(encoder.calls) == 1  # served from the cache
+
+
+def test_dedup_results_are_kept_per_backend(tmp_path):
+    dedup = SignatureIndex(str(tmp_path / "sig.sqlite"))
+    articles = [article("D1", "Trustees adopt structured literacy with phonics instruction and decodable readers")]
+    keyword = SORAdoptionTracker(dedup=dedup).classify_adoption_stage("D1", articles)
+    classifier, encoder = make_classifier(tmp_path)
+    embedded = SORAdoptionTracker(dedup=dedup, classifier=classifier).classify_adoption_stage("D1", articles)
+    assert keyword["sor_signal_count"] == 3 and embedded["sor_signal_count"] == 1
+    assert len(encoder.calls) == 1
+
+
+def test_stage_thresholds_follow_the_backend(tmp_path):
+    classifier, _ = make_classifier(tmp_path)
+    two_stories = [article("D1", "structured literacy and phonics decoding pilot", 0),
+                   article("D1", "decodable readers arrive in phonics classrooms", 1)]
+    embedded = SORAdoptionTracker(classifier=classifier).classify_adoption_stage("D1", two_stories)
+    # Two SOR stories: Implementing here, as 3+ distinct phrases are for the keyword rules
+    assert embedded["sor_signal_count"] == 2 and embedded["stage"] == "Implementing"
+    one_story = SORAdoptionTracker(classifier=classifier).classify_adoption_stage("D1", two_stories[:1])
+    assert one_story["stage"] == "Committed"
+    resisting = [article("D2", "board keeps balanced literacy and whole language")]
+    assert SORAdoptionTracker(classifier=classifier).classify_adoption_stage("D2", resisting)["stage"] == "Resistant"
+
+
+def test_track_district_list_classifies_in_one_batch(tmp_path, monkeypatch):
+    classifier, encoder = make_classifier(tmp_path)
+
+    class StubFetcher:
+        sources = ["stub"]
+
+        def run(self, districts):
+            return [{"district": d, "partial": d == "D1", "source_status": {"stub": "ok"},
+                     "articles": [article(d, f"phonics decoding news {n}", n) for n in range(2)]}
+                    for d in districts]
+
+    monkeypatch.chdir(tmp_path)   # the CSV it writes
+    df = SORAdoptionTracker(classifier=classifier).track_district_list(["D0", "D1", "D2"], fetcher=StubFetcher())
+    assert len(encoder.calls) == 1 and len(encoder.calls[0]) == 6
+    assert df["district"].tolist() == ["D0", "D1", "D2"] and df["partial"].tolist() == [False, True, False]
@@ -0,0 +1,212 @@
+"""
+Tests for the concurrent SOR source fetcher, against a local stub HTTP server.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from sor_source_fetcher import (MAX_RETRY_AFTER, MultiSourceFetcher, Source, TokenBucket, _newsapi_articles,
+                                default_sources)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    /news  -> one NewsAPI-style article mentioning the district
+    /slow  -> same, after a 2 s delay
+    /flaky -> 429 on the first hit per district, then 200
+    /down  -> always 503
+    """
+    flaky_hits = {}
+    news_hits = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        district = parse_qs(url.query).get("q", ["?"])[0]
+        if url.path == "/slow":
+            time.sleep(2)
+        if url.path == "/down":
+            return self._send(503, {})
+        if url.path == "/flaky":
+            with self.lock:
+                hits = self.flaky_hits[district] = self.flaky_hits.get(district, 0) + 1
+            if hits == 1:
+                return self._send(429, {}, {"Retry-After": "0"})
+        if url.path == "/news":
+            with self.lock:
+                StubHandler.news_hits += 1
+            time.sleep(0.1)
+        self._send(200, {"articles": [{"title": f"{district} adopts science of reading",
+                                       "description": "phonics instruction",
+                                       "publishedAt": "2026-10-01T00:00:00Z"}]})
+
+    def _send(self, code, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(code)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # clients hang up on /slow by design
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = QuietServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def _source(name, url, **kw):
+    kw.setdefault("rate", 1000)
+    kw.setdefault("backoff", 0.01)
+    return Source(name, url, lambda d, f: {"q": d}, _newsapi_articles, **kw)
+
+
+def test_districts_fetched_concurrently(stub_url):
+    fetcher = MultiSourceFetcher([_source("newsapi", f"{stub_url}/news")], max_concurrency=20)
+    start = time.perf_counter()
+    results = fetcher.run([f"District {i}" for i in range(40)])
+    elapsed = time.perf_counter() - start
+    # 40 x 100 ms sequentially would be 4 s
+    assert elapsed < 2.0
+    assert [r["district"] for r in results] == [f"District {i}" for i in range(40)]
+    assert all(len(r["articles"]) == 1 and not r["partial"] for r in results)
+
+
+def test_slow_source_returns_partial_results(stub_url):
+    fetcher = MultiSourceFetcher([
+        _source("newsapi", f"{stub_url}/news"),
+        _source("board_minutes", f"{stub_url}/slow", timeout=0.3, retries=0),
+    ])
+    result = fetcher.run(["Compton Unified School District"])[0]
+    assert result["partial"]
+    assert result["source_status"] == {"newsapi": "ok", "board_minutes": "timeout"}
+    assert [a["source"] for a in result["articles"]] == ["newsapi"]
+
+
+def test_retries_429_then_succeeds(stub_url):
+    fetcher = MultiSourceFetcher([_source("cde", f"{stub_url}/flaky", retries=2)])
+    result = fetcher.run(["Inglewood Unified School District"])[0]
+    assert result["source_status"] == {"cde": "ok"}
+    assert len(result["articles"]) == 1
+
+
+def test_exhausted_retries_reported_as_error(stub_url):
+    fetcher = MultiSourceFetcher([_source("edweek", f"{stub_url}/down", retries=1)])
+    result = fetcher.run(["Pasadena Unified School District"])[0]
+    assert result["source_status"]["edweek"] == "error: HTTPStatusError"
+    assert result["articles"] == []
+
+
+def test_cached_districts_skip_network(stub_url, tmp_path):
+    from article_cache import ArticleCache
+
+    cache = ArticleCache(str(tmp_path / "cache.sqlite"))
+    fetcher = MultiSourceFetcher([_source("newsapi", f"{stub_url}/news")], cache=cache)
+    first = fetcher.run(["District A", "District B"])
+    hits_after_first = StubHandler.news_hits
+    second = fetcher.run(["District A", "District B"])
+    assert StubHandler.news_hits == hits_after_first
+    assert [r["articles"] for r in second] == [r["articles"] for r in first]
+    cache.close()
+
+
+def test_failed_refresh_serving_cache_is_reported_stale(stub_url, tmp_path, monkeypatch):
+    from article_cache import ArticleCache
+    from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+    cache = ArticleCache(str(tmp_path / "cache.sqlite"), ttl_seconds=0)   # every entry needs a refresh
+    first = MultiSourceFetcher([_source("newsapi", f"{stub_url}/news")], cache=cache).run(
+        ["District S"], days_back=3650)[0]
+    down = MultiSourceFetcher([_source("newsapi", f"{stub_url}/down", retries=0)], cache=cache)
+    result = down.run(["District S"], days_back=3650)[0]
+    assert result["source_status"] == {"newsapi": "stale"}
+    assert result["partial"]
+    assert result["articles"] == first["articles"] and len(result["articles"]) == 1
+
+    monkeypatch.chdir(tmp_path)
+    df = SORAdoptionTracker().track_district_list(["District S"], fetcher=down)
+    assert df.iloc[0]["partial"] and df.iloc[0]["failed_sources"] == "newsapi"
+    cache.close()
+
+
+def test_cache_io_runs_off_the_event_loop(stub_url, tmp_path):
+    import threading
+    from article_cache import ArticleCache
+
+    cache = ArticleCache(str(tmp_path / "cache.sqlite"))
+    threads = []
+    for name in ("lookup", "store"):
+        method = getattr(cache, name)
+
+        def traced(*args, _method=method):
+            threads.append(threading.current_thread())
+            return _method(*args)
+        setattr(cache, name, traced)
+    MultiSourceFetcher([_source("newsapi", f"{stub_url}/news")], cache=cache).run(["District A"])
+    assert len(threads) == 2 and threading.main_thread() not in threads
+    cache.close()
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    start = time.perf_counter()
+    asyncio.run(take(11))
+    # 1 burst token + 10 refills at 20/s
+    assert time.perf_counter() - start >= 0.45
+
+
+def test_sources_on_one_key_share_a_bucket():
+    sources = {s.name: s for s in default_sources(["phonics"], newsapi_key="n", serpapi_key="s")}
+    assert sources["newsapi"].bucket is sources["edweek"].bucket
+    assert sources["cde"].bucket is sources["board_minutes"].bucket
+    assert sources["newsapi"].bucket is not sources["cde"].bucket
+    assert sources["newsapi"].bucket.rate == 1.0
+
+
+def test_retry_after_is_capped():
+    source = _source("newsapi", "http://unused")
+    assert source._delay(0, "2") == 2.0
+    assert source._delay(0, "86400") == MAX_RETRY_AFTER
+    assert source._delay(0, "-5") == 0.0
+
+
+def test_tracker_uses_fetcher(stub_url, tmp_path, monkeypatch):
+    from science_of_reading_adoption_tracker import SORAdoptionTracker
+
+    monkeypatch.chdir(tmp_path)
+    fetcher = MultiSourceFetcher([
+        _source("newsapi", f"{stub_url}/news"),
+        _source("board_minutes", f"{stub_url}/slow", timeout=0.3, retries=0),
+    ])
+    df = SORAdoptionTracker().track_district_list(["Long Beach Unified School District"], fetcher=fetcher)
+    row = df.iloc[0]
+    assert row["stage"] == "Committed"
+    assert row["partial"] and row["failed_sources"] == "board_minutes"
+    assert (tmp_path / "sor_adoption_tracker_output.csv").exists()
@@ -0,0 +1,216 @@
+"""
+Tests for the resumable, incremental weekly tracking job.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+
+from science_of_reading_adoption_tracker import SORAdoptionTracker
+from weekly_tracking_job import WeeklyTrackingJob, load_partitions
+
+DISTRICTS = [f"District {i:02d}" for i in range(10)]
+
+
+class FakeNewsTracker(SORAdoptionTracker):
+    """Serves articles from an in-memory feed; can be told to crash on one district."""
+
+    def __init__(self):
+        super().__init__()
+        self.api_key = None
+        self.feed = {d: [{"title": f"{d} explores phonics instruction",
+                          "publishedAt": "2026-09-01T00:00:00Z", "url": f"https://n/{d}/0"}]
+                     for d in DISTRICTS}
+        self.crash_on = None
+        self.classified = []
+
+    def search_district_news(self, district_name, days_back=90):
+        if district_name == self.crash_on:
+            raise RuntimeError("simulated crash")
+        return list(self.feed[district_name])
+
+    def classify_batch(self, district_articles):
+        self.classified.extend(district for district, _ in district_articles)
+        return super().classify_batch(district_articles)
+
+
+@pytest.fixture
+def job_parts(tmp_path):
+    tracker = FakeNewsTracker()
+    job = WeeklyTrackingJob(tracker, state_path=str(tmp_path / "state.sqlite"),
+                            output_dir=str(tmp_path / "out"), batch_size=3)
+    yield job, tracker, tmp_path / "out"
+    job.close()
+
+
+def test_first_run_classifies_everything_in_partitions(job_parts):
+    job, tracker, out = job_parts
+    summary = job.run(DISTRICTS, run_id="2026-W40")
+    assert summary["reclassified"] == 10
+    assert len(summary["partitions"]) == 4  # batches of 3
+    assert sorted(load_partitions(str(out))["district"]) == DISTRICTS
+    assert len(job.current_state()) == 10
+
+
+def test_rerun_of_finished_run_is_a_no_op(job_parts):
+    job, tracker, _ = job_parts
+    job.run(DISTRICTS, run_id="2026-W40")
+    tracker.classified.clear()
+    summary = job.run(DISTRICTS, run_id="2026-W40")
+    assert summary["skipped_done"] == 10 and summary["checked"] == 0
+    assert tracker.classified == []
+
+
+def test_next_week_reclassifies_only_districts_with_new_evidence(job_parts):
+    job, tracker, out = job_parts
+    job.run(DISTRICTS, run_id="2026-W40")
+    tracker.classified.clear()
+    tracker.feed["District 04"].append({"title": "District 04 adopts the science of reading",
+                                        "description": "structured literacy rollout",
+                                        "publishedAt": "2026-10-08T00:00:00Z",
+                                        "url": "https://n/District 04/1"})
+    summary = job.run(DISTRICTS, run_id="2026-W41")
+    assert tracker.classified == ["District 04"]
+    assert summary["reclassified"] == 1 and len(summary["partitions"]) == 1
+    latest = load_partitions(str(out)).set_index("district")
+    assert latest.loc["District 04", "stage"] == "Implementing"
+    assert job.current_state().set_index("district").loc["District 04", "articles_analyzed"] == 2
+
+
+def test_stage_decays_when_evidence_ages_out(job_parts):
+    job, tracker, out = job_parts
+    tracker.feed["District 04"].insert(0, {"title": "District 04 adopts the science of reading",
+                                           "description": "structured literacy rollout",
+                                           "publishedAt": "2026-07-15T00:00:00Z",
+                                           "url": "https://n/District 04/old"})
+    job.run(DISTRICTS, run_id="2026-W40")
+    assert job.current_state().set_index("district").loc["District 04", "stage"] == "Implementing"
+
+    # Next week the July article has left the search window; nothing newer arrived
+    tracker.classified.clear()
+    tracker.feed["District 04"].pop(0)
+    summary = job.run(DISTRICTS, run_id="2026-W41")
+    assert tracker.classified == ["District 04"] and summary["reclassified"] == 1
+    state = job.current_state().set_index("district")
+    assert state.loc["District 04", "stage"] == state.loc["District 05", "stage"] != "Implementing"
+    assert state.loc["District 04", "articles_analyzed"] == 1
+    assert load_partitions(str(out)).set_index("district").loc["District 04", "stage"] != "Implementing"
+
+
+def test_partial_fetch_does_not_decay_stage(tmp_path):
+    tracker = FakeNewsTracker()
+
+    class PartialFetcher:
+        """A fetcher whose sources time out this week: no articles, partial results."""
+        partial = False
+
+        def run(self, districts):
+            return [{"district": d, "articles": [] if self.partial else tracker.feed[d],
+                     "partial": self.partial} for d in districts]
+
+    fetcher = PartialFetcher()
+    job = WeeklyTrackingJob(tracker, state_path=str(tmp_path / "state.sqlite"),
+                            output_dir=str(tmp_path / "out"), fetcher=fetcher)
+    job.run(DISTRICTS, run_id="2026-W40")
+    tracker.classified.clear()
+    fetcher.partial = True
+    summary = job.run(DISTRICTS, run_id="2026-W41")
+    job.close()
+    assert tracker.classified == [] and summary["reclassified"] == 0
+
+
+def test_crash_resumes_from_checkpoint(job_parts):
+    job, tracker, _ = job_parts
+    tracker.crash_on = "District 07"
+    with pytest.raises(RuntimeError):
+        job.run(DISTRICTS, run_id="2026-W40")
+    tracker.crash_on = None
+    tracker.classified.clear()
+    summary = job.run(DISTRICTS, run_id="2026-W40")
+    # Batches [0-2] and [3-5] were checkpointed before the crash in [6-8]
+    assert summary["skipped_done"] == 6
+    assert tracker.classified == DISTRICTS[6:]
+    assert len(job.current_state()) == 10
+
+
+def test_attached_ranking_index_reports_tier_changes(tmp_path):
+    import pandas as pd
+    from ranking_index import RankingIndex
+
+    districts = pd.DataFrame({
+        "district_name": DISTRICTS,
+        "pct_ela_proficient": 20.0, "pd_budget_per_student_est": 400.0,
+        "sor_adoption_signal": "None", "recent_literacy_initiative": True,
+        "superintendent_tenure_yrs": 8.0, "miles_from_la": 200.0,
+    })
+    index = RankingIndex.from_districts(districts)  # 53 each: Tier 2
+    tracker = FakeNewsTracker()
+    tracker.feed["District 04"].append({"title": "District 04 adopts the science of reading",
+                                        "description": "structured literacy rollout",
+                                        "publishedAt": "2026-10-08T00:00:00Z",
+                                        "url": "https://n/District 04/1"})
+    job = WeeklyTrackingJob(tracker, state_path=str(tmp_path / "state.sqlite"),
+                            output_dir=str(tmp_path / "out"), batch_size=3, ranking_index=index)
+    summary = job.run(DISTRICTS, run_id="2026-W40")
+    job.close()
+    # "Committed" (+16) stays in Tier 2; only District 04 reaches "Implementing" (+20)
+    assert [str(e) for e in summary["tier_changes"]] == ["District 04 moved into Tier 1 (53.00 -> 73.00)"]
+    assert index.top_k(1)["district_name"][0] == "District 04"
+
+
+def test_ranking_updates_resolve_tracker_names(tmp_path):
+    import pandas as pd
+    from district_resolver import DistrictResolver
+    from ranking_index import RankingIndex
+
+    districts = pd.DataFrame({
+        "district_name": ["Los Angeles Unified School District"], "cds_code": ["1964733"],
+        "pct_ela_proficient": 20.0, "pd_budget_per_student_est": 400.0,
+        "sor_adoption_signal": "None", "recent_literacy_initiative": True,
+        "superintendent_tenure_yrs": 8.0, "miles_from_la": 200.0,
+    })
+    index = RankingIndex.from_districts(districts)
+    tracker = FakeNewsTracker()
+    tracker.feed["LAUSD"] = [{"title": "LAUSD adopts the science of reading",
+                              "description": "structured literacy and phonics instruction",
+                              "publishedAt": "2026-10-08T00:00:00Z", "url": "https://n/lausd/1"}]
+    job = WeeklyTrackingJob(tracker, state_path=str(tmp_path / "state.sqlite"),
+                            output_dir=str(tmp_path / "out"), ranking_index=index,
+                            resolver=DistrictResolver.from_districts(districts, alias_path=None))
+    summary = job.run(["LAUSD"], run_id="2026-W41")
+    job.close()
+    assert [e.new_tier for e in summary["tier_changes"]] == ["Tier 1"]
+
+
+def test_crash_before_checkpoint_leaves_no_duplicate_partition(job_parts, monkeypatch):
+    job, tracker, out = job_parts
+    checkpoint, calls = job._checkpoint, []
+
+    def crash_on_second(*args):
+        calls.append(1)
+        if len(calls) == 2:   # the chunk's partition is already on disk
+            raise RuntimeError("simulated crash")
+        checkpoint(*args)
+
+    monkeypatch.setattr(job, "_checkpoint", crash_on_second)
+    with pytest.raises(RuntimeError):
+        job.run(DISTRICTS, run_id="2026-W40")
+    monkeypatch.setattr(job, "_checkpoint", checkpoint)
+    job.run(DISTRICTS, run_id="2026-W40")
+    parts = sorted((out / "run=2026-W40").glob("part-*.csv"))
+    rows = sum(len(p.read_text().splitlines()) - 1 for p in parts)
+    assert len(parts) == 4 and rows == 10
+
+
+def test_latest_partition_wins_whatever_the_run_id(job_parts):
+    job, tracker, out = job_parts
+    job.run(DISTRICTS, run_id="manual-backfill")   # sorts after "2026-W41" by path
+    tracker.feed["District 04"].append({"title": "District 04 adopts the science of reading",
+                                        "description": "structured literacy rollout",
+                                        "publishedAt": "2026-10-08T00:00:00Z",
+                                        "url": "https://n/District 04/1"})
+    job.run(DISTRICTS, run_id="2026-W41")
+    latest = load_partitions(str(out)).set_index("district")
+    assert latest.loc["District 04", "stage"] == "Implementing" and len(latest) == 10
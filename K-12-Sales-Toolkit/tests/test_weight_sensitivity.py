@@ -0,0 +1,80 @@
+"""
+Tests for the readiness weight-sensitivity sweep.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "01_district_intelligence"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "07_streamlit_demo"))
+
+from dashboard_data import synthetic_districts
+from district_scoring import tier_codes
+from weight_sensitivity import (DEFAULT_WEIGHTS, component_matrix, normalize_weights,
+                                perturbed_weights, sweep, weight_grid)
+
+
+@pytest.fixture(scope="module")
+def districts():
+    return synthetic_districts(800, seed=4)
+
+
+def test_default_weights_reproduce_readiness_score(districts):
+    scores = np.round(component_matrix(districts) @ DEFAULT_WEIGHTS, 2)
+    assert np.array_equal(scores, districts["readiness_score"].to_numpy())
+
+
+def test_baseline_row_changes_nothing(districts):
+    result = sweep(component_matrix(districts), DEFAULT_WEIGHTS[None, :], top_k=40)
+    expected_tiers = tier_codes(districts["readiness_score"])
+    assert np.array_equal(result.baseline_tier, expected_tiers)
+    assert (result.tier_change_share == 0).all() and (result.rank_min == result.rank_max).all()
+    assert result.topk_overlap.tolist() == [1.0]
+    assert result.tier_counts[0].tolist() == np.bincount(expected_tiers, minlength=3).tolist()
+
+
+def test_ranks_match_row_by_row_reference(districts):
+    C = component_matrix(districts)
+    W = perturbed_weights(25, spread=0.4, seed=3)
+    result = sweep(C, W, top_k=30)
+    ranks = []
+    for w in W:
+        order = np.argsort(-np.round(C @ w, 2), kind="stable")
+        r = np.empty(len(C), dtype=int)
+        r[order] = np.arange(len(C))
+        ranks.append(r)
+    ranks = np.array(ranks)
+    assert np.array_equal(result.rank_min, ranks.min(axis=0))
+    assert np.array_equal(result.rank_max, ranks.max(axis=0))
+    tiers = np.array([tier_codes(np.round(C @ w, 2)) for w in W])
+    assert np.allclose(result.tier1_share, (tiers == 0).mean(axis=0))
+
+    frame = result.district_frame(districts)
+    assert frame["rank_spread"].is_monotonic_decreasing and len(frame) == len(districts)
+    assert list(result.grid_frame()["Tier 1"]) == list((tiers == 0).sum(axis=1))
+
+
+def test_weight_grids_are_normalized():
+    grid = weight_grid(need=[20, 30, 40], budget=[15, 25])
+    assert grid.shape == (6, 5) and np.allclose(grid.sum(axis=1), 100)
+    W = perturbed_weights(10, spread=0.5, seed=1)
+    assert np.allclose(W[0], DEFAULT_WEIGHTS) and np.allclose(W.sum(axis=1), 100)
+    with pytest.raises(ValueError):
+        weight_grid(charisma=[1, 2])
+    with pytest.raises(ValueError):
+        normalize_weights([0, 0, 0, 0, 0])
+
+
+@pytest.mark.timing
+def test_thousand_weight_sets_under_100ms():
+    C = component_matrix(synthetic_districts(1000, seed=2, score=False))
+    W = perturbed_weights(1000)
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        sweep(C, W)
+        timings.append(time.perf_counter() - start)
+    assert min(timings) < 0.1, f"{min(timings) * 1000:.0f} ms"